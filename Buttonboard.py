@@ -2,6 +2,7 @@ import turtle
 
 import utils
 import config
+import instrument
 
 
 class Buttonboard:
@@ -17,6 +18,8 @@ class Buttonboard:
         border_painter(Turtle) -- the turtle instance used to draw
             the border of the button board
     """
+    __slots__ = ("board_painter", "border_painter")
+
     def __init__(self):
         """
         Method -- __init__
@@ -50,6 +53,8 @@ class Buttonboard:
             # define the onclick function callback
             def on_click_button(x, y, button_name=button):
                 # check the button names and bind functions to them
+                if "hint" in button_name:
+                    funcs["hint"]()
                 if "reset" in button_name:
                     funcs["reset"]()
                 if "load" in button_name:
@@ -60,6 +65,7 @@ class Buttonboard:
             button_painter.onclick(on_click_button)
         screen.tracer(1)
 
+    @instrument.span("Buttonboard.display_moves")
     def display_moves(self, player_moves):
         """
         Method -- display_moves
@@ -81,6 +87,16 @@ class Buttonboard:
         player_moves_text = f"Player Moves: {player_moves}"
         self.board_painter.write(player_moves_text, align="left", font=("Arial", 18, "normal"))
 
+    def set_speed(self, speed):
+        """
+        Method -- set_speed
+            Sets how fast the player moves are written, 0 writing them
+            without moving the turtle across the screen
+        Parameters:
+            speed(int) -- the turtle speed, from 0 to 10
+        """
+        self.board_painter.speed(speed)
+
     def draw_border(self):
         """
         Method -- draw_border
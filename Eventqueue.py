@@ -0,0 +1,108 @@
+import collections
+
+import config
+
+
+class Eventqueue:
+    """
+    Class: Eventqueue
+    This class represents the queue every click and key press of the game
+    goes through. A click only adds its handler to the queue, and the
+    handlers run one at a time from a timer of the Tk event loop, so no
+    handler ever starts while another one is still running, even when a
+    handler opens a dialog that lets Tk take more clicks. A click that is
+    already waiting in the queue isn't added again, and clicks beyond the
+    depth of the queue are dropped, so rapid input can't pile up redraws
+    ---
+    Attributes:
+        screen(TurtleScreen) -- the screen whose timer runs the handlers
+        limit(int) -- the most events waiting at once
+        events(deque) -- tuples of the key and the handler of each event
+            waiting, oldest first
+        waiting(set) -- the keys of the events waiting
+        running(bool) -- whether the handlers are being run
+        scheduled(bool) -- whether the timer running the handlers is set
+        handled(int) -- the number of events handled
+        coalesced(int) -- the number of events that were already waiting
+        dropped(int) -- the number of events dropped with the queue full
+    """
+    __slots__ = ("screen", "limit", "events", "waiting", "running",
+                 "scheduled", "handled", "coalesced", "dropped")
+
+    def __init__(self, screen, limit=None):
+        """
+        Method -- __init__
+            The constructor of the class, creates empty Eventqueue instances
+        Parameters:
+            screen(TurtleScreen) -- the screen whose timer runs the handlers
+            limit(int) -- the most events waiting at once, the configured
+                number when not given
+        """
+        self.screen = screen
+        self.limit = limit or config.EVENT_QUEUE_MAX
+        self.events = collections.deque()
+        self.waiting = set()
+        self.running = False
+        self.scheduled = False
+        self.handled = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def post(self, key, handler):
+        """
+        Method -- post
+            Adds an event to the queue, to be handled once the events
+            before it are
+        Parameters:
+            key(tuple) -- what the event is, such as ("tile", 3), an event
+                with the same key as one waiting being dropped, or None
+                for events that all count, such as key presses
+            handler(function) -- the function handling the event
+        Returns a boolean indicating whether the event was added
+        """
+        if key is not None and key in self.waiting:
+            self.coalesced += 1
+            return False
+        if len(self.events) >= self.limit:
+            self.dropped += 1
+            return False
+        self.events.append((key, handler))
+        if key is not None:
+            self.waiting.add(key)
+        # the handlers being run take the new event in turn
+        if not self.running and not self.scheduled:
+            self.scheduled = True
+            self.screen.ontimer(self.run, 0)
+        return True
+
+    def listener(self, key, handler):
+        """
+        Method -- listener
+            Makes a callback that posts an event, for the click and key
+            bindings of the screen
+        Parameters:
+            key(tuple) -- what the event is, or None
+            handler(function) -- the function handling the event
+        Returns a function taking any arguments, such as the coordinates
+            of a click, and posting the event
+        """
+        return lambda *args: self.post(key, handler)
+
+    def run(self):
+        """
+        Method -- run
+            Handles the waiting events one after the other, unless they are
+            being handled already further up the call stack
+        """
+        self.scheduled = False
+        if self.running:
+            return
+        self.running = True
+        try:
+            while self.events:
+                key, handler = self.events.popleft()
+                self.waiting.discard(key)
+                self.handled += 1
+                handler()
+        finally:
+            self.running = False
@@ -0,0 +1,96 @@
+import random
+import time
+
+import config
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+class Filelock:
+    """
+    Class: Filelock
+    This class represents an advisory lock on a lock file, shared by all
+    the game processes using the same file. Taking the lock is retried with
+    a growing, randomised delay until it succeeds or times out. It can be
+    used in a with statement
+    ---
+    Attributes:
+        path(str) -- the path to the lock file
+        timeout(float) -- the number of seconds to keep trying
+        lock_file(file) -- the open lock file while the lock is held
+    """
+    def __init__(self, path, timeout=None):
+        """
+        Method -- __init__
+            The constructor of the class, creates Filelock instances
+        Parameters:
+            path(str) -- the path to the lock file
+            timeout(float) -- the number of seconds to keep trying, the
+                configured lock timeout when not given
+        """
+        self.path = path
+        self.timeout = config.LOCK_TIMEOUT if timeout is None else timeout
+        self.lock_file = None
+
+    def acquire(self):
+        """
+        Method -- acquire
+            Takes the lock, waiting for other processes to release it
+        Raises TimeoutError if the lock couldn't be taken in time
+        """
+        lock_file = open(self.path, "a+b")
+        deadline = time.monotonic() + self.timeout
+        delay = config.LOCK_RETRY_DELAY
+        while True:
+            try:
+                if fcntl:
+                    fcntl.flock(lock_file.fileno(),
+                                fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                self.lock_file = lock_file
+                return
+            except OSError:
+                if time.monotonic() >= deadline:
+                    lock_file.close()
+                    raise TimeoutError(f"Timed out waiting for {self.path}.")
+                # back off with jitter so waiting processes don't collide
+                time.sleep(delay * random.uniform(0.5, 1.5))
+                delay = min(delay * 2, config.LOCK_RETRY_MAX)
+
+    def release(self):
+        """
+        Method -- release
+            Releases the lock
+        """
+        if self.lock_file is None:
+            return
+        if fcntl:
+            fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_UN)
+        else:
+            self.lock_file.seek(0)
+            msvcrt.locking(self.lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        self.lock_file.close()
+        self.lock_file = None
+
+    def __enter__(self):
+        """
+        Method -- __enter__
+            Takes the lock at the start of a with statement
+        Returns the Filelock instance
+        """
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Method -- __exit__
+            Releases the lock at the end of a with statement
+        """
+        self.release()
+
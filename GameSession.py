@@ -0,0 +1,480 @@
+import array
+import datetime
+import hashlib
+import os
+import random
+
+from Movelog import Movelog
+from Movestack import Movestack
+from Puzzleboard import Puzzleboard
+import instrument
+import puzzle_file
+
+# the cell, relative to the blank tile, of the tile that slides each way
+DIRECTIONS = {"up": (1, 0), "down": (-1, 0), "left": (0, 1), "right": (0, -1)}
+
+# the solved tile numbers by number of tiles, shared by all the sessions
+SOLVED = {}
+
+
+class GameSession:
+    """
+    Class: GameSession
+    This class represents one game of the sliding puzzle, without any
+    graphics. The tiles are numbered in solved order and kept in a compact
+    array on a Puzzleboard, which applies the moving, scrambling and
+    solving rules. A game is won when the puzzle is solved within the move
+    limit and lost when the limit is used up first, after which no more
+    moves are taken. Every game records the seed of its scramble and its
+    moves in a Movelog, from which it can be replayed. Moves can be undone
+    and redone through a Movestack; taking a move back or making it again
+    moves the blank tile, so it counts as a move and is recorded like one
+    ---
+    Attributes:
+        board(Puzzleboard) -- the board holding the tile numbers
+        puzzle(str) -- the name of the puzzle being played
+        move_limit(int) -- the maximum number of moves to solve the puzzle
+        blank_tile(int) -- the number of the blank tile
+        status(str) -- "playing" until the game is "win" or "lose"
+        log(Movelog) -- the record of the game since the last scramble
+        history(Movestack) -- the moves that can be undone and redone,
+            since the last scramble or reset, or None until the first
+            move after them
+    """
+    __slots__ = ("board", "puzzle", "move_limit", "blank_tile", "status",
+                 "log", "history")
+
+    def __init__(self, rows=4, columns=None, move_limit=0):
+        """
+        Method -- __init__
+            The constructor of the class, creates GameSession instances
+            with a solved board
+        Parameters:
+            rows(int) -- the number of rows of the board
+            columns(int) -- the number of columns of the board, the same
+                as the number of rows when not given
+            move_limit(int) -- the maximum number of moves to solve the
+                puzzle
+        """
+        self.board = Puzzleboard()
+        self.puzzle = ""
+        self.move_limit = move_limit
+        self.blank_tile = 0
+        self.status = "playing"
+        self.log = None
+        self.history = None
+        self.new_board(rows, columns or rows)
+
+    def new_board(self, rows, columns, blank_tile=None):
+        """
+        Method -- new_board
+            Sets up a solved board of the given shape
+        Parameters:
+            rows(int) -- the number of rows of the board
+            columns(int) -- the number of columns of the board
+            blank_tile(int) -- the number of the blank tile, the last one
+                when not given
+        """
+        count = rows * columns
+        self.blank_tile = count - 1 if blank_tile is None else blank_tile
+        # two bytes per tile fit the largest boards, and the solved order
+        # is only read, so sessions of the same size share it
+        if count not in SOLVED:
+            SOLVED[count] = array.array("H", range(count))
+        tiles = SOLVED[count]
+        self.board.set_dimensions(rows, columns)
+        self.board.set_tiles(tiles)
+        self.board.set_board(tiles, self.blank_tile)
+        self.board.set_moves(0)
+        self.status = "playing"
+        self.history = None
+
+    def load(self, game_path, base_dir="."):
+        """
+        Method -- load
+            Loads a puzzle from its .puz file and sets up its solved board
+        Parameters:
+            game_path(str) -- the path to the .puz file
+            base_dir(str) -- the directory the image paths are relative to
+        Returns a dictionary with the data of the puzzle file
+        Raises OSError if the file can't be read, or ValueError if it
+            doesn't describe a valid puzzle
+        """
+        data_dict = puzzle_file.read_puzzle(game_path, base_dir)
+        self.new_board(data_dict["rows"], data_dict["columns"],
+                       puzzle_file.find_blank(data_dict["images"]))
+        self.puzzle = os.path.splitext(os.path.basename(game_path))[0]
+        return data_dict
+
+    def scramble(self, move_limit=None, seed=None):
+        """
+        Method -- scramble
+            Starts a new game by scrambling the board with as many random
+            moves of the blank tile as the move limit, so the puzzle can
+            always be solved within the limit
+        Parameters:
+            move_limit(int) -- the new move limit, the current one when
+                not given
+            seed(int) -- the seed of the scramble, a random one when not
+                given, the same puzzle, move limit and seed always giving
+                the same board
+        """
+        if move_limit is not None:
+            self.move_limit = move_limit
+        if seed is None:
+            seed = random.getrandbits(63)
+        # scramble from the solved order, so only the seed decides the board
+        self.board.set_board(self.board.get_tiles(), self.blank_tile)
+        self.board.scramble_board(self.move_limit,
+                                  scramble_random(self.puzzle,
+                                                  self.move_limit, seed))
+        self.board.set_moves(0)
+        self.status = "playing"
+        self.log = Movelog(self.board.get_rows(), self.board.get_columns(),
+                           self.blank_tile, self.move_limit, seed,
+                           self.puzzle)
+        # the history is started by the first move, so a session nobody
+        # plays in keeps no copy of its board
+        self.history = None
+
+    def reset(self):
+        """
+        Method -- reset
+            Puts the tiles back in their solved order, keeping the moves
+            made so far
+        """
+        self.board.set_board(self.board.get_tiles(), self.blank_tile)
+        if self.log is not None:
+            self.log.add_reset()
+        # the moves before the reset can't be taken back one by one
+        self.history = None
+
+    @instrument.span("GameSession.move")
+    def move(self, target):
+        """
+        Method -- move
+            Slides a tile into the blank cell if it is next to it
+        Parameters:
+            target -- the tile to move, given as a (row, column) tuple, a
+                cell index, or a direction "up", "down", "left" or "right"
+                that a tile next to the blank cell slides in
+        Returns a boolean indicating whether a tile was moved
+        """
+        if self.status != "playing":
+            return False
+        rows, columns = self.board.get_rows(), self.board.get_columns()
+        if isinstance(target, str):
+            if target not in DIRECTIONS:
+                return False
+            blank_x, blank_y = self.board.find_blank()
+            x, y = blank_x + DIRECTIONS[target][0], \
+                blank_y + DIRECTIONS[target][1]
+        elif isinstance(target, int):
+            x, y = divmod(target, columns)
+        else:
+            x, y = target
+        if not (0 <= x < rows and 0 <= y < columns):
+            return False
+        code = self.board.blank_code(x * columns + y)
+        return code is not None and self.move_blank(code)
+
+    def move_blank(self, code):
+        """
+        Method -- move_blank
+            Moves the blank tile one cell, the opposite way of the tile
+            that slides into it
+        Parameters:
+            code(int) -- the move code, 0 up, 1 down, 2 left or 3 right
+        Returns a boolean indicating whether the blank tile was moved
+        """
+        if self.status != "playing":
+            return False
+        # a recorded game starts its history from the board before its
+        # first move
+        if self.history is None and self.log is not None:
+            self.history = Movestack(self.board.cells, self.board.blank)
+        if not self.board.move_blank(code):
+            return False
+        if self.log is not None:
+            self.log.append(code)
+        if self.history is not None:
+            self.history.push(code, self.board.cells, self.board.blank)
+        self.update_status()
+        return True
+
+    def undo(self):
+        """
+        Method -- undo
+            Takes back the last move by moving the blank tile the other way
+        Returns a boolean indicating whether a move was taken back
+        """
+        if self.status != "playing" or self.history is None:
+            return False
+        code = self.history.undo()
+        if code is None:
+            return False
+        # the codes of opposite moves differ in their lowest bit
+        self.step(code ^ 1)
+        return True
+
+    def redo(self):
+        """
+        Method -- redo
+            Makes the last move taken back again
+        Returns a boolean indicating whether a move was made again
+        """
+        if self.status != "playing" or self.history is None:
+            return False
+        code = self.history.redo()
+        if code is None:
+            return False
+        self.step(code)
+        return True
+
+    def step(self, code):
+        """
+        Method -- step
+            Moves the blank tile through the history, recording the move
+            without adding it to the history
+        Parameters:
+            code(int) -- the move code, which the board can always make
+        """
+        self.board.move_blank(code)
+        if self.log is not None:
+            self.log.append(code)
+        self.update_status()
+
+    def jump(self, position):
+        """
+        Method -- jump
+            Takes back or makes again many moves at once, going to any
+            point of the history. The board is set from the nearest
+            checkpoint and only the moves after it are played, and the
+            moves are counted and recorded as if they were undone or redone
+            one by one
+        Parameters:
+            position(int) -- the number of moves of the history to keep on
+                the board, 0 for the board the history starts from
+        Returns a boolean indicating whether the board changed, which it
+            doesn't if the jump would go over the move limit
+        """
+        if self.status != "playing" or self.history is None:
+            return False
+        current = self.history.get_position()
+        position = max(0, min(position, self.history.get_length()))
+        moves = self.board.get_moves() + abs(position - current)
+        if position == current or moves > self.move_limit:
+            return False
+
+        # record the moves the way undoing or redoing them would make them
+        if self.log is not None:
+            if position < current:
+                for index in range(current - 1, position - 1, -1):
+                    self.log.append(self.history.get_code(index) ^ 1)
+            else:
+                for index in range(current, position):
+                    self.log.append(self.history.get_code(index))
+
+        tiles, blank, packed, count = self.history.checkpoint(position)
+        self.board.set_board(tiles, blank)
+        self.board.play_packed(packed, count)
+        self.board.set_moves(moves)
+        self.history.set_position(position)
+        self.update_status()
+        return True
+
+    def update_status(self):
+        """
+        Method -- update_status
+            Decides whether the game is won, lost or still being played
+            after a move
+        """
+        moves = self.board.get_moves()
+        if self.board.is_solved() and moves <= self.move_limit:
+            self.status = "win"
+        elif moves >= self.move_limit:
+            self.status = "lose"
+        else:
+            self.status = "playing"
+
+    def get_status(self):
+        """
+        Method -- get_status
+            Gets the state of the game
+        Returns a string, "playing", "win" or "lose"
+        """
+        return self.status
+
+    def get_moves(self):
+        """
+        Method -- get_moves
+            Gets the number of moves made in the game
+        Returns an integer with the number of moves
+        """
+        return self.board.get_moves()
+
+    def set_moves(self, moves):
+        """
+        Method -- set_moves
+            Sets the number of moves made in the game
+        Parameters:
+            moves(int) -- the number of moves
+        """
+        self.board.set_moves(moves)
+
+    def set_move_limit(self, move_limit):
+        """
+        Method -- set_move_limit
+            Sets the maximum number of moves to solve the puzzle
+        Parameters:
+            move_limit(int) -- the move limit
+        """
+        self.move_limit = move_limit
+
+    def get_move_limit(self):
+        """
+        Method -- get_move_limit
+            Gets the maximum number of moves to solve the puzzle
+        Returns an integer with the move limit
+        """
+        return self.move_limit
+
+    def set_puzzle(self, puzzle):
+        """
+        Method -- set_puzzle
+            Sets the name of the puzzle being played
+        Parameters:
+            puzzle(str) -- the puzzle name
+        """
+        self.puzzle = puzzle
+
+    def get_puzzle(self):
+        """
+        Method -- get_puzzle
+            Gets the name of the puzzle being played
+        Returns a string with the puzzle name
+        """
+        return self.puzzle
+
+    def get_board(self):
+        """
+        Method -- get_board
+            Gets the board holding the tile numbers
+        Returns the Puzzleboard instance of the game
+        """
+        return self.board
+
+    def get_blank_tile(self):
+        """
+        Method -- get_blank_tile
+            Gets the number of the blank tile
+        Returns an integer with the tile number
+        """
+        return self.blank_tile
+
+    def get_cell(self, x, y):
+        """
+        Method -- get_cell
+            Gets the number of the tile at a position of the board
+        Parameters:
+            x(int) -- the row of the cell
+            y(int) -- the column of the cell
+        Returns an integer with the tile number
+        """
+        return self.board.get_cell(x, y)
+
+    def get_blank(self):
+        """
+        Method -- get_blank
+            Gets the position of the blank tile
+        Returns two integers, the row and column of the blank tile
+        """
+        return self.board.find_blank()
+
+    def get_history(self):
+        """
+        Method -- get_history
+            Gets the moves that can be undone and redone
+        Returns the Movestack instance of the game, or None before the
+            first move since the board was scrambled or reset
+        """
+        return self.history
+
+    def get_log(self):
+        """
+        Method -- get_log
+            Gets the record of the game
+        Returns the Movelog instance of the game, or None before the board
+            is scrambled
+        """
+        return self.log
+
+    def get_state(self):
+        """
+        Method -- get_state
+            Gets the tile numbers of the board
+        Returns a list of integers with the tile numbers, row by row
+        """
+        return self.board.cells.tolist()
+
+
+def scramble_random(puzzle, move_limit, seed):
+    """
+    Function -- scramble_random
+        Creates the random number generator of a scramble. It is seeded
+        with a hash of the puzzle, the move limit and the seed, so a seed
+        gives unrelated boards for different puzzles and difficulties, and
+        the same board on every computer and Python version
+    Parameters:
+        puzzle(str) -- the name of the puzzle
+        move_limit(int) -- the move limit, which is the number of scramble
+            moves
+        seed(int) -- the seed of the game
+    Returns a Random instance for the scramble
+    """
+    key = f"{puzzle}:{move_limit}:{seed}".encode("utf-8")
+    return random.Random(int.from_bytes(hashlib.sha256(key).digest()[:8],
+                                        "big"))
+
+
+def daily_seed(day=None):
+    """
+    Function -- daily_seed
+        Gets the seed of the daily challenge, which every player of the
+        same day shares
+    Parameters:
+        day(date) -- the day of the challenge, today in UTC when not given
+    Returns an integer with the day as YYYYMMDD
+    """
+    if day is None:
+        day = datetime.datetime.now(datetime.timezone.utc).date()
+    return int(day.strftime("%Y%m%d"))
+
+
+def replay(log):
+    """
+    Function -- replay
+        Plays a recorded game again without graphics, regenerating its
+        scramble from the seed and playing the packed moves in bulk
+    Parameters:
+        log(Movelog) -- the record of the game
+    Returns a GameSession instance with the game as it ended, whose number
+        of moves is less than the recorded one if a move was impossible
+    Raises ValueError if a segment holds more moves than its packed bytes
+    """
+    session = GameSession(log.rows, log.columns)
+    session.new_board(log.rows, log.columns, log.blank_tile)
+    session.set_puzzle(log.puzzle)
+    session.scramble(log.move_limit, log.seed)
+    board = session.get_board()
+    for index, (packed, count) in enumerate(log.segments()):
+        if index:
+            board.set_board(board.get_tiles(), session.blank_tile)
+        # like in a game, only moves decide the result, not resets
+        if count:
+            played = board.play_packed(packed, count)
+            session.update_status()
+            if played < count:
+                break
+    session.log = log
+    return session
@@ -0,0 +1,404 @@
+import struct
+
+
+class Gifimage:
+    """
+    Class: Gifimage
+    This class represents a single frame GIF image held in memory as
+    palette indexes. It can read and write GIF files and crop, scale and
+    paste images without any third party imaging library, so puzzle tiles
+    and thumbnails can be produced in the same format turtle displays
+    ---
+    Attributes:
+        width(int) -- the width of the image in pixels
+        height(int) -- the height of the image in pixels
+        palette(bytes) -- the RGB color table, three bytes per color
+        pixels(bytearray) -- one palette index per pixel, row by row
+        transparent(int) -- the palette index of the transparent color,
+            or None if the image has no transparency
+    """
+    def __init__(self, width, height, palette, pixels=None, transparent=None):
+        """
+        Method -- __init__
+            The constructor of the class, creates Gifimage instances
+        Parameters:
+            width(int) -- the width of the image in pixels
+            height(int) -- the height of the image in pixels
+            palette(bytes) -- the RGB color table, three bytes per color
+            pixels(bytearray) -- the palette indexes of the pixels, filled
+                with index 0 when not given
+            transparent(int) -- the palette index of the transparent color
+        """
+        if width <= 0 or height <= 0:
+            raise ValueError(f"Invalid image size {width}x{height}.")
+        self.width = width
+        self.height = height
+        self.palette = bytes(palette)
+        if pixels is None:
+            pixels = bytearray(width * height)
+        if len(pixels) != width * height:
+            raise ValueError("Pixel data doesn't match the image size.")
+        self.pixels = bytearray(pixels)
+        self.transparent = transparent
+
+    def get_width(self):
+        """
+        Method -- get_width
+            Gets the width of the image
+        Returns an integer representing the width in pixels
+        """
+        return self.width
+
+    def get_height(self):
+        """
+        Method -- get_height
+            Gets the height of the image
+        Returns an integer representing the height in pixels
+        """
+        return self.height
+
+    @classmethod
+    def read(cls, path):
+        """
+        Method -- read
+            Reads the first frame of a GIF file
+        Parameters:
+            path(str) -- the path to the GIF file
+        Returns a Gifimage instance with the decoded image
+        """
+        with open(path, "rb") as infile:
+            return cls.decode(infile.read())
+
+    @classmethod
+    def decode(cls, data):
+        """
+        Method -- decode
+            Decodes the first frame of GIF data. Frames smaller than the
+            logical screen are placed on a background of the first color
+        Parameters:
+            data(bytes) -- the content of a GIF file
+        Returns a Gifimage instance with the decoded image
+        Raises ValueError if the data isn't a GIF image or is damaged
+        """
+        # a file cut short runs off the end of the data
+        try:
+            if data[:6] not in (b"GIF87a", b"GIF89a"):
+                raise ValueError("Not a GIF file.")
+            width, height, flags, background = struct.unpack("<HHBB",
+                                                             data[6:12])
+            pos = 13
+            palette = b""
+            # read the global color table if there is one
+            if flags & 0x80:
+                table_size = 3 * (2 << (flags & 7))
+                palette = data[pos:pos + table_size]
+                pos += table_size
+
+            transparent = None
+            while pos < len(data):
+                block = data[pos]
+                pos += 1
+                # extension blocks, only the graphic control one matters
+                if block == 0x21:
+                    label = data[pos]
+                    pos += 1
+                    if label == 0xF9 and data[pos] >= 4 and data[pos + 1] & 1:
+                        transparent = data[pos + 4]
+                    while data[pos]:
+                        pos += data[pos] + 1
+                    pos += 1
+                # the image descriptor of the first frame
+                elif block == 0x2C:
+                    left, top, frame_width, frame_height, frame_flags = \
+                        struct.unpack("<HHHHB", data[pos:pos + 9])
+                    pos += 9
+                    if frame_flags & 0x80:
+                        table_size = 3 * (2 << (frame_flags & 7))
+                        palette = data[pos:pos + table_size]
+                        pos += table_size
+                    min_code_size = data[pos]
+                    pos += 1
+                    chunks = []
+                    while data[pos]:
+                        chunks.append(data[pos + 1:pos + 1 + data[pos]])
+                        pos += data[pos] + 1
+                    indexes = _lzw_decode(b"".join(chunks), min_code_size,
+                                          frame_width * frame_height)
+                    if frame_flags & 0x40:
+                        indexes = _deinterlace(indexes, frame_width,
+                                               frame_height)
+
+                    # place the frame on the logical screen
+                    if (left, top, frame_width, frame_height) == \
+                            (0, 0, width, height):
+                        pixels = indexes
+                    else:
+                        fill = transparent if transparent is not None \
+                            else background
+                        pixels = bytearray([fill]) * (width * height)
+                        for row in range(min(frame_height, height - top)):
+                            span = min(frame_width, width - left)
+                            start = (top + row) * width + left
+                            end = row * frame_width + span
+                            pixels[start:start + span] = \
+                                indexes[row * frame_width:end]
+                    if not palette:
+                        palette = bytes(value for value in range(256)
+                                        for _ in range(3))
+                    return cls(width, height, palette, pixels, transparent)
+                else:
+                    break
+            raise ValueError("GIF file has no image data.")
+        except (IndexError, struct.error) as err:
+            raise ValueError(f"GIF file is damaged: {err}") from err
+
+    def encode(self):
+        """
+        Method -- encode
+            Encodes the image as GIF data
+        Returns bytes with the content of a GIF file
+        """
+        # the color table must have a power of two number of entries
+        colors = max(2, len(self.palette) // 3, max(self.pixels) + 1)
+        bits = max(1, (colors - 1).bit_length())
+        palette = self.palette[:3 * (1 << bits)]
+        palette += b"\x00" * (3 * (1 << bits) - len(palette))
+
+        out = bytearray(b"GIF89a")
+        out += struct.pack("<HHBBB", self.width, self.height,
+                           0x80 | ((bits - 1) << 4) | (bits - 1), 0, 0)
+        out += palette
+        if self.transparent is not None:
+            out += struct.pack("<BBBBHBB", 0x21, 0xF9, 4, 1, 0,
+                               self.transparent, 0)
+        out += struct.pack("<BHHHHB", 0x2C, 0, 0, self.width, self.height, 0)
+        min_code_size = max(2, bits)
+        out.append(min_code_size)
+        body = _lzw_encode(self.pixels, min_code_size)
+        for start in range(0, len(body), 255):
+            chunk = body[start:start + 255]
+            out.append(len(chunk))
+            out += chunk
+        out += b"\x00\x3B"
+        return bytes(out)
+
+    def save(self, path):
+        """
+        Method -- save
+            Writes the image to a GIF file
+        Parameters:
+            path(str) -- the path of the file to write
+        """
+        with open(path, "wb") as outfile:
+            outfile.write(self.encode())
+
+    def crop(self, left, top, width, height):
+        """
+        Method -- crop
+            Cuts a rectangle out of the image
+        Parameters:
+            left(int) -- the x coordinate of the rectangle
+            top(int) -- the y coordinate of the rectangle
+            width(int) -- the width of the rectangle
+            height(int) -- the height of the rectangle
+        Returns a new Gifimage instance with the pixels in the rectangle
+        """
+        if left < 0 or top < 0 or left + width > self.width or \
+                top + height > self.height:
+            raise ValueError("Crop rectangle is outside of the image.")
+        pixels = bytearray()
+        for row in range(top, top + height):
+            start = row * self.width + left
+            pixels += self.pixels[start:start + width]
+        return Gifimage(width, height, self.palette, pixels, self.transparent)
+
+    def scale(self, width, height):
+        """
+        Method -- scale
+            Resizes the image with nearest neighbour sampling, which keeps
+            the palette unchanged
+        Parameters:
+            width(int) -- the new width of the image
+            height(int) -- the new height of the image
+        Returns a new Gifimage instance with the resized image
+        """
+        columns = [x * self.width // width for x in range(width)]
+        pixels = bytearray()
+        for y in range(height):
+            start = (y * self.height // height) * self.width
+            row = self.pixels[start:start + self.width]
+            pixels += bytes(row[x] for x in columns)
+        return Gifimage(width, height, self.palette, pixels, self.transparent)
+
+    def paste(self, other, left, top):
+        """
+        Method -- paste
+            Copies another image with the same palette onto this image
+        Parameters:
+            other(Gifimage) -- the image to copy from
+            left(int) -- the x coordinate to copy the image to
+            top(int) -- the y coordinate to copy the image to
+        """
+        span = min(other.width, self.width - left)
+        for row in range(min(other.height, self.height - top)):
+            start = (top + row) * self.width + left
+            self.pixels[start:start + span] = \
+                other.pixels[row * other.width:row * other.width + span]
+
+    def nearest_color(self, rgb):
+        """
+        Method -- nearest_color
+            Finds the palette entry closest to the given color
+        Parameters:
+            rgb(tuple) -- the red, green and blue values of the color
+        Returns an integer representing the palette index of the color
+        """
+        best, best_distance = 0, None
+        for index in range(len(self.palette) // 3):
+            red, green, blue = self.palette[3 * index:3 * index + 3]
+            distance = (red - rgb[0]) ** 2 + (green - rgb[1]) ** 2 + \
+                (blue - rgb[2]) ** 2
+            if best_distance is None or distance < best_distance:
+                best, best_distance = index, distance
+        return best
+
+
+def _lzw_decode(data, min_code_size, pixel_count):
+    """
+    Function -- _lzw_decode
+        Decompresses GIF LZW image data
+    Parameters:
+        data(bytes) -- the concatenated image data sub-blocks
+        min_code_size(int) -- the LZW minimum code size of the frame
+        pixel_count(int) -- the number of pixels in the frame
+    Returns a bytearray with one palette index per pixel
+    """
+    clear = 1 << min_code_size
+    end = clear + 1
+    code_size = min_code_size + 1
+    table = [bytes([index]) for index in range(clear)] + [b"", b""]
+    out = bytearray()
+    previous = None
+    bit_buffer = bit_count = 0
+
+    for byte in data:
+        bit_buffer |= byte << bit_count
+        bit_count += 8
+        while bit_count >= code_size:
+            code = bit_buffer & ((1 << code_size) - 1)
+            bit_buffer >>= code_size
+            bit_count -= code_size
+
+            if code == clear:
+                table = table[:clear + 2]
+                code_size = min_code_size + 1
+                previous = None
+                continue
+            if code == end:
+                return _pad(out, pixel_count)
+
+            if code < len(table):
+                entry = table[code]
+                if previous is not None:
+                    table.append(previous + entry[:1])
+            elif previous is not None:
+                entry = previous + previous[:1]
+                table.append(entry)
+            else:
+                raise ValueError("Corrupt GIF image data.")
+            out += entry
+            previous = entry
+
+            if len(table) == 1 << code_size and code_size < 12:
+                code_size += 1
+    return _pad(out, pixel_count)
+
+
+def _pad(pixels, pixel_count):
+    """
+    Function -- _pad
+        Trims or pads decoded pixels to the expected frame size
+    Parameters:
+        pixels(bytearray) -- the decoded palette indexes
+        pixel_count(int) -- the number of pixels in the frame
+    Returns a bytearray with exactly pixel_count entries
+    """
+    del pixels[pixel_count:]
+    pixels += bytes(pixel_count - len(pixels))
+    return pixels
+
+
+def _lzw_encode(pixels, min_code_size):
+    """
+    Function -- _lzw_encode
+        Compresses palette indexes with GIF LZW
+    Parameters:
+        pixels(bytearray) -- one palette index per pixel
+        min_code_size(int) -- the LZW minimum code size to use
+    Returns a bytearray with the compressed image data
+    """
+    clear = 1 << min_code_size
+    end = clear + 1
+    out = bytearray()
+    bit_buffer = bit_count = 0
+
+    def emit(code, size):
+        nonlocal bit_buffer, bit_count
+        bit_buffer |= code << bit_count
+        bit_count += size
+        while bit_count >= 8:
+            out.append(bit_buffer & 0xFF)
+            bit_buffer >>= 8
+            bit_count -= 8
+
+    code_size = min_code_size + 1
+    table = {}
+    next_code = end + 1
+    emit(clear, code_size)
+    current = None
+    for pixel in pixels:
+        if current is None:
+            current = pixel
+            continue
+        key = (current, pixel)
+        if key in table:
+            current = table[key]
+            continue
+        emit(current, code_size)
+        if next_code < 4096:
+            table[key] = next_code
+            next_code += 1
+            if next_code > 1 << code_size and code_size < 12:
+                code_size += 1
+        else:
+            # the table is full, start again with a fresh one
+            emit(clear, code_size)
+            table = {}
+            next_code = end + 1
+            code_size = min_code_size + 1
+        current = pixel
+    if current is not None:
+        emit(current, code_size)
+    emit(end, code_size)
+    if bit_count:
+        out.append(bit_buffer & 0xFF)
+    return out
+
+
+def _deinterlace(pixels, width, height):
+    """
+    Function -- _deinterlace
+        Reorders the rows of an interlaced GIF frame
+    Parameters:
+        pixels(bytearray) -- the decoded pixels in interlaced row order
+        width(int) -- the width of the frame
+        height(int) -- the height of the frame
+    Returns a bytearray with the rows in top to bottom order
+    """
+    rows = [row for start, step in ((0, 8), (4, 8), (2, 4), (1, 2))
+            for row in range(start, height, step)]
+    out = bytearray(len(pixels))
+    for source, row in enumerate(rows):
+        out[row * width:(row + 1) * width] = \
+            pixels[source * width:(source + 1) * width]
+    return out
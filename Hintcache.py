@@ -0,0 +1,88 @@
+import collections
+
+from Puzzleboard import Puzzleboard
+from solver import canonical_key
+import config
+
+
+class Hintcache:
+    """
+    Class: Hintcache
+    This class represents the best next moves of the boards met on the
+    solutions found so far. Once a board is solved, every board along its
+    solution is stored with the move that follows it, so the boards the
+    player reaches by taking the hints are answered without searching
+    again. A board and its mirror image across the diagonal share an entry,
+    and the boards used the longest time ago are dropped once the cache is
+    full
+    ---
+    Attributes:
+        size(int) -- the most boards kept
+        moves(OrderedDict) -- the next move code by board key, the boards
+            used the longest time ago first
+    """
+    def __init__(self, size=None):
+        """
+        Method -- __init__
+            The constructor of the class, creates empty Hintcache instances
+        Parameters:
+            size(int) -- the most boards kept, the configured number when
+                not given
+        """
+        self.size = size or config.HINT_CACHE_SIZE
+        self.moves = collections.OrderedDict()
+
+    def get(self, tiles, rows, columns, blank_tile):
+        """
+        Method -- get
+            Looks up the best next move of a board
+        Parameters:
+            tiles(list) -- the tile numbers of the cells, row by row
+            rows(int) -- the number of rows of the board
+            columns(int) -- the number of columns of the board
+            blank_tile(int) -- the number of the blank tile
+        Returns an integer with the blank move code, or None if the board
+            isn't in the cache
+        """
+        key, mirrored = canonical_key(tiles, rows, columns, blank_tile)
+        code = self.moves.get(key)
+        if code is None:
+            return None
+        # the board was used again, so it is dropped last
+        self.moves.move_to_end(key)
+        return code ^ 2 if mirrored else code
+
+    def put_path(self, tiles, rows, columns, blank_tile, codes):
+        """
+        Method -- put_path
+            Stores every board along a shortest solution with the move that
+            follows it
+        Parameters:
+            tiles(list) -- the tile numbers of the cells, row by row
+            rows(int) -- the number of rows of the board
+            columns(int) -- the number of columns of the board
+            blank_tile(int) -- the number of the blank tile
+            codes(list) -- the blank move codes of the solution
+        """
+        board = Puzzleboard()
+        board.set_dimensions(rows, columns)
+        board.set_tiles(list(range(rows * columns)))
+        board.set_board(list(tiles), list(tiles).index(blank_tile))
+        for code in codes:
+            # what is left of a shortest solution is one for every board
+            # along it, and its mirror image takes the mirrored move
+            key, mirrored = canonical_key(board.cells, rows, columns,
+                                          blank_tile)
+            self.moves[key] = code ^ 2 if mirrored else code
+            self.moves.move_to_end(key)
+            board.move_blank(code)
+        while len(self.moves) > self.size:
+            self.moves.popitem(last=False)
+
+    def count(self):
+        """
+        Method -- count
+            Counts the boards in the cache
+        Returns an integer with the number of boards
+        """
+        return len(self.moves)
@@ -0,0 +1,79 @@
+class Histogram:
+    """
+    Class: Histogram
+    This class represents a latency histogram in the style of HDR
+    histograms. Every power of two is split into the same number of
+    buckets, so each value is kept to a fixed share of its size whatever
+    its magnitude, and the memory used only grows with the number of powers
+    of two recorded, never with the number of values
+    ---
+    Attributes:
+        bits(int) -- the bits of each value kept, 7 keeping values to
+            within 2% of their size
+        counts(dict) -- the number of values by the lowest value of their
+            bucket
+        count(int) -- the number of values recorded
+        total(int) -- the sum of the values recorded
+        lowest(int) -- the smallest value recorded, or None
+        highest(int) -- the largest value recorded, or None
+    """
+    def __init__(self, bits=7):
+        """
+        Method -- __init__
+            The constructor of the class, creates empty Histogram instances
+        Parameters:
+            bits(int) -- the bits of each value kept
+        """
+        self.bits = bits
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.lowest = None
+        self.highest = None
+
+    def record(self, value):
+        """
+        Method -- record
+            Adds a value to the histogram
+        Parameters:
+            value(int) -- the value, such as a latency in nanoseconds
+        """
+        # drop the bits below the ones kept
+        shift = max(value.bit_length() - self.bits, 0)
+        bucket = value >> shift << shift
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.lowest is None or value < self.lowest:
+            self.lowest = value
+        if self.highest is None or value > self.highest:
+            self.highest = value
+
+    def percentile(self, percentile):
+        """
+        Method -- percentile
+            Finds the value that a share of the values are at or below
+        Parameters:
+            percentile(float) -- the share, from 0 to 100
+        Returns an integer with the highest value of the bucket holding the
+            percentile, at most the largest value recorded, or 0 if the
+            histogram is empty
+        """
+        if not self.count:
+            return 0
+        rank = max(1, -(-self.count * percentile // 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                shift = max(bucket.bit_length() - self.bits, 0)
+                return min(bucket + (1 << shift) - 1, self.highest)
+        return self.highest
+
+    def mean(self):
+        """
+        Method -- mean
+            Works out the mean of the values
+        Returns a float with the mean, or 0.0 if the histogram is empty
+        """
+        return self.total / self.count if self.count else 0.0
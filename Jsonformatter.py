@@ -0,0 +1,71 @@
+import json
+import logging
+
+
+class Jsonformatter(logging.Formatter):
+    """
+    Class: Jsonformatter
+    This class represents a logging formatter writing each record as one
+    line of JSON, so the fields of a line can be read back whatever the
+    message holds. Besides the time, level, message and location, a line
+    has the structured fields the formatter is given, taken from the
+    record or, when the record has none, their default value, and the
+    traceback and stack of the record in fields of their own
+    ---
+    Attributes:
+        fields(dict) -- the default value of each structured field
+    """
+    def __init__(self, fields=None):
+        """
+        Method -- __init__
+            The constructor of the class, creates Jsonformatter instances
+        Parameters:
+            fields(dict) -- the default value of each structured field
+        """
+        super().__init__()
+        self.fields = fields or {}
+
+    def format(self, record):
+        """
+        Method -- format
+            Writes a record as a line of JSON
+        Parameters:
+            record(LogRecord) -- the record
+        Returns a string with the JSON object, on one line
+        """
+        line = {"timestamp": self.formatTime(record),
+                "level": record.levelname,
+                "message": record.getMessage(),
+                "location": f"{record.module}.{record.funcName}"}
+        # a field left out or given as None takes its default value
+        for field, default in self.fields.items():
+            value = getattr(record, field, None)
+            line[field] = default if value is None else value
+        # a traceback taken off the record before it was queued is kept
+        # in the traceback field
+        traceback = getattr(record, "traceback", None)
+        if record.exc_info:
+            traceback = self.formatException(record.exc_info)
+        if traceback:
+            line["traceback"] = traceback
+        if record.stack_info:
+            line["stack"] = self.formatStack(record.stack_info)
+        # json.dumps escapes the line breaks, so a record is one line
+        return json.dumps(line, default=str)
+
+
+def keep_traceback(record):
+    """
+    Function -- keep_traceback
+        Moves the traceback of a record into its traceback field, so
+        queueing the record doesn't add it to the message
+    Parameters:
+        record(LogRecord) -- the record
+    Returns True, so the record is always logged
+    """
+    if record.exc_info:
+        record.traceback = logging.Formatter().formatException(
+            record.exc_info)
+        record.exc_info = None
+        record.exc_text = None
+    return True
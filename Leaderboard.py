@@ -1,7 +1,14 @@
-import os
+import heapq
+import logging
 import turtle
 
+from Leaderclient import Leaderclient
+from Leaderdb import Leaderdb
+from Leaderlog import Leaderlog
+from Leaderlog import clean_name
+from verifier import check_log
 import config
+import instrument
 import utils
 
 
@@ -17,7 +24,22 @@ class Leaderboard:
         thumbnail_img(str) -- the file path of the thumbnail image
         thumbnail_painter(Turtle) -- the turtle instance that draws
             the thumbnail
+        records(Leaderlog) -- the leaderboard records, a Leaderdb
+            instance when the SQLite backend is configured or a
+            Leaderclient instance when the leaderboard service is
+        puzzle(str) -- the name of the puzzle being played, whose
+            leaders are displayed
+        leaders(list) -- a bounded heap of the best records of the puzzle,
+            worst first, or None until they are loaded from the records
+        ranked(int) -- the number of records put in the heap, used to
+            rank equal scores in the order they were recorded
+        drawn(list) -- the leaders currently displayed on the screen
+        leaders_painter(Turtle) -- the turtle instance that writes the
+            leaders
     """
+    __slots__ = ("painter", "thumbnail_img", "thumbnail_painter", "records",
+                 "puzzle", "leaders", "ranked", "drawn", "leaders_painter")
+
     def __init__(self, painter):
         """
         Method -- __init__
@@ -29,6 +51,21 @@ class Leaderboard:
         self.thumbnail_img = ""
         self.thumbnail_painter = turtle.Turtle()
         self.thumbnail_painter.hideturtle()
+        self.puzzle = None
+        self.leaders = None
+        self.ranked = 0
+        self.drawn = None
+        self.leaders_painter = turtle.Turtle()
+        self.leaders_painter.hideturtle()
+        # use the SQLite database if configured, moving the text file over
+        if config.LEADER_BOARD_BACKEND == "sqlite":
+            self.records = Leaderdb(config.LEADER_DB_PATH)
+            self.records.migrate(config.LEADER_BOARD_PATH)
+        # use the service if configured, the text file while it is down
+        elif config.LEADER_BOARD_BACKEND == "service":
+            self.records = Leaderclient(Leaderlog(config.LEADER_BOARD_PATH))
+        else:
+            self.records = Leaderlog(config.LEADER_BOARD_PATH)
 
     def set_thumbnail_img(self, thumbnail_img):
         """
@@ -47,6 +84,26 @@ class Leaderboard:
         """
         return self.thumbnail_img
 
+    def set_puzzle(self, puzzle):
+        """
+        Method -- set_puzzle
+            Sets the name of the puzzle whose leaders are displayed
+        Parameters:
+            puzzle(str) -- the name of the puzzle being played
+        """
+        # the cached leaders belong to the previous puzzle
+        if puzzle != self.puzzle:
+            self.leaders = None
+        self.puzzle = puzzle
+
+    def get_puzzle(self):
+        """
+        Method -- get_puzzle
+            Gets the name of the puzzle whose leaders are displayed
+        Returns a string representing the name of the puzzle
+        """
+        return self.puzzle
+
     def set_thumbnail_painter(self, thumbnail_painter):
         """
         Method -- set_thumbnail_painter
@@ -87,34 +144,58 @@ class Leaderboard:
         self.painter.write("Leaders:",
                            align="left",
                            font=("Arial", 18, "normal"))
+        self.drawn = None
         self.load_leaders()
 
         # draw the thumbnail
         self.draw_thumbnail()
 
+    @instrument.span("Leaderboard.get_leaders")
+    def get_leaders(self):
+        """
+        Method -- get_leaders
+            Gets the best records of the current puzzle. They are read from
+            the leaderboard records the first time, and again only when
+            another game has changed the records
+        Returns a list of tuples of score and name, best first
+        """
+        if self.leaders is None or self.records.changed():
+            self.leaders = []
+            for rank, (score, name) in enumerate(
+                    self.records.top(config.LEADERS_SHOWN, self.puzzle)):
+                heapq.heappush(self.leaders, (-score, -rank, name))
+            self.ranked = len(self.leaders)
+        return [(-score, name)
+                for score, _, name in sorted(self.leaders, reverse=True)]
+
     def load_leaders(self):
         """
         Method -- load_leaders
-            Loads the leaders from the leaderboard file and displays the
-            first 5 records on the screen
-        """
-        # read the file with leaderboard records
-        with open(config.LEADER_BOARD_PATH, "r") as src_file:
-            # iterate through the lines in the file
-            for index, line in enumerate(src_file):
-                # only read the first five records
-                if index < 5:
-                    self.painter.setpos(config.LEADER_X,
+            Displays the first 5 leaders of the current puzzle on the screen
+            if they changed since they were last displayed
+        """
+        leaders = self.get_leaders()
+        if leaders == self.drawn:
+            return
+        self.drawn = leaders
+        self.leaders_painter.clear()
+        self.leaders_painter.penup()
+
+        # iterate through the best records
+        for index, (score, name) in enumerate(leaders):
+            self.leaders_painter.setpos(config.LEADER_X,
                                         config.LEADER_Y - index * 23)
-                    self.painter.pencolor(config.LEADER_BOARD_COLOR)
-                    self.painter.pensize(config.LEADER_PENSIZE)
+            self.leaders_painter.pencolor(config.LEADER_BOARD_COLOR)
+            self.leaders_painter.pensize(config.LEADER_PENSIZE)
 
-                    # write the record to the screen
-                    self.painter.write(line,
+            # write the record to the screen
+            self.leaders_painter.write(f"{score} : {name}",
                                        align="left",
                                        font=("Arial", 16, "normal"))
 
-    def add_to_leaderboard(self, moves, player_name):
+    @instrument.span("Leaderboard.add_to_leaderboard")
+    def add_to_leaderboard(self, moves, player_name, size="", limit=0,
+                           log=None):
         """
         Method -- add_to_leaderboard
             Adds the current player and their score to the leaderboard
@@ -122,87 +203,50 @@ class Leaderboard:
         Parameters:
             moves(int) -- the number of moves the player has made
             player_name(str) -- the name of the player
+            size(str) -- the board size, as rows x columns
+            limit(int) -- the maximum number of moves the player chose
+            log(Movelog) -- the record of the winning game, which must back
+                up the score, and is sent to the leaderboard service. The
+                seed of its board is kept with the score
         """
-        # create lists to store leaders and their scores read from the file
-        leaders = []
-        scores = []
-
-        # read the leaderboard file
-        new_content = ""
-        with open(config.LEADER_BOARD_PATH, "r") as src_file:
-            # if the leaderboard file is empty
-            if os.path.getsize(config.LEADER_BOARD_PATH) == 0:
-                # only add the new leader and their score
-                new_content += f"{str(moves)}:{player_name}\n"
-            # if the file is not empty
-            else:
-                # iterate through each line in the file
-                for line in src_file:
-                    # if the line is not empty
-                    if line.strip() != "":
-                        # split the line and save the score and the name
-                        score, name = line.strip().split(":")
-                        # add the name and score to the lists
-                        leaders.append([int(score.strip()), name.strip()])
-                        scores.append(int(score.strip()))
-
-                # find the position where the new leader should be inserted
-                insert_index = self.find_insert_pos(scores, moves)
-
-                # create a variable to check whether new record has been added
-                inserted = False
-                # iterate through the list of leaders
-                for index in range(len(leaders) + 1):
-                    # insert the new leader when reaching the insertion index
-                    if index == insert_index:
-                        new_content += f"{str(moves)} : {player_name}\n"
-                        # set inserted to True
-                        inserted = True
-                    # when new record hasn't been inserted
-                    elif not inserted:
-                        # get leaders from the list at the current index
-                        new_content += f"{str(leaders[index][0])} : " \
-                                       f"{leaders[index][1]}\n"
-                    # when new record has been added already
-                    else:
-                        # get leaders from the list at current index - 1
-                        new_content += f"{str(leaders[index - 1][0])} : " \
-                                       f"{leaders[index - 1][1]}\n"
-            # write the updated leaderboard content to the file
-            with open(config.LEADER_BOARD_PATH, "w") as outfile:
-                outfile.write(new_content)
-
-    def find_insert_pos(self, scores, new_score):
-        """
-        Method -- find_insert_pos
-            Finds the position where the new leader should be inserted
-            in the leaderboard file
-        Parameters:
-            scores(list) -- a sorted list of integers of all the current
-                scores in the leaderboard file
-            new_score(int) -- the score of the current player
-        Returns an integer representing the index in the list where the
-            new score should be inserted
-        """
-        # iterate over the list of scores
-        for index, score in enumerate(scores):
-            # if new score is less than the first score
-            if index == 0 and new_score < score:
-                # the new score should be inserted at index 0
-                return index
-            # if new score equals to the current score
-            if score == new_score:
-                # the new score should take the place of the current score
-                return index
-            if index <= len(scores) - 2:
-                # if the new score is between current score and its next one
-                if score < new_score < scores[index + 1]:
-                    # new score should be inserted after current score
-                    return index + 1
-            # if new score is greater than the last score
+        # only keep a score the record of the game backs up
+        if log is not None:
+            try:
+                check_log(log, moves)
+            except ValueError as err:
+                logging.error(f"Score of {player_name} not saved. {err}",
+                              extra={"puzzle": self.puzzle,
+                                     "event": "score_not_saved"})
+                return
+
+        # reload the cached leaders later if another game added records
+        if self.records.changed():
+            self.leaders = None
+
+        # add the record of the current puzzle to the leaderboard
+        seed = None if log is None else log.seed
+        try:
+            if config.LEADER_BOARD_BACKEND == "service":
+                self.records.add(moves, player_name, self.puzzle or "", size,
+                                 limit, seed, log)
             else:
-                # should insert it at the end of the list
-                return len(scores)
+                self.records.add(moves, player_name, self.puzzle or "", size,
+                                 limit, seed)
+        except (TimeoutError, ValueError) as err:
+            logging.error(f"Score of {player_name} not saved. {err}",
+                          extra={"puzzle": self.puzzle,
+                                 "event": "score_not_saved"})
+            return
+
+        # keep the cached leaders up to date without reading the records
+        if self.leaders is not None:
+            leader = (-int(moves), -self.ranked, clean_name(player_name))
+            self.ranked += 1
+            if len(self.leaders) < config.LEADERS_SHOWN:
+                heapq.heappush(self.leaders, leader)
+            elif leader > self.leaders[0]:
+                heapq.heapreplace(self.leaders, leader)
+        self.load_leaders()
 
     def draw_thumbnail(self):
         """
@@ -0,0 +1,186 @@
+import base64
+import json
+import socket
+import time
+
+import config
+
+
+class Leaderclient:
+    """
+    Class: Leaderclient
+    This class represents a connection to the leaderboard service. It has
+    the same add, top and changed methods as Leaderlog. When the service
+    isn't running, the records are read and written through the leaderboard
+    log file instead, and the service is tried again a while later
+    ---
+    Attributes:
+        fallback(Leaderlog) -- the records used when the service can't be
+            reached
+        host(str) -- the address of the service
+        port(int) -- the TCP port of the service
+        socket_path(str) -- the Unix socket of the service, used instead of
+            the TCP port if set
+        stream(file) -- the connection to the service, or None
+        retry_at(float) -- the time before which the service isn't tried
+            again after a failure
+        version(list) -- the version of the records last seen
+    """
+    def __init__(self, fallback, host=None, port=None, socket_path=None):
+        """
+        Method -- __init__
+            The constructor of the class, creates Leaderclient instances
+        Parameters:
+            fallback(Leaderlog) -- the records to use without the service
+            host(str) -- the address of the service, the configured one
+                when not given
+            port(int) -- the TCP port of the service, the configured one
+                when not given
+            socket_path(str) -- the Unix socket of the service, the
+                configured one when not given
+        """
+        self.fallback = fallback
+        self.host = host or config.LEADER_SERVICE_HOST
+        self.port = port or config.LEADER_SERVICE_PORT
+        self.socket_path = socket_path or config.LEADER_SERVICE_SOCKET
+        self.stream = None
+        self.retry_at = 0
+        self.version = None
+
+    def connect(self):
+        """
+        Method -- connect
+            Opens the connection to the service
+        Raises OSError if the service can't be reached
+        """
+        if self.socket_path:
+            connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            connection.settimeout(config.LEADER_SERVICE_TIMEOUT)
+            try:
+                connection.connect(self.socket_path)
+            except OSError:
+                connection.close()
+                raise
+        else:
+            connection = socket.create_connection(
+                (self.host, self.port), config.LEADER_SERVICE_TIMEOUT)
+        self.stream = connection.makefile("rwb")
+        connection.close()
+
+    def close(self):
+        """
+        Method -- close
+            Closes the connection to the service
+        """
+        if self.stream is not None:
+            try:
+                self.stream.close()
+            except OSError:
+                pass
+            self.stream = None
+
+    def request(self, message):
+        """
+        Method -- request
+            Sends a request to the service and waits for the reply. A
+            connection closed by a restarted service is opened again once
+        Parameters:
+            message(dict) -- the request
+        Returns a dictionary with the reply, whose "ok" key tells whether
+            the service could carry out the request
+        Raises TimeoutError if the service doesn't reply in time, or another
+            OSError if the service can't be reached
+        """
+        if self.stream is None and time.monotonic() < self.retry_at:
+            raise ConnectionError("The leaderboard service is unavailable.")
+        for attempt in range(2):
+            reconnected = self.stream is None
+            try:
+                if reconnected:
+                    self.connect()
+                self.stream.write(json.dumps(message).encode("utf-8") + b"\n")
+                self.stream.flush()
+                line = self.stream.readline()
+                if not line:
+                    raise ConnectionError("The leaderboard service closed "
+                                          "the connection.")
+                return json.loads(line)
+            except TimeoutError:
+                # the service may still carry out the request, don't repeat it
+                self.close()
+                raise
+            except OSError:
+                self.close()
+                # only retry a connection that was already open
+                if reconnected or attempt:
+                    self.retry_at = time.monotonic() + \
+                        config.LEADER_SERVICE_RETRY
+                    raise
+
+    def changed(self):
+        """
+        Method -- changed
+            Checks whether the records changed since the last check
+        Returns a boolean indicating whether the records have changed
+        """
+        try:
+            version = self.request({"op": "version"}).get("version")
+        except OSError:
+            return self.fallback.changed()
+        changed = version != self.version
+        self.version = version
+        return changed
+
+    def add(self, moves, player_name, puzzle="", size="", limit=0,
+            seed=None, log=None):
+        """
+        Method -- add
+            Submits a new record to the service, or appends it to the log
+            file if the service can't be reached
+        Parameters:
+            moves(int) -- the number of moves the player has made
+            player_name(str) -- the name of the player
+            puzzle(str) -- the name of the puzzle that was played
+            size(str) -- the board size, as rows x columns
+            limit(int) -- the maximum number of moves the player chose
+            seed(int) -- the seed of the board, if known
+            log(Movelog) -- the record of the winning game, sent along so
+                the service can check the score
+        Raises TimeoutError if the service or the log file doesn't take the
+            record in time, or ValueError if the service refuses the score
+        """
+        message = {"op": "add", "moves": int(moves), "name": player_name,
+                   "puzzle": puzzle, "size": size, "limit": int(limit),
+                   "seed": seed}
+        if log is not None:
+            message["replay"] = base64.b64encode(log.encode()).decode("ascii")
+        try:
+            reply = self.request(message)
+        except TimeoutError:
+            raise
+        except OSError:
+            self.fallback.add(moves, player_name, puzzle, size, limit, seed)
+            return
+        if reply.get("refused"):
+            raise ValueError(reply.get("error", "The score was refused."))
+        if not reply.get("ok"):
+            raise TimeoutError(reply.get("error", "The record was refused."))
+
+    def top(self, count, puzzle=None):
+        """
+        Method -- top
+            Gets the best records
+        Parameters:
+            count(int) -- the number of records to get
+            puzzle(str) -- the puzzle to get the records of, or None for
+                the records of all the puzzles
+        Returns a list of tuples of score and name of the best records
+        """
+        try:
+            reply = self.request({"op": "top", "count": count,
+                                  "puzzle": puzzle})
+        except OSError:
+            return self.fallback.top(count, puzzle)
+        if not reply.get("ok"):
+            return self.fallback.top(count, puzzle)
+        return [tuple(leader) for leader in reply["leaders"]]
@@ -0,0 +1,189 @@
+import os
+import sqlite3
+import threading
+import time
+
+from Leaderlog import Leaderlog
+from Leaderlog import clean_name
+import config
+
+
+class Leaderdb:
+    """
+    Class: Leaderdb
+    This class represents the leaderboard records stored in a SQLite
+    database. Every record has its puzzle, board size, move limit,
+    timestamp and board seed, and the index on (puzzle, moves, timestamp)
+    answers the best records of a puzzle without sorting. It has the same
+    add and top methods as Leaderlog, so the leaderboard can use either of
+    them
+    ---
+    Attributes:
+        path(str) -- the path to the database file
+        connection(Connection) -- the connection to the database
+        lock(Lock) -- the lock serialising the use of the connection
+        version(int) -- the data version of the database when this
+            instance last checked it
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS scores (
+            id INTEGER PRIMARY KEY,
+            puzzle TEXT NOT NULL,
+            size TEXT NOT NULL,
+            moves INTEGER NOT NULL,
+            move_limit INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            timestamp REAL NOT NULL,
+            seed INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS scores_by_puzzle
+            ON scores (puzzle, moves, timestamp);
+        CREATE INDEX IF NOT EXISTS scores_by_moves
+            ON scores (moves, timestamp);
+    """
+    INSERT = "INSERT INTO scores (puzzle, size, moves, move_limit, name, " \
+             "timestamp, seed) VALUES (?, ?, ?, ?, ?, ?, ?)"
+    TOP = "SELECT moves, name FROM scores " \
+          "ORDER BY moves, timestamp, id LIMIT ?"
+    TOP_OF_PUZZLE = "SELECT moves, name FROM scores WHERE puzzle = ? " \
+                    "ORDER BY moves, timestamp, id LIMIT ?"
+
+    def __init__(self, path):
+        """
+        Method -- __init__
+            The constructor of the class, opens the database and creates
+            the table and indexes if they don't exist
+        Parameters:
+            path(str) -- the path to the database file
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False,
+                                          isolation_level=None,
+                                          timeout=config.LOCK_TIMEOUT)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(self.SCHEMA)
+        # databases made before the seed was recorded lack its column
+        columns = [row[1] for row in
+                   self.connection.execute("PRAGMA table_info(scores)")]
+        if "seed" not in columns:
+            self.connection.execute("ALTER TABLE scores ADD COLUMN seed "
+                                    "INTEGER")
+        self.version = self.data_version()
+
+    def data_version(self):
+        """
+        Method -- data_version
+            Gets the data version of the database, which changes whenever
+            another connection commits a change
+        Returns an integer representing the data version
+        """
+        return self.connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def changed(self):
+        """
+        Method -- changed
+            Checks whether another connection changed the database since
+            the last check
+        Returns a boolean indicating whether the database has changed
+        """
+        with self.lock:
+            version = self.data_version()
+            changed = version != self.version
+            self.version = version
+        return changed
+
+    def add(self, moves, player_name, puzzle="", size="", limit=0,
+            seed=None):
+        """
+        Method -- add
+            Inserts a new record into the database
+        Parameters:
+            moves(int) -- the number of moves the player has made
+            player_name(str) -- the name of the player
+            puzzle(str) -- the name of the puzzle that was played
+            size(str) -- the board size, as rows x columns
+            limit(int) -- the maximum number of moves the player chose
+            seed(int) -- the seed of the board, if known
+        Raises TimeoutError if the database stays locked by other games
+        """
+        with self.lock:
+            try:
+                self.connection.execute(self.INSERT,
+                                        (clean_name(puzzle, ""),
+                                         clean_name(size, ""), int(moves),
+                                         int(limit), clean_name(player_name),
+                                         time.time(),
+                                         None if seed is None else int(seed)))
+            except sqlite3.OperationalError as err:
+                # another game kept the database locked for too long
+                if "locked" in str(err):
+                    raise TimeoutError(str(err)) from err
+                raise
+
+    def top(self, count, puzzle=None):
+        """
+        Method -- top
+            Gets the best records
+        Parameters:
+            count(int) -- the number of records to get
+            puzzle(str) -- the puzzle to get the records of, or None for
+                the records of all the puzzles
+        Returns a list of tuples of score and name of the best records
+        """
+        with self.lock:
+            if puzzle is None:
+                return self.connection.execute(self.TOP, (count,)).fetchall()
+            return self.connection.execute(self.TOP_OF_PUZZLE,
+                                           (puzzle, count)).fetchall()
+
+    def migrate(self, log_path):
+        """
+        Method -- migrate
+            Copies the records of a leaderboard text file into the database
+            the first time the database is used. The database remembers
+            that it has been migrated, so this only happens once
+        Parameters:
+            log_path(str) -- the path to the leaderboard text file
+        Returns an integer with the number of records copied
+        Raises TimeoutError if the database stays locked by other games
+        """
+        with self.lock:
+            try:
+                # the write lock is taken before the version is read, so
+                # two games starting at once can't both copy the records
+                self.connection.execute("BEGIN IMMEDIATE")
+            except sqlite3.OperationalError as err:
+                if "locked" in str(err):
+                    raise TimeoutError(str(err)) from err
+                raise
+            try:
+                if self.connection.execute(
+                        "PRAGMA user_version").fetchone()[0]:
+                    self.connection.execute("ROLLBACK")
+                    return 0
+                records = []
+                if os.path.exists(log_path):
+                    records = Leaderlog(log_path).get_records()
+                self.connection.executemany(
+                    self.INSERT,
+                    ((puzzle, size, moves, limit, name, timestamp, seed)
+                     for moves, _, name, puzzle, size, limit, timestamp, seed
+                     in records))
+                self.connection.execute("PRAGMA user_version = 1")
+                self.connection.execute("COMMIT")
+            except Exception:
+                # a copy that failed halfway leaves nothing behind
+                if self.connection.in_transaction:
+                    self.connection.execute("ROLLBACK")
+                raise
+            return len(records)
+
+    def close(self):
+        """
+        Method -- close
+            Closes the connection to the database
+        """
+        with self.lock:
+            self.connection.close()
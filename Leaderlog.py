@@ -0,0 +1,365 @@
+import bisect
+import os
+import threading
+import time
+
+from Filelock import Filelock
+import config
+
+
+class Leaderlog:
+    """
+    Class: Leaderlog
+    This class represents the leaderboard records stored as an append-only
+    log file of "score : name : puzzle : size : limit : timestamp : seed"
+    lines, where lines of older files may only have the score and the name,
+    or no seed. The
+    records are kept in memory in lists sorted by score, one for all the
+    records and one per puzzle, so a new record costs one small append to
+    the file and a binary search insert. Once enough records have been
+    appended, the file is compacted in the background by rewriting it in
+    sorted order.
+    Several game processes can share the file. Every change is made while
+    holding an advisory lock on a lock file next to it, appends first read
+    the lines the other processes appended, and compaction writes a
+    temporary file that is renamed over the log, so neither a crash nor
+    two simultaneous wins can lose records
+    ---
+    Attributes:
+        path(str) -- the path to the leaderboard log file
+        records(list) -- sorted tuples of score, sequence number, name,
+            puzzle, board size, move limit, timestamp and the seed of the
+            board or None, where ties keep the order they were recorded in
+        puzzles(dict) -- the sorted records of each puzzle by puzzle name
+        unsorted(int) -- the number of records in the file written after
+            its sorted part
+        loaded(bool) -- whether the log file has been read
+        stamp(tuple) -- the inode, size and modification time of the file
+            when this instance last read or wrote it
+        offset(int) -- the number of bytes of the file read so far, which
+            always ends at a complete line
+        src_file(file) -- the log file as last read, kept open so its
+            inode can't be reused by a new file while it is compared
+        lock(RLock) -- the lock guarding the records within this process
+        compactor(Thread) -- the thread compacting the file, if any
+    """
+    def __init__(self, path):
+        """
+        Method -- __init__
+            The constructor of the class, creates Leaderlog instances
+        Parameters:
+            path(str) -- the path to the leaderboard log file
+        """
+        self.path = path
+        self.records = []
+        self.puzzles = {}
+        self.unsorted = 0
+        self.loaded = False
+        self.stamp = None
+        self.offset = 0
+        self.src_file = None
+        self.lock = threading.RLock()
+        self.compactor = None
+
+    def file_lock(self):
+        """
+        Method -- file_lock
+            Creates the lock shared by all the processes using the log file
+        Returns a Filelock instance for the log file
+        """
+        return Filelock(self.path + ".lock")
+
+    def load(self):
+        """
+        Method -- load
+            Reads the log file and builds the sorted index of the records
+        """
+        records = []
+        sorted_part = 0
+        stamp = None
+        offset = 0
+        src_file = None
+        if os.path.exists(self.path):
+            src_file = open(self.path, "rb")
+            stamp = file_stamp(src_file.fileno())
+            data = src_file.read()
+            # leave out a line that is still being written
+            offset = data.rfind(b"\n") + 1
+            for line in data[:offset].decode("utf-8", "replace").splitlines():
+                record = parse_record(line, len(records))
+                if record is None:
+                    continue
+                # the file is sorted up to the first record out of order
+                if sorted_part == len(records) and \
+                        (not records or records[-1][0] <= record[0]):
+                    sorted_part += 1
+                records.append(record)
+        records.sort()
+        puzzles = {}
+        for record in records:
+            puzzles.setdefault(record[3], []).append(record)
+        with self.lock:
+            if self.src_file is not None:
+                self.src_file.close()
+            self.src_file = src_file
+            self.records = records
+            self.puzzles = puzzles
+            self.unsorted = len(records) - sorted_part
+            self.stamp = stamp
+            self.offset = offset
+            self.loaded = True
+
+    def catch_up(self):
+        """
+        Method -- catch_up
+            Brings the records up to date with the log file. Only the lines
+            appended since the last read are read, unless the file has been
+            replaced by a compaction, in which case it is read again
+        """
+        with self.lock:
+            try:
+                stamp = file_stamp(self.path)
+            except FileNotFoundError:
+                stamp = None
+            if self.loaded and stamp == self.stamp:
+                return
+            if not self.loaded or stamp is None or self.src_file is None or \
+                    stamp[0] != self.stamp[0] or stamp[1] < self.offset:
+                self.load()
+                return
+
+            # read the complete lines appended by the other processes
+            self.src_file.seek(self.offset)
+            data = self.src_file.read()
+            end = data.rfind(b"\n") + 1
+            for line in data[:end].decode("utf-8", "replace").splitlines():
+                record = parse_record(line, len(self.records))
+                if record is not None:
+                    self.insert(record)
+            self.offset += end
+            self.stamp = stamp
+
+    def changed(self):
+        """
+        Method -- changed
+            Checks whether the log file was changed by someone else since
+            this instance last read or wrote it
+        Returns a boolean indicating whether the file has changed
+        """
+        try:
+            stamp = file_stamp(self.path)
+        except FileNotFoundError:
+            stamp = None
+        return self.loaded and stamp != self.stamp
+
+    def get_records(self):
+        """
+        Method -- get_records
+            Gets all the records, reading the log file the first time and
+            whenever someone else has changed it
+        Returns a list of record tuples sorted by score
+        """
+        if not self.loaded or self.changed():
+            self.catch_up()
+        return self.records
+
+    def top(self, count, puzzle=None, refresh=True):
+        """
+        Method -- top
+            Gets the best records
+        Parameters:
+            count(int) -- the number of records to get
+            puzzle(str) -- the puzzle to get the records of, or None for
+                the records of all the puzzles
+            refresh(bool) -- whether to read the changes made by other
+                processes first, instead of only using the records in
+                memory
+        Returns a list of tuples of score and name of the best records
+        """
+        records = self.get_records() if refresh else self.records
+        if puzzle is not None:
+            records = self.puzzles.get(puzzle, [])
+        return [(record[0], record[2]) for record in records[:count]]
+
+    def insert(self, record):
+        """
+        Method -- insert
+            Adds an appended record to the sorted indexes
+        Parameters:
+            record(tuple) -- the record to add
+        """
+        bisect.insort(self.records, record)
+        bisect.insort(self.puzzles.setdefault(record[3], []), record)
+        self.unsorted += 1
+
+    def add(self, moves, player_name, puzzle="", size="", limit=0,
+            seed=None):
+        """
+        Method -- add
+            Appends a new record to the log file and to the sorted indexes,
+            and starts a compaction when enough records have been appended
+        Parameters:
+            moves(int) -- the number of moves the player has made
+            player_name(str) -- the name of the player
+            puzzle(str) -- the name of the puzzle that was played
+            size(str) -- the board size, as rows x columns
+            limit(int) -- the maximum number of moves the player chose
+            seed(int) -- the seed of the board, if known
+        Raises TimeoutError if the log file stays locked by other processes
+        """
+        self.add_many([(moves, player_name, puzzle, size, limit, seed)])
+
+    def add_many(self, scores):
+        """
+        Method -- add_many
+            Appends a group of new records to the log file with a single
+            write and adds them to the sorted indexes
+        Parameters:
+            scores(list) -- tuples of moves, player name, puzzle, board
+                size, move limit and board seed, or None, of the new
+                records
+        Raises TimeoutError if the log file stays locked by other processes
+        """
+        with self.lock, self.file_lock():
+            # read the records other players added since the last read
+            self.catch_up()
+            timestamp = round(time.time(), 3)
+            records = [(int(moves), len(self.records) + index,
+                        clean_name(player_name), clean_name(puzzle, ""),
+                        clean_name(size, ""), int(limit), timestamp,
+                        None if seed is None else int(seed))
+                       for index, (moves, player_name, puzzle, size, limit,
+                                   seed) in enumerate(scores)]
+            lines = "".join(format_record(record)
+                            for record in records).encode("utf-8")
+
+            descriptor = os.open(self.path,
+                                 os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+            try:
+                # the lines read end at the last complete line, so anything
+                # past them is a line a crashed process left unfinished,
+                # which is cut off rather than read as a record
+                if os.fstat(descriptor).st_size > self.offset:
+                    os.ftruncate(descriptor, self.offset)
+                while lines:
+                    lines = lines[os.write(descriptor, lines):]
+                self.stamp = file_stamp(descriptor)
+            finally:
+                os.close(descriptor)
+            self.offset = self.stamp[1]
+            for record in records:
+                self.insert(record)
+
+            compact = self.unsorted >= config.LEADER_BOARD_COMPACT_EVERY and \
+                (self.compactor is None or not self.compactor.is_alive())
+        if compact:
+            self.compactor = threading.Thread(target=self.compact,
+                                              daemon=True)
+            self.compactor.start()
+
+    def compact(self):
+        """
+        Method -- compact
+            Rewrites the log file with the records in sorted order. The
+            sorted records are written to a temporary file without holding
+            the lock, then the lines appended in the meantime are copied
+            over and the temporary file is flushed to disk and renamed over
+            the log, so the log is never left half written
+        """
+        with self.lock, self.file_lock():
+            self.catch_up()
+            # there is nothing to compact before the file exists
+            if self.stamp is None:
+                return
+            snapshot = list(self.records)
+            offset = self.offset
+            # keep the file of the snapshot open, so its inode stays unique
+            source = open(self.path, "rb")
+
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with source, open(temp_path, "wb") as outfile:
+                outfile.writelines(format_record(record).encode("utf-8")
+                                   for record in snapshot)
+                with self.lock, self.file_lock():
+                    # give up if another process compacted the log first
+                    if file_stamp(self.path)[0] != \
+                            file_stamp(source.fileno())[0]:
+                        return
+                    # copy the lines appended while the snapshot was written
+                    source.seek(offset)
+                    tail = source.read()
+                    outfile.write(tail[:tail.rfind(b"\n") + 1])
+                    outfile.flush()
+                    os.fsync(outfile.fileno())
+                    os.replace(temp_path, self.path)
+            # read the compacted file once the other processes can go on
+            self.load()
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+
+def file_stamp(file):
+    """
+    Function -- file_stamp
+        Gets the values that change when a file is replaced or written to
+    Parameters:
+        file(str) -- the path or the descriptor of the file
+    Returns a tuple of the inode, size and modification time of the file
+    """
+    stat = os.stat(file)
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def clean_name(player_name, default="anonymous"):
+    """
+    Function -- clean_name
+        Makes a player name or another text field safe to store in a
+        leaderboard line
+    Parameters:
+        player_name(str) -- the name of the player
+        default(str) -- the value to use for an empty name
+    Returns a string with the name without separators or line breaks
+    """
+    name = " ".join(str(player_name).replace(":", " ").split())
+    return name or default
+
+
+def format_record(record):
+    """
+    Function -- format_record
+        Formats a record as a line of the leaderboard file
+    Parameters:
+        record(tuple) -- the record to format
+    Returns a string with the record line
+    """
+    moves, _, name, puzzle, size, limit, timestamp, seed = record
+    line = f"{moves} : {name} : {puzzle} : {size} : {limit} : {timestamp}"
+    # leave the seed out when it isn't known
+    if seed is not None:
+        line += f" : {seed}"
+    return line + "\n"
+
+
+def parse_record(line, sequence):
+    """
+    Function -- parse_record
+        Parses a line of the leaderboard file
+    Parameters:
+        line(str) -- the line to parse
+        sequence(int) -- the position of the record in the file
+    Returns a record tuple, or None if the line doesn't hold a record
+    """
+    # lines of older files only have the score and the name, or no seed
+    fields = [field.strip() for field in line.split(":")]
+    if len(fields) < 2 or not fields[0].isdecimal():
+        return None
+    fields += [""] * 6
+    try:
+        limit, timestamp = int(fields[4] or 0), float(fields[5] or 0)
+        seed = int(fields[6]) if fields[6] else None
+    except ValueError:
+        return None
+    return int(fields[0]), sequence, fields[1], fields[2], fields[3], \
+        limit, timestamp, seed
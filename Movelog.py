@@ -0,0 +1,255 @@
+from Puzzleboard import UNPACKED
+
+# the bytes every replay file starts with, changed whenever the same
+# record would replay differently
+MAGIC = b"SPZREPLAY2\n"
+
+
+class Movelog:
+    """
+    Class: Movelog
+    This class represents the record of one game: the board it was played
+    on, the seed its scramble was made from, and every move of the blank
+    tile packed in 2 bits, four moves to a byte. Encoded, a record is a
+    varint length followed by varint fields, so a 100 move game takes
+    about 40 bytes, and records can be appended to a replay file and read
+    back one by one
+    ---
+    Attributes:
+        puzzle(str) -- the name of the puzzle
+        player(str) -- the name of the player
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        blank_tile(int) -- the number of the blank tile
+        move_limit(int) -- the move limit, which is also the number of
+            scramble moves
+        seed(int) -- the seed of the random scramble
+        resets(list) -- the numbers of moves made when the player put the
+            tiles back in their solved order
+        count(int) -- the number of moves
+        packed(bytearray) -- the move codes, 2 bits each, lowest bits first
+    """
+    __slots__ = ("puzzle", "player", "rows", "columns", "blank_tile",
+                 "move_limit", "seed", "resets", "count", "packed")
+
+    def __init__(self, rows, columns, blank_tile, move_limit, seed,
+                 puzzle="", player=""):
+        """
+        Method -- __init__
+            The constructor of the class, creates empty Movelog instances
+        Parameters:
+            rows(int) -- the number of rows of the board
+            columns(int) -- the number of columns of the board
+            blank_tile(int) -- the number of the blank tile
+            move_limit(int) -- the move limit and number of scramble moves
+            seed(int) -- the seed of the random scramble
+            puzzle(str) -- the name of the puzzle
+            player(str) -- the name of the player
+        """
+        self.puzzle = puzzle
+        self.player = player
+        self.rows = rows
+        self.columns = columns
+        self.blank_tile = blank_tile
+        self.move_limit = move_limit
+        self.seed = seed
+        self.resets = []
+        self.count = 0
+        self.packed = bytearray()
+
+    def append(self, code):
+        """
+        Method -- append
+            Records a move of the blank tile
+        Parameters:
+            code(int) -- the move code, 0 up, 1 down, 2 left or 3 right
+        """
+        shift = (self.count & 3) * 2
+        if shift == 0:
+            self.packed.append(code)
+        else:
+            self.packed[-1] |= code << shift
+        self.count += 1
+
+    def add_reset(self):
+        """
+        Method -- add_reset
+            Records that the tiles were put back in their solved order
+        """
+        self.resets.append(self.count)
+
+    def codes(self):
+        """
+        Method -- codes
+            Goes through the recorded moves
+        Returns a generator of the move codes, in the order they were made
+        """
+        count = self.count
+        for byte in self.packed:
+            for code in UNPACKED[byte][:count]:
+                yield code
+            count -= 4
+
+    def segments(self):
+        """
+        Method -- segments
+            Splits the moves at the resets
+        Returns a list of tuples of the packed moves and the number of moves
+            between two resets, the first one starting from the scramble
+        """
+        bounds = [0] + self.resets + [self.count]
+        result = []
+        for start, end in zip(bounds, bounds[1:]):
+            if start % 4 == 0:
+                result.append((self.packed[start // 4:(end + 3) // 4],
+                               end - start))
+            else:
+                # moves not starting at a byte boundary are packed again
+                log = Movelog(0, 0, 0, 0, 0)
+                for code in list(self.codes())[start:end]:
+                    log.append(code)
+                result.append((log.packed, end - start))
+        return result
+
+    def encode(self):
+        """
+        Method -- encode
+            Encodes the record for a replay file
+        Returns the bytes of the record, starting with their length
+        """
+        body = bytearray()
+        for text in (self.puzzle, self.player):
+            data = str(text).encode("utf-8")
+            body += encode_varint(len(data)) + data
+        for number in (self.rows, self.columns, self.blank_tile,
+                       self.move_limit, self.seed, len(self.resets),
+                       *self.resets, self.count):
+            body += encode_varint(number)
+        body += self.packed
+        return encode_varint(len(body)) + body
+
+    @classmethod
+    def decode(cls, data):
+        """
+        Method -- decode
+            Decodes a record of a replay file
+        Parameters:
+            data(bytes) -- the record, without its length
+        Returns a Movelog instance with the record
+        Raises ValueError if the record is damaged
+        """
+        texts = []
+        offset = 0
+        for _ in range(2):
+            length, offset = decode_varint(data, offset)
+            texts.append(bytes(data[offset:offset + length]).decode("utf-8"))
+            offset += length
+        numbers = []
+        for _ in range(6):
+            number, offset = decode_varint(data, offset)
+            numbers.append(number)
+        log = cls(*numbers[:5], texts[0], texts[1])
+        for _ in range(numbers[5]):
+            reset, offset = decode_varint(data, offset)
+            log.resets.append(reset)
+        log.count, offset = decode_varint(data, offset)
+        log.packed = bytearray(data[offset:])
+        if len(log.packed) != (log.count + 3) // 4:
+            raise ValueError("The moves of the replay are damaged.")
+        return log
+
+
+def encode_varint(number):
+    """
+    Function -- encode_varint
+        Encodes a number in 7 bit groups, lowest first, with the top bit
+        of each byte set when more bytes follow
+    Parameters:
+        number(int) -- the number, 0 or more
+    Returns the bytes of the number
+    """
+    data = bytearray()
+    while number > 0x7f:
+        data.append(number & 0x7f | 0x80)
+        number >>= 7
+    data.append(number)
+    return bytes(data)
+
+
+def decode_varint(data, offset):
+    """
+    Function -- decode_varint
+        Decodes a number encoded with encode_varint
+    Parameters:
+        data(bytes) -- the bytes holding the number
+        offset(int) -- the position of the number in data
+    Returns the number and the position after it
+    Raises ValueError if data ends in the middle of the number
+    """
+    number = shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("The replay ends in the middle of a number.")
+        byte = data[offset]
+        offset += 1
+        number |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return number, offset
+        shift += 7
+
+
+def append_log(path, log):
+    """
+    Function -- append_log
+        Appends a record to a replay file, creating the file if needed
+    Parameters:
+        path(str) -- the path to the replay file
+        log(Movelog) -- the record to add
+    Raises ValueError if the file is a replay file of another version
+    """
+    data = log.encode()
+    with open(path, "a+b") as outfile:
+        outfile.seek(0)
+        magic = outfile.read(len(MAGIC))
+        if not magic:
+            data = MAGIC + data
+        elif magic != MAGIC:
+            raise ValueError(f"{path} is not a replay file of this version.")
+        outfile.write(data)
+
+
+def read_logs(path, chunk_size=1 << 20):
+    """
+    Function -- read_logs
+        Reads the records of a replay file one at a time, holding only a
+        chunk of the file in memory, so files of any size can be scanned.
+        A record cut short at the end of the file is left out
+    Parameters:
+        path(str) -- the path to the replay file
+        chunk_size(int) -- the number of bytes to read at a time
+    Returns a generator of Movelog instances
+    Raises ValueError if the file isn't a replay file
+    """
+    with open(path, "rb") as infile:
+        if infile.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a replay file.")
+        buffer = b""
+        while True:
+            chunk = infile.read(chunk_size)
+            if not chunk:
+                return
+            buffer += chunk
+            offset = 0
+            view = memoryview(buffer)
+            while True:
+                try:
+                    length, start = decode_varint(view, offset)
+                except ValueError:
+                    break
+                if start + length > len(buffer):
+                    break
+                yield Movelog.decode(view[start:start + length])
+                offset = start + length
+            view.release()
+            buffer = buffer[offset:]
+
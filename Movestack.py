@@ -0,0 +1,156 @@
+import config
+
+
+class Movestack:
+    """
+    Class: Movestack
+    This class represents the undo and redo history of a game. Every move
+    of the blank tile is kept in 2 bits, four moves to a byte, and undoing
+    a move only moves the position in the history back, so the moves after
+    it can be redone until a new move replaces them. A copy of the board is
+    kept every CHECKPOINT_EVERY moves as a checkpoint, so going back or
+    forward to any point of the history starts from the nearest checkpoint
+    instead of the beginning
+    ---
+    Attributes:
+        packed(bytearray) -- the move codes, 2 bits each, lowest bits first
+        length(int) -- the number of moves in the history, including the
+            ones undone
+        position(int) -- the number of moves of the history on the board
+        every(int) -- the number of moves between two checkpoints, a
+            multiple of 4 so checkpoints start at a byte
+        checkpoints(list) -- tuples of the tiles and the blank cell of the
+            board at every checkpoint, the first one being the board the
+            history starts from
+    """
+    __slots__ = ("packed", "length", "position", "every", "checkpoints")
+
+    def __init__(self, tiles, blank, every=None):
+        """
+        Method -- __init__
+            The constructor of the class, creates empty Movestack instances
+        Parameters:
+            tiles(array) -- the tiles of the board the history starts from
+            blank(int) -- the cell of the blank tile on that board
+            every(int) -- the number of moves between two checkpoints, the
+                configured one when not given
+        """
+        self.packed = bytearray()
+        self.length = 0
+        self.position = 0
+        self.every = every or config.UNDO_CHECKPOINT_EVERY
+        self.checkpoints = [(tiles[:], blank)]
+
+    def get_code(self, index):
+        """
+        Method -- get_code
+            Gets a move of the history
+        Parameters:
+            index(int) -- the number of the move, from 0
+        Returns an integer with the move code
+        """
+        return self.packed[index >> 2] >> ((index & 3) * 2) & 3
+
+    def push(self, code, tiles, blank):
+        """
+        Method -- push
+            Adds a new move at the current position, dropping the moves
+            that were undone, and keeps a checkpoint when one is due
+        Parameters:
+            code(int) -- the move code, 0 up, 1 down, 2 left or 3 right
+            tiles(array) -- the tiles of the board after the move
+            blank(int) -- the cell of the blank tile after the move
+        """
+        index = self.position
+        # the undone moves can't be redone once a new move is made
+        if self.length > index:
+            del self.packed[(index + 3) // 4:]
+            del self.checkpoints[index // self.every + 1:]
+        shift = (index & 3) * 2
+        if shift == 0:
+            self.packed.append(code)
+        else:
+            self.packed[-1] = self.packed[-1] & ((1 << shift) - 1) | \
+                code << shift
+        self.position = self.length = index + 1
+        self.add_checkpoint(tiles, blank)
+
+    def add_checkpoint(self, tiles, blank):
+        """
+        Method -- add_checkpoint
+            Keeps a copy of the board if the position is at a checkpoint
+            that isn't kept yet
+        Parameters:
+            tiles(array) -- the tiles of the board at the position
+            blank(int) -- the cell of the blank tile at the position
+        """
+        if self.position % self.every == 0 and \
+                self.position // self.every == len(self.checkpoints):
+            self.checkpoints.append((tiles[:], blank))
+
+    def undo(self):
+        """
+        Method -- undo
+            Steps back over the last move on the board
+        Returns an integer with the code of the move to take back, or None
+            at the start of the history
+        """
+        if self.position == 0:
+            return None
+        self.position -= 1
+        return self.get_code(self.position)
+
+    def redo(self):
+        """
+        Method -- redo
+            Steps forward over the next undone move
+        Returns an integer with the code of the move to make again, or None
+            at the end of the history
+        """
+        if self.position == self.length:
+            return None
+        self.position += 1
+        return self.get_code(self.position - 1)
+
+    def checkpoint(self, position):
+        """
+        Method -- checkpoint
+            Finds where to start from to reach a point of the history
+        Parameters:
+            position(int) -- the number of moves of the history to reach
+        Returns a tuple of the tiles and blank cell of the nearest
+            checkpoint at or before the position, the packed moves from
+            there, and the number of those moves to play
+        """
+        index = min(position // self.every, len(self.checkpoints) - 1)
+        tiles, blank = self.checkpoints[index]
+        start = index * self.every
+        return tiles, blank, self.packed[start // 4:(position + 3) // 4], \
+            position - start
+
+    def set_position(self, position):
+        """
+        Method -- set_position
+            Sets the number of moves of the history on the board, after the
+            board was set to that point of the history
+        Parameters:
+            position(int) -- the position, at most the length
+        """
+        self.position = position
+
+    def get_position(self):
+        """
+        Method -- get_position
+            Gets the number of moves of the history on the board
+        Returns an integer with the position
+        """
+        return self.position
+
+    def get_length(self):
+        """
+        Method -- get_length
+            Gets the number of moves in the history, including the undone
+            ones
+        Returns an integer with the length
+        """
+        return self.length
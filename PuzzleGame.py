@@ -1,13 +1,23 @@
 import os
 import logging
+import multiprocessing
 import turtle
 import time
 
 from Buttonboard import Buttonboard
+from Eventqueue import Eventqueue
+from GameSession import GameSession
+from Hintcache import Hintcache
 from Leaderboard import Leaderboard
-from Puzzleboard import Puzzleboard
+from Qualitymeter import Qualitymeter
 from Tile import Tile
+import Movelog
+import calibrate
 import config
+import constructive
+import instrument
+import solver
+import thumbnails
 import utils
 
 
@@ -16,21 +26,40 @@ class PuzzleGame:
     Class: PuzzleGame
     This class represents the sliding puzzle game that users will be playing.
     It can start the game, load a new game, reset the game, quit the game,
-    display game results
+    display game results. The rules of the game are kept by a GameSession,
+    and this class draws it and passes the clicks of the player on to it
     ---
     Attributes:
         painter(Turtle) -- the turtle instance that will draw the game
         screen(TurtleScreen) -- the graphics window that the game will be
             drawn on
         game(str) -- the path to the game file that is currently being played
-        move(int) -- the maximum moves user can make to win the game (default
-             is 0)
         player_name(str) -- the name of the current player
-        puzzle_board(Puzzleboard) -- the puzzle board that has all the tiles
-        origin_board(Puzzleboard) -- the puzzle board in an unscrambled state
+        seed(int) -- the seed every board is scrambled with, such as the
+            seed of the daily challenge, or None for random boards
+        difficulty(str) -- the difficulty setting the move limit of every
+            board from the calibration, or None to ask for a move limit
+        session(GameSession) -- the game being played, whose board holds
+            the numbers of the tiles
+        tiles(list) -- the Tiles drawing the puzzle, by tile number
+        replaying(bool) -- whether a recorded game is being shown, during
+            which clicks on the tiles are ignored
         leader_board(Leaderboard) -- the leaderboard on the game window
         button_board(Buttonboard) -- the board displaying the buttons and
             player moves
+        hints(Hintcache) -- the best next moves of the boards solved so far
+        hint_pool(Pool) -- the process searching for hints, started with
+            the first search
+        hint_search(tuple) -- the pending search result with the tiles,
+            rows, columns and blank tile of the board searched, or None
+        hint_wanted(bool) -- whether a hint was asked for and not shown yet
+        hint_painter(Turtle) -- the turtle marking the tile to move
+        events(Eventqueue) -- the queue the clicks and key presses go
+            through
+        quality(Qualitymeter) -- the meter timing the redraws and choosing
+            the tier they are drawn in
+        moves_pending(bool) -- whether the player moves are waiting to be
+            written in the cheap tier
     """
     def __init__(self, painter, screen):
         """
@@ -46,12 +75,23 @@ class PuzzleGame:
         self.painter = painter
         self.screen = screen
         self.game = ""
-        self.move = 0
         self.player_name = ""
-        self.puzzle_board = Puzzleboard()
-        self.origin_board = Puzzleboard()
+        self.seed = None
+        self.difficulty = None
+        self.session = GameSession()
+        self.tiles = []
+        self.replaying = False
         self.leader_board = Leaderboard(painter)
         self.button_board = Buttonboard()
+        self.hints = Hintcache()
+        self.hint_pool = None
+        self.hint_search = None
+        self.hint_wanted = False
+        self.hint_painter = turtle.Turtle()
+        self.hint_painter.hideturtle()
+        self.events = Eventqueue(screen)
+        self.quality = Qualitymeter()
+        self.moves_pending = False
 
     def set_leader_board(self, leader_board):
         """
@@ -80,7 +120,7 @@ class PuzzleGame:
              move(int) -- the maximum number of moves user can make to win
                  the game
         """
-        self.move = move
+        self.session.set_move_limit(move)
 
     def get_move(self):
         """
@@ -89,7 +129,7 @@ class PuzzleGame:
         Returns an integer representing the maximum moves user can make to
             win the game
         """
-        return self.move
+        return self.session.get_move_limit()
 
     def set_player_name(self, player_name):
         """
@@ -108,15 +148,71 @@ class PuzzleGame:
         """
         return self.player_name
 
-    def set_puzzle_board(self, puzzle_board):
+    def set_seed(self, seed):
         """
-        Method -- set_puzzle_board
-            Sets the current puzzle board
+        Method -- set_seed
+            Sets the seed every board is scrambled with, so players given
+            the same puzzle, move limit and seed get the same board
         Parameters:
-            puzzle_board(Puzzleboard) -- the new puzzle board instance
-                that will be displayed in the game window
+            seed(int) -- the seed of the boards, or None for random boards
         """
-        self.puzzle_board = puzzle_board
+        self.seed = seed
+
+    def get_seed(self):
+        """
+        Method -- get_seed
+            Gets the seed every board is scrambled with
+        Returns an integer with the seed, or None for random boards
+        """
+        return self.seed
+
+    def set_difficulty(self, difficulty):
+        """
+        Method -- set_difficulty
+            Sets the difficulty, which decides the move limit of each board
+            from the calibration of its size
+        Parameters:
+            difficulty(str) -- a difficulty of DIFFICULTY_LEVELS, or None
+                to ask for a move limit
+        """
+        self.difficulty = difficulty
+
+    def get_difficulty(self):
+        """
+        Method -- get_difficulty
+            Gets the difficulty of the boards
+        Returns a string with the difficulty, or None if there is none
+        """
+        return self.difficulty
+
+    def get_session(self):
+        """
+        Method -- get_session
+            Returns the game being played
+        Returns the GameSession instance of the current game
+        """
+        return self.session
+
+    def get_quality(self):
+        """
+        Method -- get_quality
+            Gets the meter choosing the drawing quality, whose get_tier and
+            get_stats tell the tier and the times of the redraws
+        Returns the Qualitymeter of the game
+        """
+        return self.quality
+
+    def set_quality(self, tier):
+        """
+        Method -- set_quality
+            Sets the tier the game is drawn in, or lets the times of the
+            redraws choose it again
+        Parameters:
+            tier(str) -- "full", "cheap", or None to choose it
+        Raises ValueError if the tier is unknown
+        """
+        if self.quality.set_tier(tier):
+            self.apply_quality()
 
     def get_puzzle_board(self):
         """
@@ -124,7 +220,7 @@ class PuzzleGame:
             Returns the current puzzle board instance of the puzzle game
         Returns a Puzzleboard instance representing the current puzzle board
         """
-        return self.puzzle_board
+        return self.session.get_board()
 
     def set_game(self, game):
         """
@@ -165,14 +261,25 @@ class PuzzleGame:
         """
         # prompt for user inputs
         player_name = self.screen.textinput("name", "What's your name?")
+        self.set_player_name(player_name)
+
+        # a challenge comes with its move limit and a difficulty sets it
+        # for each board, otherwise ask for one
+        if self.get_move() or self.get_difficulty():
+            return
+        self.ask_move()
+
+    def ask_move(self):
+        """
+        Method -- ask_move
+            Asks for the maximum moves the user wants to make to win the
+            game and sets the move limit
+        """
         move = int(self.screen.numinput("move",
                                         "Enter the number of moves you "
                                         "want(5-200)",
                                         minval=5,
                                         maxval=200))
-
-        # update the player_name and the move attributes based on user inputs
-        self.set_player_name(player_name)
         self.set_move(move)
 
     def load_all_games(self):
@@ -197,7 +304,8 @@ class PuzzleGame:
         else:
             # if no puz file is found display error and end game
             utils.display_msg(config.FILE_ERR)
-            logging.error(f"No puz file found.")
+            logging.error(f"No puz file found.",
+                          extra={"event": "no_puzzles"})
             self.game_credit()
             quit()
 
@@ -208,44 +316,59 @@ class PuzzleGame:
         Parameters:
             game_path(str) -- a string representing the path of the
                 .puz file of the game
-        Returns a string, an integer, and a list of strings representing
-            the name of the current game thumbnail, the size of the
-            tiles, and a list of strings containing all the puzzle tile
-            image names
-        """
-        # create a dictionary to store the data in .puz file
-        data_dict = {}
-        with open(game_path) as infile:
-            for line in infile:
-                meta_data, data = line.strip().split(":")
-                data_dict[meta_data] = data.strip()
-
-        # get the name of the thumbnail image and add to screen
-        thumbnail = data_dict["thumbnail"]
-        if not os.path.isfile(thumbnail):
-            logging.error("Thumbnail image doesn't exist.")
+        Returns a string, an integer, a list of strings and two integers
+            representing the name of the current game thumbnail, the size
+            of the tiles, a list of strings containing all the puzzle tile
+            image names, and the number of rows and columns of the board
+        """
+        # read the .puz file into a new game, which only replaces the one
+        # being played once the puzzle can be shown, so a puzzle that fails
+        # leaves the board and its tiles as they were
+        session = GameSession(move_limit=self.session.get_move_limit())
+        try:
+            data_dict = session.load(game_path)
+        except (OSError, ValueError) as err:
+            logging.error(str(err), extra={"puzzle": game_path,
+                                           "event": "load_failed"})
             return
-        self.screen.addshape(thumbnail)
+
+        # get the name of the thumbnail image, made from the tiles if the
+        # puzzle has none
+        thumbnail = data_dict["thumbnail"]
+        if not thumbnail:
+            try:
+                thumbnail = thumbnails.find_thumbnail(game_path,
+                                                      puzzle=data_dict)
+            except (OSError, ValueError) as err:
+                logging.error(str(err), extra={"puzzle": game_path,
+                                               "event": "no_thumbnail"})
+                return
 
         # get the tile size from the meta data
-        tile_size = int(data_dict["size"])
-
-        # create a list to store the names of all puzzle images
-        puzzle_images = []
-        for key in data_dict.keys():
-            # if the key is a number, store its value
-            if key.isdecimal():
-                puzzle_images.append(data_dict[key])
-                if not os.path.isfile(data_dict[key]):
-                    logging.error("Tile image doesn't exist.")
-                    return
-                self.screen.addshape(data_dict[key])
-
-        # if the number of puzzle images is not in 4, 9, 16, log error
-        if len(puzzle_images) not in [4, 9, 16]:
-            logging.error(f"Only {len(puzzle_images)} tiles found. Not a valid puzzle.")
-            return
-        return thumbnail, tile_size, puzzle_images
+        tile_size = data_dict["size"]
+
+        # turtle draws images at their own size, so tiles too large for
+        # the player board are replaced by copies scaled down to fit
+        puzzle_images = data_dict["images"]
+        fit = utils.fit_tile_size(data_dict["rows"], data_dict["columns"],
+                                  config.PLAYER_BOARD_WIDTH,
+                                  config.PLAYER_BOARD_LENGTH)
+        if tile_size > fit:
+            try:
+                puzzle_images = thumbnails.scale_tiles(data_dict, fit)
+            except (OSError, ValueError) as err:
+                logging.error(str(err), extra={"puzzle": game_path,
+                                               "event": "scale_failed"})
+                return
+            tile_size = fit
+
+        # add the thumbnail and all the puzzle images to the screen
+        self.screen.addshape(thumbnail)
+        for puzzle_image in puzzle_images:
+            self.screen.addshape(puzzle_image)
+        self.session = session
+        return thumbnail, tile_size, puzzle_images, \
+            data_dict["rows"], data_dict["columns"]
 
     def redraw_game(self):
         """
@@ -255,6 +378,10 @@ class PuzzleGame:
         """
         # erase the original game information
         self.erase_game()
+        self.clear_hint()
+        # a hint asked for on the old puzzle isn't shown on the new one,
+        # even if its search is still running
+        self.hint_wanted = False
 
         # create and draw a new puzzle board with the newly loaded puzzles
         self.initialize_board()
@@ -263,51 +390,69 @@ class PuzzleGame:
         # draw the new thumbnail at the leaderboard
         self.leader_board.draw_thumbnail()
 
+        # display the leaders of the new puzzle
+        self.leader_board.load_leaders()
+
         # update the player move section
-        self.button_board.display_moves(self.puzzle_board.get_moves())
+        self.button_board.display_moves(self.session.get_moves())
 
-    def initialize_board(self):
+    def initialize_board(self, seed=None):
         """
         Method -- initialize_board
             Loads the thumbnail, tile size, puzzle images to be used in the
             game. Sets the attributes of the leaderboard, and the puzzle
             board with the loaded thumbnail, tile size and puzzle images
+        Parameters:
+            seed(int) -- the seed of the scramble, the seed attribute when
+                not given
         """
+        # load the thumbnail, tile size, and puzzle images of the game
+        meta_data = self.load_meta_data(self.get_game())
+
         # if the data are not loaded successfully
-        if not self.load_meta_data(self.get_game()):
+        if not meta_data:
             # display error message and stop processing
             msg = turtle.Turtle(config.FILE_ERR)
             self.screen.update()
             time.sleep(3)
             msg.hideturtle()
             return
-
-        # load the thumbnail, tile size, and puzzle images of the game
-        thumbnail, tile_size, puzzle_images = \
-            self.load_meta_data(self.get_game())
-
-        # create the tiles based on the size and the loaded puzzle images
-        tiles = []
+        thumbnail, tile_size, puzzle_images, rows, columns = meta_data
+
+        # the difficulty decides the move limit for the size of the board
+        if self.get_difficulty():
+            try:
+                self.set_move(calibrate.scramble_length(
+                    rows, columns, self.get_difficulty()))
+            except (OSError, ValueError) as err:
+                logging.error(str(err), extra={"puzzle": self.get_game(),
+                                               "event": "not_calibrated"})
+                if not self.get_move():
+                    self.ask_move()
+
+        # create the tiles based on the size and the loaded puzzle images,
+        # the tile numbers of the game board index this list
         self.screen.tracer(0)
-        for puzzle_image in puzzle_images:
-            tiles.append(Tile(tile_size, puzzle_image))
+        blank_tile = self.session.get_blank_tile()
+        self.tiles = [Tile(tile_size, puzzle_image, number,
+                           number == blank_tile)
+                      for number, puzzle_image in enumerate(puzzle_images)]
+        # bind each tile once, its clicks going through the event queue
+        for tile in self.tiles:
+            number = tile.get_tile_id()
+            tile.get_tile_painter().onclick(self.events.listener(
+                ("tile", number),
+                lambda number=number: self.click_tile(number)))
         self.screen.tracer(1)
 
-        # set the size, tiles, board attributes of the puzzle board
-        self.puzzle_board.set_size(int(len(puzzle_images) ** 0.5))
-        self.puzzle_board.set_tiles(tiles)
-        self.puzzle_board.set_board(tiles)
-
-        # set the same size, tiles, board attributes for the original board
-        self.origin_board.set_size(int(len(puzzle_images) ** 0.5))
-        self.origin_board.set_tiles(tiles)
-        self.origin_board.set_board(tiles)
-
-        # scramble the puzzle board
-        self.puzzle_board.scramble_board(self.get_move())
+        # scramble the puzzle board, recording the game for its player
+        self.session.scramble(self.get_move(),
+                              self.get_seed() if seed is None else seed)
+        self.session.get_log().player = self.get_player_name() or ""
 
-        # set the thumbnail_img attribute of the leaderboard
+        # set the thumbnail_img and puzzle attributes of the leaderboard
         self.get_leader_board().set_thumbnail_img(thumbnail)
+        self.get_leader_board().set_puzzle(self.session.get_puzzle())
 
     def start_game(self):
         """
@@ -331,7 +476,7 @@ class PuzzleGame:
 
         # create and draw the puzzle board
         self.initialize_board()
-        self.puzzle_board.draw_border(self.painter)
+        self.get_puzzle_board().draw_border(self.painter)
         self.draw_puzzle_board()
 
         # display the components of the leaderboard
@@ -339,23 +484,213 @@ class PuzzleGame:
 
         # display the components of the button board
         self.button_board.draw_border()
-        funcs = {"reset": self.reset_game,
-                 "load": self.load_new_game,
-                 "quit": self.quit_game}
+        # the buttons go through the event queue like the tiles
+        funcs = {name: self.events.listener(("button", name), func)
+                 for name, func in (("hint", self.show_hint),
+                                    ("reset", self.reset_game),
+                                    ("load", self.load_new_game),
+                                    ("quit", self.quit_game))}
         self.button_board.draw_buttons(self.screen, funcs)
-        self.button_board.display_moves(self.puzzle_board.get_moves())
+        self.button_board.display_moves(self.session.get_moves())
+
+        # ask for hints, take moves back and make them again from the
+        # keyboard, every press of the undo and redo keys counting
+        self.screen.onkey(self.events.listener(("key", "hint"),
+                                               self.show_hint),
+                          config.HINT_KEY)
+        self.screen.onkey(self.events.listener(None, self.undo_move),
+                          config.UNDO_KEY)
+        self.screen.onkey(self.events.listener(None, self.redo_move),
+                          config.REDO_KEY)
+        self.screen.onkey(self.events.listener(
+            ("key", "undo all"), lambda: self.jump_history(0)),
+            config.UNDO_ALL_KEY)
+        self.screen.onkey(self.events.listener(
+            ("key", "redo all"),
+            lambda: self.jump_history(config.MOVE_LIMIT_MAX)),
+            config.REDO_ALL_KEY)
+        # write the latencies of the hot paths when they are timed
+        if instrument.ENABLED:
+            self.screen.onkey(instrument.dump, config.INSTRUMENT_KEY)
+        self.screen.listen()
+
+    def undo_move(self):
+        """
+        Method -- undo_move
+            Takes back the last move and redraws the two tiles it moved
+        """
+        blank_x, blank_y = self.session.get_blank()
+        if self.replaying or not self.session.undo():
+            return
+        self.show_history_move([(blank_x, blank_y),
+                                self.session.get_blank()])
+
+    def redo_move(self):
+        """
+        Method -- redo_move
+            Makes the last move taken back again and redraws the two tiles
+            it moved
+        """
+        blank_x, blank_y = self.session.get_blank()
+        if self.replaying or not self.session.redo():
+            return
+        self.show_history_move([(blank_x, blank_y),
+                                self.session.get_blank()])
+
+    def jump_history(self, position):
+        """
+        Method -- jump_history
+            Goes to a point of the move history and redraws the tiles that
+            are no longer where they were
+        Parameters:
+            position(int) -- the number of moves of the history to keep
+        """
+        before = self.session.get_state()
+        if self.replaying or not self.session.jump(position):
+            return
+        columns = self.get_puzzle_board().get_columns()
+        self.show_history_move([divmod(index, columns) for index, tile
+                                in enumerate(self.session.get_state())
+                                if tile != before[index]])
+
+    def show_history_move(self, cells):
+        """
+        Method -- show_history_move
+            Redraws the cells changed by moving through the history,
+            displays the moves and shows the result if the game is over
+        Parameters:
+            cells(list) -- the (row, column) tuples of the changed cells
+        """
+        start = time.perf_counter_ns()
+        self.screen.tracer(0)
+        self.clear_hint()
+        for x, y in cells:
+            self.draw_cell(x, y)
+        self.screen.tracer(1)
+        self.show_moves()
+        self.end_frame(start)
+        if self.session.get_status() != "playing":
+            self.display_result(self.session.get_status())
+
+    def show_hint(self):
+        """
+        Method -- show_hint
+            Marks the tile whose move starts a shortest solution of the
+            board. Boards along a solution found before are answered from
+            the hint cache at once; otherwise the board is solved in
+            another process while the game goes on, and the tile is marked
+            when the solution comes back
+        """
+        board = self.get_puzzle_board()
+        if self.replaying or self.session.get_status() != "playing" or \
+                board.is_solved():
+            return
+        self.hint_wanted = True
+        code = self.hints.get(self.session.get_state(), board.get_rows(),
+                              board.get_columns(),
+                              self.session.get_blank_tile())
+        if code is not None:
+            self.draw_hint(code)
+        elif self.hint_search is None:
+            self.start_hint_search()
+
+    def start_hint_search(self):
+        """
+        Method -- start_hint_search
+            Starts solving the board in the hint process and looks for the
+            result every HINT_POLL_MS milliseconds, so the window never
+            waits for the search
+        """
+        board = self.get_puzzle_board()
+        tiles = self.session.get_state()
+        shape = (board.get_rows(), board.get_columns(),
+                 self.session.get_blank_tile())
+        # a pool of one process, which can be stopped in the middle of a
+        # search when the game ends
+        if self.hint_pool is None:
+            self.hint_pool = multiprocessing.Pool(1)
+        # boards too large to solve in the fewest moves are solved by
+        # placing their tiles one by one
+        if shape[0] * shape[1] > config.HINT_OPTIMAL_CELLS:
+            result = self.hint_pool.apply_async(constructive.solve,
+                                                (tiles, *shape))
+        else:
+            result = self.hint_pool.apply_async(
+                solver.solve, (tiles, *shape, config.HINT_TIME_LIMIT))
+        self.hint_search = (result, tiles) + shape
+        self.screen.ontimer(self.poll_hint, config.HINT_POLL_MS)
+
+    def poll_hint(self):
+        """
+        Method -- poll_hint
+            Checks whether the hint search is over, stores the solution it
+            found in the hint cache and shows the hint for the board as it
+            is now, which the player may have moved on from
+        """
+        result, tiles, rows, columns, blank_tile = self.hint_search
+        if not result.ready():
+            self.screen.ontimer(self.poll_hint, config.HINT_POLL_MS)
+            return
+        self.hint_search = None
+        try:
+            codes = result.get()
+        except ValueError as err:
+            logging.error(str(err), extra={"puzzle": self.get_game(),
+                                           "event": "hint_failed"})
+            self.hint_wanted = False
+            return
+        if codes is None:
+            logging.error(f"No hint found in {config.HINT_TIME_LIMIT} "
+                          f"seconds.", extra={"puzzle": self.get_game(),
+                                              "event": "hint_timeout"})
+            self.hint_wanted = False
+            return
+        # only the start of the long solutions of large boards is kept
+        self.hints.put_path(tiles, rows, columns, blank_tile,
+                            codes[:config.HINT_PATH_KEEP])
+        if self.hint_wanted:
+            self.show_hint()
+
+    def draw_hint(self, code):
+        """
+        Method -- draw_hint
+            Draws a border around the tile to move next
+        Parameters:
+            code(int) -- the move code of the blank tile
+        """
+        board = self.get_puzzle_board()
+        x, y = divmod(board.blank_steps()[code][board.blank],
+                      board.get_columns())
+        tile_size = self.tiles[0].get_tile_size()
+        start_x, start_y = self.get_cell_position(x, y, tile_size)
+        self.screen.tracer(0)
+        self.hint_painter.clear()
+        utils.draw_board(self.hint_painter,
+                         tile_size + 2,
+                         tile_size + 2,
+                         start_x - 1,
+                         start_y + 1,
+                         config.HINT_COLOR,
+                         config.HINT_PENSIZE)
+        self.screen.tracer(1)
+        self.hint_wanted = False
+
+    def clear_hint(self):
+        """
+        Method -- clear_hint
+            Removes the border around the hinted tile once the board
+            changes
+        """
+        self.hint_painter.clear()
 
     def reset_game(self):
         """
         Method -- reset_game
             Resets the puzzles to their unscrambled state
         """
-        # iterate over the items in the original board
-        for x, row in enumerate(self.origin_board.get_board()):
-            for y, col in enumerate(row):
-                # use the original board to update the current puzzle board
-                self.puzzle_board.get_board()[x][y] = \
-                    self.origin_board.get_board()[x][y]
+        # put the tiles of the game back in their solved order
+        self.session.reset()
+        self.clear_hint()
 
         # draw the updated puzzle board
         self.draw_puzzle_board()
@@ -379,7 +714,8 @@ class PuzzleGame:
         # if user choose an invalid game, display error message
         if new_game not in games:
             utils.display_msg(config.FILE_ERR)
-            logging.error(f"{new_game} is not a valid game.")
+            logging.error(f"{new_game} is not a valid game.",
+                          extra={"puzzle": new_game, "event": "bad_game"})
         else:
             self.screen.tracer(0)
             # set the game attribute to be the newly loaded game
@@ -397,11 +733,10 @@ class PuzzleGame:
         self.get_leader_board().erase_thumbnail()
 
         # sets the player move to 0
-        self.get_puzzle_board().set_moves(0)
+        self.session.set_moves(0)
 
         # erase all the tiles
-        tiles = self.get_puzzle_board().get_tiles()
-        for tile in tiles:
+        for tile in self.tiles:
             tile.erase_tile()
 
     def display_result(self, result):
@@ -416,6 +751,9 @@ class PuzzleGame:
                 indicate the result of the game in order to display the
                 corresponding message to the user
         """
+        # write the moves still waiting before the game ends
+        self.flush_moves()
+
         # if user loses the game, display the lose game message
         if result == "lose":
             utils.display_msg(config.LOSE_GAME)
@@ -423,11 +761,17 @@ class PuzzleGame:
         # if user wins the game, display the win game message
         elif result == "win":
             self.get_leader_board().add_to_leaderboard(
-                self.get_puzzle_board().get_moves(),
-                self.get_player_name())
+                self.session.get_moves(),
+                self.get_player_name(),
+                f"{self.get_puzzle_board().get_rows()}x"
+                f"{self.get_puzzle_board().get_columns()}",
+                self.get_move(),
+                self.session.get_log())
             utils.display_msg(config.WIN_GAME)
 
-        # show the game credit image and end game
+        # keep the record of the game, then show the game credit image and
+        # end game
+        self.save_replay()
         self.game_credit()
 
     def quit_game(self):
@@ -436,14 +780,83 @@ class PuzzleGame:
             Quits the game and displays the quit game image to user
         """
         utils.display_msg(config.QUIT_GAME)
+        self.save_replay()
         self.game_credit()
 
+    def save_replay(self):
+        """
+        Method -- save_replay
+            Appends the record of the game being played to the replay file
+        """
+        log = self.session.get_log()
+        if log is None or self.replaying:
+            return
+        try:
+            Movelog.append_log(config.REPLAY_PATH, log)
+        except (OSError, ValueError) as err:
+            logging.error(str(err), extra={"puzzle": log.puzzle,
+                                           "event": "replay_not_saved"})
+
+    def start_replay(self, log, speed):
+        """
+        Method -- start_replay
+            Shows a recorded game, playing its moves one by one
+        Parameters:
+            log(Movelog) -- the record of the game
+            speed(float) -- the number of moves to play per second
+        """
+        self.replaying = True
+        self.set_game(log.puzzle + ".puz")
+        self.set_player_name(log.player)
+        self.set_move(log.move_limit)
+        self.painter.hideturtle()
+
+        # draw the scrambled board the game started from
+        self.initialize_board(log.seed)
+        self.get_puzzle_board().draw_border(self.painter)
+        self.draw_puzzle_board()
+        self.get_leader_board().draw_leaderboard()
+        self.button_board.draw_border()
+        self.button_board.display_moves(self.session.get_moves())
+
+        codes = log.codes()
+        resets = list(log.resets)
+        delay = max(1, int(1000 / speed))
+
+        def play_next(played=0):
+            # put the tiles back in order where the player reset the game
+            while resets and resets[0] == played:
+                resets.pop(0)
+                self.session.reset()
+                self.draw_puzzle_board()
+            code = next(codes, None)
+            if code is None:
+                return
+            blank_x, blank_y = self.session.get_blank()
+            if not self.session.move_blank(code):
+                return
+
+            # redraw only the two tiles that were swapped
+            start = time.perf_counter_ns()
+            self.screen.tracer(0)
+            self.draw_cell(*self.session.get_blank())
+            self.draw_cell(blank_x, blank_y)
+            self.screen.tracer(1)
+            self.show_moves()
+            self.end_frame(start)
+            self.screen.ontimer(lambda: play_next(played + 1), delay)
+        self.screen.ontimer(play_next, delay)
+
     def game_credit(self):
         """
         Method -- game_credit
             Displays the credit image every time when the game ends,
             then ends the game
         """
+        # stop the hint search if there is one
+        if self.hint_pool is not None:
+            self.hint_pool.terminate()
+
         # display the credit image
         utils.display_msg(config.GAME_CREDIT)
 
@@ -453,54 +866,142 @@ class PuzzleGame:
         # end the program
         quit()
 
+    @instrument.span("PuzzleGame.draw_puzzle_board")
     def draw_puzzle_board(self):
         """
         Method -- draw_puzzle_board
-            Draws the tiles in the puzzle board
+            Draws all the tiles in the puzzle board
         """
         self.screen.tracer(0)
 
-        # iterate through the puzzle board list
-        for x in range(self.puzzle_board.get_size()):
-            for y in range(self.puzzle_board.get_size()):
-                # get the turtle instance and tile size of each tile
-                tile = self.puzzle_board.get_board()[x][y]
-                tile_painter = tile.get_tile_painter()
-                tile_painter.penup()
-                tile_size = tile.get_tile_size()
-
-                # set position to make the puzzle game align from the center
-                start_x = config.PLAYER_BOARD_X + \
-                          config.PLAYER_BOARD_WIDTH / 2 - \
-                          self.puzzle_board.get_size() * tile_size / 2 + \
-                          y * (tile_size + 2)
-                start_y = config.PLAYER_BOARD_Y - \
-                          config.PLAYER_BOARD_LENGTH / 2 + \
-                          self.puzzle_board.get_size() * tile_size / 2 - \
-                          x * (tile_size + 2)
-                # draw each tile at the calculated positions
-                tile.draw_tile(start_x, start_y)
-
-                # define callback function of the onclick events of the tiles
-                def swap(x, y, tile=tile):
-                    # swap the tile if it is next to the blank tile
-                    self.puzzle_board.swap_tile(tile)
-
-                    # display the moves the user has made
-                    self.button_board.display_moves(self.puzzle_board.get_moves())
-
-                    # update the puzzle board after the swap
-                    self.draw_puzzle_board()
-
-                    # if user made more moves than the maximum, they lose
-                    if self.puzzle_board.get_moves() >= self.move and \
-                            self.puzzle_board != self.origin_board:
-                        self.display_result("lose")
-
-                    # if user finishes the puzzle within the maximum, they win
-                    elif self.puzzle_board.get_moves() <= self.move and \
-                            self.puzzle_board == self.origin_board:
-                        self.display_result("win")
-                # define an onclick function for each tile for tile swapping
-                tile_painter.onclick(swap)
+        # iterate through the cells of the puzzle board
+        for x in range(self.get_puzzle_board().get_rows()):
+            for y in range(self.get_puzzle_board().get_columns()):
+                self.draw_cell(x, y)
+        self.screen.tracer(1)
+
+    @instrument.span("PuzzleGame.draw_cell")
+    def draw_cell(self, x, y):
+        """
+        Method -- draw_cell
+            Draws the tile at a position of the puzzle board, so a move
+            only redraws the two tiles that were swapped
+        Parameters:
+            x(int) -- the row of the tile
+            y(int) -- the column of the tile
+        """
+        # get the turtle instance and tile size of the tile
+        tile = self.tiles[self.session.get_cell(x, y)]
+        tile_painter = tile.get_tile_painter()
+        tile_painter.penup()
+        tile_size = tile.get_tile_size()
+
+        # draw the tile at its position on the board, without its border
+        # in the cheap tier
+        start_x, start_y = self.get_cell_position(x, y, tile_size)
+        tile.draw_tile(start_x, start_y, not self.quality.is_cheap())
+
+    def show_moves(self):
+        """
+        Method -- show_moves
+            Displays the moves the player has made, at once in the full
+            tier, and in the cheap tier once every QUALITY_TEXT_MS
+            milliseconds however many moves are made in between
+        """
+        if not self.quality.is_cheap():
+            self.button_board.display_moves(self.session.get_moves())
+        elif not self.moves_pending:
+            self.moves_pending = True
+            self.screen.ontimer(self.flush_moves, config.QUALITY_TEXT_MS)
+
+    def flush_moves(self):
+        """
+        Method -- flush_moves
+            Displays the moves the player has made if they are waiting to
+            be written
+        """
+        if not self.moves_pending:
+            return
+        self.moves_pending = False
+        self.button_board.display_moves(self.session.get_moves())
+
+    def end_frame(self, start):
+        """
+        Method -- end_frame
+            Records the time of a redraw, and draws the game in the new
+            tier if the quality meter switched it
+        Parameters:
+            start(int) -- the time the redraw started, from perf_counter_ns
+        """
+        if self.quality.record(time.perf_counter_ns() - start):
+            self.apply_quality()
+
+    def apply_quality(self):
+        """
+        Method -- apply_quality
+            Draws the game in the current tier: the cheap tier leaves out
+            the tile borders and moves its turtles without animation
+        """
+        speed = 0 if self.quality.is_cheap() else config.ANIMATION_SPEED
+        self.button_board.set_speed(speed)
+        self.hint_painter.speed(speed)
+        # redraw every tile so none keeps the look of the other tier
+        self.draw_puzzle_board()
+        self.flush_moves()
+
+    @instrument.span("PuzzleGame.click_tile")
+    def click_tile(self, number):
+        """
+        Method -- click_tile
+            Slides a clicked tile into the blank cell if it is next to it
+            and redraws the two tiles that were swapped
+        Parameters:
+            number(int) -- the number of the tile in the solved puzzle
+        """
+        if self.replaying:
+            return
+        # the tile is looked up where it is now in the index of the board,
+        # it moves with its turtle
+        row, column = self.get_puzzle_board().find_location(number)
+        blank_x, blank_y = self.session.get_blank()
+        if not self.session.move((row, column)):
+            return
+
+        # display the moves the user has made
+        start = time.perf_counter_ns()
+        self.show_moves()
+
+        # redraw only the two tiles that were swapped
+        self.screen.tracer(0)
+        self.clear_hint()
+        self.draw_cell(row, column)
+        self.draw_cell(blank_x, blank_y)
         self.screen.tracer(1)
+        self.end_frame(start)
+
+        # show the result once the game is won or lost
+        if self.session.get_status() != "playing":
+            self.display_result(self.session.get_status())
+
+    def get_cell_position(self, x, y, tile_size):
+        """
+        Method -- get_cell_position
+            Works out where the tile at a position of the puzzle board is
+            drawn, so the puzzle is centered in the player board
+        Parameters:
+            x(int) -- the row of the tile
+            y(int) -- the column of the tile
+            tile_size(int) -- the size of the tiles
+        Returns two numbers, the x and y coordinates of the top left
+            corner of the tile
+        """
+        puzzle_board = self.get_puzzle_board()
+        start_x = config.PLAYER_BOARD_X + \
+                  config.PLAYER_BOARD_WIDTH / 2 - \
+                  puzzle_board.get_columns() * tile_size / 2 + \
+                  y * (tile_size + config.TILE_GAP)
+        start_y = config.PLAYER_BOARD_Y - \
+                  config.PLAYER_BOARD_LENGTH / 2 + \
+                  puzzle_board.get_rows() * tile_size / 2 - \
+                  x * (tile_size + config.TILE_GAP)
+        return start_x, start_y
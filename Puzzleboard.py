@@ -2,6 +2,17 @@ import random
 
 import utils
 import config
+import instrument
+
+# the ways the blank tile can move, as changes of row and column, by code
+BLANK_STEPS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+# the blank move tables by board shape, shared by all the boards
+STEP_TABLES = {}
+
+# the four 2-bit blank move codes packed in each byte, lowest bits first
+UNPACKED = tuple(tuple((byte >> shift) & 3 for shift in (0, 2, 4, 6))
+                 for byte in range(256))
 
 
 class Puzzleboard:
@@ -9,25 +20,47 @@ class Puzzleboard:
     Class: Puzzleboard
     This class represents the puzzle board with the puzzles that users can
     play. It can draws the board border, swap tiles, and scramble the
-    puzzles
+    puzzles. The tiles are kept in one flat list in row order, and the
+    position of the blank tile and the number of misplaced tiles are
+    updated on every swap, so moving a tile and checking whether the
+    puzzle is solved take constant time on boards of any size. The tiles
+    can be Tile instances or any other values that tell them apart, such
+    as the tile numbers a GameSession uses
     ---
     Attributes:
         moves(int) -- the moves that the user has made, default to 0
-        size(int) -- the number of rows/columns of the puzzles, default to 4
+        rows(int) -- the number of rows of the puzzles, default to 4
+        columns(int) -- the number of columns of the puzzles, default to 4
         tiles(list) -- a list of Tiles representing all the tiles contained in
-            the puzzle board
-        board(list) -- a list of lists representing each row of tiles in the
-            puzzle board
+            the puzzle board, in solved order
+        cells(list) -- a list of the tiles in the puzzle board, row by row,
+            or an array of the same type as the tiles set on the board
+        blank(int) -- the index in cells of the blank tile
+        misplaced(int) -- the number of cells that don't hold the tile they
+            hold in the solved puzzle
+        steps(list) -- for each blank move code, the cell the blank tile
+            moves to from each cell, or -1 off the board, made when needed
+        places(list) -- the index of the cell of each tile number, made
+            when a tile is first looked up and kept up to date by swaps,
+            or None
     """
+    __slots__ = ("moves", "rows", "columns", "tiles", "cells", "blank",
+                 "misplaced", "steps", "places")
+
     def __init__(self):
         """
         Method -- __init__
             The constructor of the class, creates Puzzleboard instances
         """
         self.moves = 0
-        self.size = 4
+        self.rows = 4
+        self.columns = 4
         self.tiles = []
-        self.board = []
+        self.cells = []
+        self.blank = 0
+        self.misplaced = 0
+        self.steps = None
+        self.places = None
 
     def get_tiles(self):
         """
@@ -40,12 +73,13 @@ class Puzzleboard:
     def set_tiles(self, tiles):
         """
         Method -- set_tiles
-            Sets the value of the tiles list
+            Sets the value of the tiles list, the tiles in solved order
         Parameters:
         tiles(list) -- a list of tiles representing all the tiles in the
         puzzle board
         """
         self.tiles = tiles
+        self.misplaced = self.count_misplaced()
 
     def get_board(self):
         """
@@ -54,39 +88,99 @@ class Puzzleboard:
         Returns a list with nested lists representing the puzzles that the
             user is playing
         """
-        return self.board
+        return [self.cells[row * self.columns:(row + 1) * self.columns]
+                for row in range(self.rows)]
 
-    def set_board(self, tiles):
+    def set_board(self, tiles, blank=None):
         """
         Method -- set_board
-            Sets the board of tiles of the puzzle board
-        """
-        # populate the list of tiles with "#"
-        self.board = [["#" for _ in range(self.get_size())]
-                      for _ in range(self.get_size())]
+            Sets the board of tiles of the puzzle board and finds the blank
+            tile among them
+        Parameters:
+            tiles(list) -- the tiles to place on the board, row by row
+            blank(int) -- the index of the blank tile in tiles, found
+                among the Tiles when not given
+        Raises ValueError if the tiles don't fit the board, or the blank
+            tile isn't on it
+        """
+        if len(tiles) != self.rows * self.columns:
+            raise ValueError(f"{len(tiles)} tiles don't fit a "
+                             f"{self.rows}x{self.columns} board.")
+        # copy the tiles, a list stays a list and an array an array
+        self.cells = tiles[:]
+
+        # find the blank Tile once, swaps keep track of it; tile numbers
+        # don't tell which one is blank, so their blank must be given
+        if blank is None:
+            for index, tile in enumerate(self.cells):
+                if not isinstance(tile, int) and tile.is_blank():
+                    blank = index
+                    break
+            else:
+                raise ValueError("The board has no blank tile.")
+        elif not 0 <= blank < len(self.cells):
+            raise ValueError(f"Cell {blank} is not on the board.")
+        self.blank = blank
+        self.misplaced = self.count_misplaced()
+        self.places = None
 
-        # set the elements in the list to be the tiles
-        for i in range(self.get_size()):
-            for j in range(self.get_size()):
-                self.board[i][j] = tiles[i * self.get_size() + j]
+    def get_cell(self, x, y):
+        """
+        Method -- get_cell
+            Gets the tile at a position of the board
+        Parameters:
+            x(int) -- the row of the tile
+            y(int) -- the column of the tile
+        Returns the tile at the position
+        """
+        return self.cells[x * self.columns + y]
 
     def get_size(self):
         """
         Method -- get_size
-            Gets the number of column/row of the puzzle board
-        Returns an integer indicating the number of column/row of the board
+            Gets the number of rows of the puzzle board, which is also the
+            number of columns for a square board
+        Returns an integer indicating the number of rows of the board
         """
-        return self.size
+        return self.rows
 
     def set_size(self, size):
         """
         Method -- set_size
-            Sets the size of the puzzle game board
+            Sets the size of a square puzzle game board
         Parameters:
             size(int) -- an integer representing the number of columns/rows
                 of the puzzle game board
         """
-        self.size = size
+        self.set_dimensions(size, size)
+
+    def get_rows(self):
+        """
+        Method -- get_rows
+            Gets the number of rows of the puzzle board
+        Returns an integer indicating the number of rows
+        """
+        return self.rows
+
+    def get_columns(self):
+        """
+        Method -- get_columns
+            Gets the number of columns of the puzzle board
+        Returns an integer indicating the number of columns
+        """
+        return self.columns
+
+    def set_dimensions(self, rows, columns):
+        """
+        Method -- set_dimensions
+            Sets the number of rows and columns of the puzzle board
+        Parameters:
+            rows(int) -- the number of rows of the board
+            columns(int) -- the number of columns of the board
+        """
+        self.rows = rows
+        self.columns = columns
+        self.steps = None
 
     def get_moves(self):
         """
@@ -106,21 +200,34 @@ class Puzzleboard:
         """
         self.moves = moves
 
+    def count_misplaced(self):
+        """
+        Method -- count_misplaced
+            Counts the cells that don't hold their tile of the solved puzzle
+        Returns an integer with the number of misplaced tiles
+        """
+        if len(self.tiles) != len(self.cells):
+            return len(self.cells)
+        return sum(1 for cell, tile in zip(self.cells, self.tiles)
+                   if cell != tile)
+
+    def is_solved(self):
+        """
+        Method -- is_solved
+            Checks whether every tile is back at its solved position
+        Returns a boolean indicating whether the puzzle is solved
+        """
+        return self.misplaced == 0
+
     def find_blank(self):
         """
         Method -- find_blank
             Finds the position of the blank tile in the puzzle game
         Returns two integers i, j indicating the position of the
-            blank tile in the board list, meaning that the blank
-            tile is at self.board[i][j]
+            blank tile in the board, meaning that the blank
+            tile is at self.get_board()[i][j]
         """
-        # iterate through the board list and its nested lists
-        for i in range(self.get_size()):
-            for j in range(self.get_size()):
-                # find the tile whose name has "blank"
-                if "blank" in self.board[i][j].get_tile_image():
-                    # return the position of the tile in the list
-                    return i, j
+        return divmod(self.blank, self.columns)
 
     def find_location(self, tile):
         """
@@ -132,21 +239,44 @@ class Puzzleboard:
             given tile in the board list, which means that the
             given tile in the board list is board[x][y]
         """
-        # iterate through the board list
-        for x, row in enumerate(self.board):
-            for y, col in enumerate(row):
-                # if the given tile equals a tile in the list
-                if col == tile:
-                    # returns the location of the tile
-                    return x, y
-                    
+        # tile numbers are looked up in the index of their cells
+        if isinstance(tile, int):
+            places = self.get_places()
+            if places is not None and 0 <= tile < len(places):
+                return divmod(places[tile], self.columns)
+
+        # iterate through the cells of the board
+        for index, cell in enumerate(self.cells):
+            # if the given tile equals a tile in the list
+            if cell == tile:
+                # returns the location of the tile
+                return divmod(index, self.columns)
+
+    def get_places(self):
+        """
+        Method -- get_places
+            Gets the index of the cell of each tile, making it the first
+            time, when the tiles are numbers
+        Returns a list with the cell index of each tile number, or None if
+            the tiles aren't the numbers from 0
+        """
+        if self.places is None:
+            places = [-1] * len(self.cells)
+            for index, tile in enumerate(self.cells):
+                if not isinstance(tile, int) or \
+                        not 0 <= tile < len(places):
+                    return None
+                places[tile] = index
+            self.places = places
+        return self.places
+
     def is_next_to_blank(self, x, y):
         """
         Method -- is_next_to_blank
             Checks whether a given position is next to the blank tile
         Parameters:
-            x(int) -- the index of the nested list the tile is in
-            y(int) -- the index of the tile in its nested list
+            x(int) -- the row of the tile
+            y(int) -- the column of the tile
         Returns a boolean indicating whether the given position
             is next to the blank tile in the board or not
         """
@@ -154,12 +284,52 @@ class Puzzleboard:
         blank_x, blank_y = self.find_blank()
 
         # check whether the given tile is next to the blank tile
-        if (abs(x - blank_x) == 1 and abs(y - blank_y) == 0)\
-                or (abs(x - blank_x) == 0 and abs(y - blank_y) == 1):
-            return True
-        
-        return False
+        return abs(x - blank_x) + abs(y - blank_y) == 1
 
+    def swap_cells(self, index, other):
+        """
+        Method -- swap_cells
+            Swaps the tiles in two cells and keeps the position of the blank
+            tile and the number of misplaced tiles up to date
+        Parameters:
+            index(int) -- the index of the first cell
+            other(int) -- the index of the second cell
+        """
+        cells, tiles = self.cells, self.tiles
+        # take the two cells out of the misplaced count before the swap
+        before = (cells[index] != tiles[index]) + \
+            (cells[other] != tiles[other])
+        cells[index], cells[other] = cells[other], cells[index]
+        self.misplaced += (cells[index] != tiles[index]) + \
+            (cells[other] != tiles[other]) - before
+
+        # follow the blank tile and the two tiles
+        if self.blank == index:
+            self.blank = other
+        elif self.blank == other:
+            self.blank = index
+        if self.places is not None:
+            self.places[cells[index]] = index
+            self.places[cells[other]] = other
+
+    def swap_at(self, x, y):
+        """
+        Method -- swap_at
+            Swaps the tile at a position with the blank tile if it is next
+            to the blank tile, and counts the move
+        Parameters:
+            x(int) -- the row of the tile
+            y(int) -- the column of the tile
+        Returns a boolean indicating whether the tile was swapped
+        """
+        if not self.is_next_to_blank(x, y):
+            return False
+        self.swap_cells(x * self.columns + y, self.blank)
+        # update the player moves
+        self.moves += 1
+        return True
+
+    @instrument.span("Puzzleboard.swap_tile")
     def swap_tile(self, tile):
         """
         Method -- swap_tile
@@ -168,19 +338,31 @@ class Puzzleboard:
         Parameters:
             tile(Tile) -- the tile to be swapped with the blank tile
         """
-        # find the position of the blank tile
-        blank_x, blank_y = self.find_blank()
         # find the position of the tile to be swapped
         tile_x, tile_y = self.find_location(tile)
-        # if the tile is next to the blank tile
-        if self.is_next_to_blank(tile_x, tile_y):
-            # swap it with the blank tile
-            self.board[blank_x][blank_y], self.board[tile_x][tile_y] = \
-                self.board[tile_x][tile_y], self.board[blank_x][blank_y]
-            # update the player moves
-            self.moves += 1
+        self.swap_at(tile_x, tile_y)
 
-    def scramble_board(self, player_move):
+    def neighbors(self, index):
+        """
+        Method -- neighbors
+            Finds the cells next to a cell of the board
+        Parameters:
+            index(int) -- the index of the cell
+        Returns a list of the indexes of the neighbouring cells
+        """
+        x, y = divmod(index, self.columns)
+        result = []
+        if x > 0:
+            result.append(index - self.columns)
+        if x < self.rows - 1:
+            result.append(index + self.columns)
+        if y > 0:
+            result.append(index - 1)
+        if y < self.columns - 1:
+            result.append(index + 1)
+        return result
+
+    def scramble_board(self, player_move, rng=None):
         """
         Method -- scramble_board
             Moves the blank tile in the board player_move times to scramble
@@ -190,66 +372,130 @@ class Puzzleboard:
                 make to win the game, in this function, it is the number of
                 moves that the blank tile will make to scramble the board
                 to ensure that the game is solvable
-        """
-        index = 0
+            rng(Random) -- the random number generator to use, so the same
+                seed gives the same board, the random module when not given
+        """
+        uniform = (rng or random).random
+        around = [self.neighbors(index) for index in range(len(self.cells))]
+        cells = self.cells
+        blank = self.blank
+        blank_tile = cells[blank]
         # move the blank tile player_move times to ensure the game is solvable
-        while index < player_move:
-            # find the position of the blank tile to move it later
-            position = self.find_blank()
-
-            # initialize the new position to move the blank tile to
-            new_pos = [position[0], position[1]]
-
-            # use a random index to decide which element in new_pos to change
-            random_index = random.randint(0, 1)
-
-            # if the blank tile is at one of the corners of the board
-            # we only have two directions to move it
-            if position[0] in [0, self.get_size() - 1] and \
-                    position[1] in [0, self.get_size() - 1]:
-                # if the element at the random index is 0, we add 1
-                if position[random_index] == 0:
-                    new_pos[random_index] += 1
-                # if it is the size of the list - 1, we subtract 1
-                elif position[random_index] == self.get_size() - 1:
-                    new_pos[random_index] -= 1
-
-            # if the blank tile is along one of the borders
-            # there are three directions to move it to
-            elif position[0] in [0, self.get_size() - 1] or \
-                    position[1] in [0, self.get_size() - 1]:
-                # if the element at the random index is already 0, add 1
-                if position[random_index] == 0:
-                    new_pos[random_index] += 1
-
-                # if it is the size of the list - 1, subtract 1
-                elif position[random_index] == self.get_size() - 1:
-                    new_pos[random_index] -= 1
-                else:
-                    random_direction = random.randint(0, 1)
-                    if random_direction == 0:
-                        new_pos[random_index] -= 1
-                    else:
-                        new_pos[random_index] += 1
-            # if the blank tile is not along the borders or in the corners
+        for _ in range(player_move):
+            # slide a random tile next to the blank tile into it
+            options = around[blank]
+            other = options[int(uniform() * len(options))]
+            cells[blank] = cells[other]
+            blank = other
+        cells[blank] = blank_tile
+        self.blank = blank
+        self.misplaced = self.count_misplaced()
+        self.places = None
+
+    def blank_steps(self):
+        """
+        Method -- blank_steps
+            Gets the cells the blank tile moves to with each move code,
+            working them out the first time for the shape of the board
+        Returns a tuple of four lists, one per move code, with the cell
+            the blank tile moves to from each cell, or -1 off the board
+        """
+        if self.steps is None:
+            shape = (self.rows, self.columns)
+            # boards of the same shape share the table, it is only read
+            if shape not in STEP_TABLES:
+                cells = [divmod(index, self.columns)
+                         for index in range(self.rows * self.columns)]
+                STEP_TABLES[shape] = tuple(
+                    [(x + step_x) * self.columns + y + step_y
+                     if 0 <= x + step_x < self.rows and
+                     0 <= y + step_y < self.columns else -1
+                     for x, y in cells]
+                    for step_x, step_y in BLANK_STEPS)
+            self.steps = STEP_TABLES[shape]
+        return self.steps
+
+    def blank_code(self, index):
+        """
+        Method -- blank_code
+            Finds the move code that takes the blank tile to a cell
+        Parameters:
+            index(int) -- the index of a cell next to the blank tile
+        Returns an integer with the move code, or None if the cell isn't
+            next to the blank tile
+        """
+        for code, step in enumerate(self.blank_steps()):
+            if step[self.blank] == index:
+                return code
+        return None
+
+    def move_blank(self, code):
+        """
+        Method -- move_blank
+            Moves the blank tile one cell and counts the move
+        Parameters:
+            code(int) -- the move code, 0 up, 1 down, 2 left or 3 right
+        Returns a boolean indicating whether the blank tile could move
+        """
+        other = self.blank_steps()[code][self.blank]
+        if other < 0:
+            return False
+        self.swap_cells(self.blank, other)
+        self.moves += 1
+        return True
+
+    def play_packed(self, packed, count):
+        """
+        Method -- play_packed
+            Plays many blank moves packed four to a byte. The tiles are
+            shifted along in a plain loop, and the misplaced tiles are only
+            counted once at the end, so replays run at millions of moves a
+            second
+        Parameters:
+            packed(bytes) -- the move codes, 2 bits each, lowest bits first
+            count(int) -- the number of moves to play
+        Returns an integer with the number of moves played, less than count
+            if a move would take the blank tile off the board
+        Raises ValueError if count is more than the packed moves hold
+        """
+        if not 0 <= count <= 4 * len(packed):
+            raise ValueError(f"{count} moves don't fit in {len(packed)} "
+                             "bytes.")
+        steps = self.blank_steps()
+        cells = self.cells
+        blank = self.blank
+        blank_tile = cells[blank]
+        played = 0
+        whole = count // 4
+        # the blank tile isn't written until the end, each move only moves
+        # the tile that slides into it
+        for byte in packed[:whole]:
+            for code in UNPACKED[byte]:
+                other = steps[code][blank]
+                if other < 0:
+                    break
+                cells[blank] = cells[other]
+                blank = other
+                played += 1
             else:
-                # use random number to decide whether to add or subtract 1
-                random_direction = random.randint(0, 1)
-                # if random number is 0, subtract 1 from the element
-                if random_direction == 0:
-                    new_pos[random_index] -= 1
-                # if random number is 1, add 1 to the element
-                else:
-                    new_pos[random_index] += 1
-
-            # swap the blank tile with the tile at the new position
-            self.board[position[0]][position[1]], \
-                self.board[new_pos[0]][new_pos[1]] = \
-                self.board[new_pos[0]][new_pos[1]], \
-                self.board[position[0]][position[1]]
-
-            # update index
-            index += 1
+                continue
+            break
+        else:
+            # the last byte may hold fewer than four moves
+            for code in UNPACKED[packed[whole]][:count % 4] \
+                    if count % 4 else ():
+                other = steps[code][blank]
+                if other < 0:
+                    break
+                cells[blank] = cells[other]
+                blank = other
+                played += 1
+        cells[blank] = blank_tile
+        self.blank = blank
+        self.moves += played
+        self.misplaced = self.count_misplaced()
+        self.places = None
+        return played
 
     def draw_border(self, painter):
         """
@@ -277,14 +523,11 @@ class Puzzleboard:
                 compared with the current instance
         Returns a boolean indicating whether the two boards are equal
         """
-        # if the sizes of the two puzzles are different return False
-        if self.get_size() != other.get_size():
+        # if the shapes of the two puzzles are different return False
+        if (self.get_rows(), self.get_columns()) != \
+                (other.get_rows(), other.get_columns()):
             return False
 
-        # iterate through the current instance and the other instance
-        for i in range(self.get_size()):
-            for j in range(self.get_size()):
-                # compare each tile in the two lists
-                if self.get_board()[i][j] != other.get_board()[i][j]:
-                    return False
-        return True
+        # compare each tile in the two boards, as lists since an array of
+        # tile numbers never equals a list of them
+        return list(self.cells) == list(other.cells)
@@ -0,0 +1,161 @@
+import collections
+import statistics
+
+from Histogram import Histogram
+import config
+
+
+class Qualitymeter:
+    """
+    Class: Qualitymeter
+    This class represents the meter choosing how well the game is drawn
+    from how long its redraws take. The median of the last frames is
+    compared with a budget: over the budget the game drops to the cheap
+    tier, and under a share of it the game goes back to the full tier, the
+    gap between the two keeping the tier from flipping on every frame. The
+    frames of a tier are only judged once there are enough of them, so a
+    single slow frame never switches it, and each time the full tier turns
+    out too slow again right after coming back to it, the cheap tier is
+    kept twice as long before the full tier is tried again
+    ---
+    Attributes:
+        budget(int) -- the nanoseconds a frame may take in the full tier
+        headroom(float) -- the share of the budget the frames of the cheap
+            tier must stay under to go back to the full tier
+        window(int) -- the number of frames judged at once
+        frames(deque) -- the nanoseconds of the last frames of the tier
+        drawn(int) -- the number of frames drawn in the tier
+        hold(int) -- the frames the cheap tier lasts at least
+        tier(str) -- "full" or "cheap"
+        fixed(bool) -- whether the tier was set and is no longer chosen
+        histogram(Histogram) -- the nanoseconds of every frame
+        last(int) -- the nanoseconds of the last frame, or None
+        switches(int) -- the number of times the tier was switched
+    """
+    __slots__ = ("budget", "headroom", "window", "frames", "drawn", "hold",
+                 "tier", "fixed", "histogram", "last", "switches")
+
+    def __init__(self, budget=None, headroom=None, window=None):
+        """
+        Method -- __init__
+            The constructor of the class, creates Qualitymeter instances
+            in the full tier
+        Parameters:
+            budget(float) -- the milliseconds a frame may take, the
+                configured ones when not given
+            headroom(float) -- the share of the budget to go back under,
+                the configured one when not given
+            window(int) -- the number of frames judged at once, the
+                configured number when not given
+        """
+        self.budget = int((budget or config.FRAME_BUDGET_MS) * 1000000)
+        self.headroom = headroom or config.QUALITY_HEADROOM
+        self.window = window or config.QUALITY_WINDOW
+        self.frames = collections.deque(maxlen=self.window)
+        self.drawn = 0
+        self.hold = self.window
+        self.tier = "full"
+        self.fixed = False
+        self.histogram = Histogram(config.INSTRUMENT_BITS)
+        self.last = None
+        self.switches = 0
+
+    def get_tier(self):
+        """
+        Method -- get_tier
+            Gets the tier the game is drawn in
+        Returns a string, "full" or "cheap"
+        """
+        return self.tier
+
+    def set_tier(self, tier):
+        """
+        Method -- set_tier
+            Sets the tier the game is drawn in, no matter how long the
+            frames take, or lets the meter choose it again
+        Parameters:
+            tier(str) -- "full", "cheap", or None to choose the tier from
+                the frames
+        Returns a boolean indicating whether the tier changed
+        Raises ValueError if the tier is unknown
+        """
+        if tier not in ("full", "cheap", None):
+            raise ValueError(f"{tier} is not a quality tier.")
+        self.fixed = tier is not None
+        if tier is None or tier == self.tier:
+            return False
+        self.switch(tier)
+        return True
+
+    def is_cheap(self):
+        """
+        Method -- is_cheap
+            Tells whether the game is drawn in the cheap tier
+        Returns a boolean indicating whether the tier is cheap
+        """
+        return self.tier == "cheap"
+
+    def switch(self, tier):
+        """
+        Method -- switch
+            Changes the tier and starts judging the frames of the new tier
+        Parameters:
+            tier(str) -- the new tier
+        """
+        if tier == "cheap":
+            # a full tier that failed at once is tried again later
+            if self.switches and self.drawn <= 2 * self.window:
+                self.hold = min(self.hold * 2, config.QUALITY_MAX_HOLD)
+            else:
+                self.hold = self.window
+        self.tier = tier
+        self.frames.clear()
+        self.drawn = 0
+        self.switches += 1
+
+    def record(self, nanoseconds):
+        """
+        Method -- record
+            Adds the time of a frame and switches the tier if the last
+            frames took too long or left enough headroom
+        Parameters:
+            nanoseconds(int) -- the time the frame took
+        Returns a boolean indicating whether the tier changed
+        """
+        self.last = nanoseconds
+        self.histogram.record(nanoseconds)
+        self.frames.append(nanoseconds)
+        self.drawn += 1
+        if self.fixed or len(self.frames) < self.window:
+            return False
+        median = statistics.median(self.frames)
+        if self.tier == "full" and median > self.budget:
+            self.switch("cheap")
+            return True
+        if self.tier == "cheap" and self.drawn >= self.hold and \
+                median < self.budget * self.headroom:
+            self.switch("full")
+            return True
+        return False
+
+    def get_stats(self):
+        """
+        Method -- get_stats
+            Describes the frames drawn so far
+        Returns a dictionary with the tier, whether it was set, the number
+            of frames, switches and frames the cheap tier lasts, and the
+            budget and the last, mean, p50, p95 and largest frame times in
+            milliseconds
+        """
+        histogram = self.histogram
+        return {"tier": self.tier,
+                "fixed": self.fixed,
+                "frames": histogram.count,
+                "switches": self.switches,
+                "hold": self.hold,
+                "budget_ms": self.budget / 1e6,
+                "last_ms": (self.last or 0) / 1e6,
+                "mean_ms": histogram.mean() / 1e6,
+                "p50_ms": histogram.percentile(50) / 1e6,
+                "p95_ms": histogram.percentile(95) / 1e6,
+                "max_ms": (histogram.highest or 0) / 1e6}
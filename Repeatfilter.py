@@ -0,0 +1,58 @@
+import collections
+import logging
+
+import config
+
+
+class Repeatfilter(logging.Filter):
+    """
+    Class: Repeatfilter
+    This class represents a logging filter that drops the repeats of a
+    message. A message is let through once per window of time, and the
+    next time it is let through it tells how many repeats were dropped
+    since, in the repeats field of the record. The messages seen last are
+    remembered up to a limit, so a flood of different messages can't use
+    up the memory
+    ---
+    Attributes:
+        window(float) -- the seconds during which repeats are dropped
+        limit(int) -- the most messages remembered
+        seen(OrderedDict) -- lists of the time each message was last let
+            through and its repeats dropped since, the message seen the
+            longest time ago first
+    """
+    def __init__(self, window=None, limit=None):
+        """
+        Method -- __init__
+            The constructor of the class, creates Repeatfilter instances
+        Parameters:
+            window(float) -- the seconds during which repeats are dropped,
+                the configured ones when not given
+            limit(int) -- the most messages remembered, the configured
+                number when not given
+        """
+        super().__init__()
+        self.window = config.LOG_REPEAT_WINDOW if window is None else window
+        self.limit = limit or config.LOG_REPEAT_LIMIT
+        self.seen = collections.OrderedDict()
+
+    def filter(self, record):
+        """
+        Method -- filter
+            Decides whether a record is logged
+        Parameters:
+            record(LogRecord) -- the record
+        Returns a boolean indicating whether the record is logged
+        """
+        key = (record.levelno, record.module, record.funcName,
+               record.getMessage())
+        last = self.seen.get(key)
+        if last is not None and record.created - last[0] < self.window:
+            last[1] += 1
+            return False
+        record.repeats = last[1] if last is not None else 0
+        self.seen[key] = [record.created, 0]
+        self.seen.move_to_end(key)
+        if len(self.seen) > self.limit:
+            self.seen.popitem(last=False)
+        return True
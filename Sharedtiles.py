@@ -0,0 +1,286 @@
+import hashlib
+import json
+import os
+import struct
+import tempfile
+from multiprocessing import resource_tracker
+from multiprocessing import shared_memory
+
+from Filelock import Filelock
+from Gifimage import Gifimage
+import puzzle_file
+
+# the magic, the number of processes attached and the length of the index
+HEADER = struct.Struct("<4sIQ")
+MAGIC = b"PTIL"
+
+
+class Sharedtiles:
+    """
+    Class: Sharedtiles
+    This class represents the decoded tile images of a puzzle, kept in a
+    shared memory segment so every process on the host decodes a puzzle's
+    GIF files once between them. The first process to open a puzzle decodes
+    the images listed in its .puz file and writes the palette indexes of
+    their pixels and their palettes after a small JSON index; the others
+    attach to the segment and read the pixels without copying them. The
+    segment counts the processes attached under a file lock, and the last
+    one to close it removes it. The segment is named after the .puz file
+    and the size and time of every image, so a changed puzzle gets a new
+    segment
+    ---
+    Attributes:
+        name(str) -- the name of the shared memory segment
+        memory(SharedMemory) -- the segment while it is open, or None
+        index(dict) -- the puzzle's .puz path and, for every image, its
+            path, size, transparent color and where its pixels and palette
+            are in the segment
+        closed(bool) -- whether the segment was closed
+    """
+    __slots__ = ("name", "memory", "index", "closed")
+
+    def __init__(self, game_path, base_dir="."):
+        """
+        Method -- __init__
+            The constructor of the class, attaches to the segment of a
+            puzzle, decoding its tile images into a new segment if no other
+            process has
+        Parameters:
+            game_path(str) -- the path to the .puz file
+            base_dir(str) -- the game directory the image paths are
+                relative to
+        Raises ValueError if the puzzle or an image can't be read, and
+            OSError if its files can't be opened
+        """
+        puzzle = puzzle_file.read_puzzle(game_path, base_dir)
+        paths = [os.path.join(base_dir, image) for image in puzzle["images"]]
+        self.name = self.segment_name(game_path, paths)
+        self.memory = None
+        self.index = None
+        self.closed = False
+        with self.file_lock():
+            try:
+                self.memory = _open_segment(self.name)
+            except FileNotFoundError:
+                self.memory = self.create_segment(game_path, paths)
+            magic, attached, length = HEADER.unpack_from(self.memory.buf)
+            if magic != MAGIC:
+                self.memory.close()
+                raise ValueError(f"{self.name} is not a tile segment.")
+            HEADER.pack_into(self.memory.buf, 0, magic, attached + 1,
+                             length)
+        self.index = json.loads(bytes(
+            self.memory.buf[HEADER.size:HEADER.size + length]))
+        # the offsets of the index are moved to the start of the segment
+        start = data_start(length)
+        for entry in self.index["images"]:
+            entry["pixels"] += start
+            entry["palette"] += start
+
+    @staticmethod
+    def segment_name(game_path, paths):
+        """
+        Method -- segment_name
+            Names the segment of a version of a puzzle
+        Parameters:
+            game_path(str) -- the path to the .puz file
+            paths(list) -- the paths to the tile images
+        Returns a string short enough to name shared memory on every system
+        """
+        digest = hashlib.sha1(os.path.realpath(game_path).encode("utf-8"))
+        for path in [game_path] + paths:
+            stat = os.stat(path)
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns};"
+                          .encode("utf-8"))
+        return "ptil_" + digest.hexdigest()[:24]
+
+    def file_lock(self):
+        """
+        Method -- file_lock
+            Creates the lock shared by the processes using the segment
+        Returns a Filelock instance for the segment
+        """
+        return Filelock(os.path.join(tempfile.gettempdir(),
+                                     self.name + ".lock"))
+
+    def create_segment(self, game_path, paths):
+        """
+        Method -- create_segment
+            Decodes the tile images and writes them to a new segment, which
+            no process is attached to yet
+        Parameters:
+            game_path(str) -- the path to the .puz file
+            paths(list) -- the paths to the tile images
+        Returns the SharedMemory instance of the segment
+        """
+        images = [Gifimage.read(path) for path in paths]
+        # the pixels and palette of every image, one after the other, with
+        # their offsets counted from the end of the index
+        entries = []
+        offset = 0
+        for path, image in zip(paths, images):
+            entries.append({"path": path,
+                            "width": image.width,
+                            "height": image.height,
+                            "transparent": image.transparent,
+                            "pixels": offset,
+                            "palette": offset + len(image.pixels),
+                            "colors": len(image.palette)})
+            offset += len(image.pixels) + len(image.palette)
+        index = json.dumps({"puzzle": game_path,
+                            "images": entries}).encode("utf-8")
+        start = data_start(len(index))
+
+        memory = _open_segment(self.name, start + max(offset, 1))
+        buf = memory.buf
+        HEADER.pack_into(buf, 0, MAGIC, 0, len(index))
+        buf[HEADER.size:HEADER.size + len(index)] = index
+        for entry, image in zip(entries, images):
+            pixels = start + entry["pixels"]
+            buf[pixels:pixels + len(image.pixels)] = image.pixels
+            palette = start + entry["palette"]
+            buf[palette:palette + len(image.palette)] = image.palette
+        return memory
+
+    def get_count(self):
+        """
+        Method -- get_count
+            Gets the number of tile images of the puzzle
+        Returns an integer with the number of images
+        """
+        return len(self.index["images"])
+
+    def find(self, path):
+        """
+        Method -- find
+            Finds the number of a tile image from its path
+        Parameters:
+            path(str) -- the path to the image, as the .puz file names it
+                or joined to the game directory
+        Returns an integer with the number of the tile in solved order
+        Raises KeyError if the puzzle has no such image
+        """
+        for number, entry in enumerate(self.index["images"]):
+            if entry["path"] == path or entry["path"].endswith(os.sep + path):
+                return number
+        raise KeyError(path)
+
+    def get_size(self, number):
+        """
+        Method -- get_size
+            Gets the size of a tile image
+        Parameters:
+            number(int) -- the number of the tile in solved order
+        Returns two integers, the width and the height in pixels
+        """
+        entry = self.index["images"][number]
+        return entry["width"], entry["height"]
+
+    def get_pixels(self, number):
+        """
+        Method -- get_pixels
+            Gets the palette indexes of the pixels of a tile image, row by
+            row, without copying them. The view must be released before
+            the segment is closed
+        Parameters:
+            number(int) -- the number of the tile in solved order
+        Returns a read only memoryview of the pixels
+        """
+        entry = self.index["images"][number]
+        start = entry["pixels"]
+        return self.memory.buf[start:start + entry["width"] *
+                               entry["height"]].toreadonly()
+
+    def get_palette(self, number):
+        """
+        Method -- get_palette
+            Gets the RGB color table of a tile image without copying it.
+            The view must be released before the segment is closed
+        Parameters:
+            number(int) -- the number of the tile in solved order
+        Returns a read only memoryview of three bytes per color
+        """
+        entry = self.index["images"][number]
+        start = entry["palette"]
+        return self.memory.buf[start:start + entry["colors"]].toreadonly()
+
+    def get_image(self, number):
+        """
+        Method -- get_image
+            Copies a tile image out of the segment, for changing it
+        Parameters:
+            number(int) -- the number of the tile in solved order
+        Returns a Gifimage instance with the image
+        """
+        entry = self.index["images"][number]
+        with self.get_pixels(number) as pixels, \
+                self.get_palette(number) as palette:
+            return Gifimage(entry["width"], entry["height"], palette,
+                            pixels, entry["transparent"])
+
+    def close(self):
+        """
+        Method -- close
+            Detaches from the segment, removing it if no other process is
+            attached. Closing it again does nothing
+        """
+        if self.closed:
+            return
+        self.closed = True
+        with self.file_lock():
+            magic, attached, length = HEADER.unpack_from(self.memory.buf)
+            attached = max(attached - 1, 0)
+            HEADER.pack_into(self.memory.buf, 0, magic, attached, length)
+            self.memory.close()
+            if attached == 0:
+                self.memory.unlink()
+
+    def __enter__(self):
+        """
+        Method -- __enter__
+            Gives the tiles to a with statement
+        Returns the Sharedtiles instance
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Method -- __exit__
+            Closes the segment at the end of a with statement
+        """
+        self.close()
+
+
+def data_start(length):
+    """
+    Function -- data_start
+        Works out where the images start in a segment, after the header
+        and the index, on a boundary of 8 bytes
+    Parameters:
+        length(int) -- the length of the index in bytes
+    Returns an integer with the offset of the images
+    """
+    return (HEADER.size + length + 7) // 8 * 8
+
+
+def _open_segment(name, size=0):
+    """
+    Function -- _open_segment
+        Opens a shared memory segment whose removal is left to the count of
+        the processes attached, not to the process that opened it
+    Parameters:
+        name(str) -- the name of the segment
+        size(int) -- the size of a new segment, or 0 to attach to one
+    Returns the SharedMemory instance
+    Raises FileNotFoundError if there is no segment to attach to
+    """
+    try:
+        return shared_memory.SharedMemory(name, create=size > 0, size=size,
+                                          track=False)
+    except TypeError:
+        # before Python 3.13 every process registers the segment with its
+        # resource tracker, which would remove it when that process ends
+        memory = shared_memory.SharedMemory(name, create=size > 0,
+                                            size=size)
+        resource_tracker.unregister(memory._name, "shared_memory")
+        return memory
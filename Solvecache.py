@@ -0,0 +1,122 @@
+import sqlite3
+import threading
+
+import config
+from solver import canonical_key
+from solver import mirror_codes
+
+
+class Solvecache:
+    """
+    Class: Solvecache
+    This class represents the shortest solutions found so far, stored in a
+    SQLite database so they are kept between runs and shared by the
+    processes using the same file. A board and its mirror image across the
+    diagonal are stored once, under the key canonical_key gives them, so a
+    board is never solved again once either of them has been
+    ---
+    Attributes:
+        path(str) -- the path to the database file
+        connection(Connection) -- the connection to the database
+        lock(Lock) -- the lock serialising the use of the connection
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS solutions (
+            board TEXT PRIMARY KEY,
+            moves TEXT NOT NULL,
+            seconds REAL NOT NULL
+        ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path=None):
+        """
+        Method -- __init__
+            The constructor of the class, opens the database and creates
+            the table if it doesn't exist
+        Parameters:
+            path(str) -- the path to the database file, the configured one
+                when not given
+        """
+        self.path = path or config.SOLVER_CACHE_PATH
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(self.path, check_same_thread=False,
+                                          isolation_level=None,
+                                          timeout=config.LOCK_TIMEOUT)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(self.SCHEMA)
+
+    def get(self, tiles, rows, columns, blank_tile):
+        """
+        Method -- get
+            Looks up the solution of a board
+        Parameters:
+            tiles(list) -- the tile numbers of the cells, row by row
+            rows(int) -- the number of rows of the board
+            columns(int) -- the number of columns of the board
+            blank_tile(int) -- the number of the blank tile
+        Returns a list of the blank move codes of the solution, or None if
+            the board hasn't been solved
+        """
+        key, mirrored = canonical_key(tiles, rows, columns, blank_tile)
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT moves FROM solutions WHERE board = ?",
+                (key,)).fetchone()
+        if row is None:
+            return None
+        codes = [int(code) for code in row[0]]
+        return mirror_codes(codes) if mirrored else codes
+
+    def put_many(self, solutions):
+        """
+        Method -- put_many
+            Stores many solutions in one transaction
+        Parameters:
+            solutions(list) -- tuples of the tiles, rows, columns, blank
+                tile, solution codes and seconds the search took of each
+                board
+        """
+        records = []
+        for tiles, rows, columns, blank_tile, codes, seconds in solutions:
+            key, mirrored = canonical_key(tiles, rows, columns, blank_tile)
+            if mirrored:
+                codes = mirror_codes(codes)
+            records.append((key, "".join(map(str, codes)), seconds))
+        with self.lock:
+            self.connection.execute("BEGIN")
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO solutions VALUES (?, ?, ?)", records)
+            self.connection.execute("COMMIT")
+
+    def put(self, tiles, rows, columns, blank_tile, codes, seconds=0.0):
+        """
+        Method -- put
+            Stores the solution of a board
+        Parameters:
+            tiles(list) -- the tile numbers of the cells, row by row
+            rows(int) -- the number of rows of the board
+            columns(int) -- the number of columns of the board
+            blank_tile(int) -- the number of the blank tile
+            codes(list) -- the blank move codes of the solution
+            seconds(float) -- the seconds the search took
+        """
+        self.put_many([(tiles, rows, columns, blank_tile, codes, seconds)])
+
+    def count(self):
+        """
+        Method -- count
+            Counts the stored solutions
+        Returns an integer with the number of solutions
+        """
+        with self.lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def close(self):
+        """
+        Method -- close
+            Closes the connection to the database
+        """
+        with self.lock:
+            self.connection.close()
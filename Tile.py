@@ -1,3 +1,4 @@
+import sys
 import turtle
 
 import utils
@@ -7,26 +8,39 @@ class Tile:
     """
     Class: Tile
     This class represents the tiles in the sliding puzzles. It
-    can draw a tile and erase a tile.
+    can draw a tile and erase a tile. A tile is told apart by its number
+    in the solved puzzle, and whether it is the blank tile is decided once
+    when the puzzle is loaded, so neither needs its image path
     ---
     Attributes:
+        tile_painter(Turtle) -- the turtle instance drawing the tile
         tile_size(int) -- the size of the tile
-        tile_image(str) -- the path to the tile image file
+        tile_image(str) -- the path to the tile image file, interned so
+            tiles of the same image share one string
+        tile_id(int) -- the number of the tile in the solved puzzle, or
+            None if it isn't known
+        blank(bool) -- whether the tile is the blank tile
     """
+    __slots__ = ("tile_painter", "tile_size", "tile_image", "tile_id",
+                 "blank")
 
-    def __init__(self, tile_size, tile_image):
+    def __init__(self, tile_size, tile_image, tile_id=None, blank=False):
         """
         Method -- __init__
             The constructor of the class, creates tile instances
         Parameters:
             tile_size(int) -- the size of the tile
             tile_image(str) -- the path to the tile image file
+            tile_id(int) -- the number of the tile in the solved puzzle
+            blank(bool) -- whether the tile is the blank tile
         """
         # create the turtle instance to draw the tile
         self.tile_painter = turtle.Turtle()
         self.tile_painter.hideturtle()
         self.tile_size = tile_size
-        self.tile_image = tile_image
+        self.tile_image = sys.intern(tile_image)
+        self.tile_id = tile_id
+        self.blank = blank
 
     def get_tile_painter(self):
         """
@@ -66,23 +80,43 @@ class Tile:
         Method -- set_tile_image
             Sets the file path to the image of the tile
         """
-        self.tile_image = tile_image
+        self.tile_image = sys.intern(tile_image)
 
-    def draw_tile(self, pos_x, pos_y):
+    def get_tile_id(self):
+        """
+        Method -- get_tile_id
+            Gets the number of the tile in the solved puzzle
+        Returns an integer with the tile number, or None if it isn't known
+        """
+        return self.tile_id
+
+    def is_blank(self):
+        """
+        Method -- is_blank
+            Tells whether the tile is the blank tile
+        Returns a boolean indicating whether the tile is the blank tile
+        """
+        return self.blank
+
+    def draw_tile(self, pos_x, pos_y, border=True):
         """
         Method -- draw_tile
             Draws the tile at the given position
         Parameters:
             pos_x: the x coordinate to start drawing
             pos_y: the y coordinate to start drawing
+            border(bool) -- whether to draw the border around the tile
         """
-        utils.draw_board(self.get_tile_painter(),
-                         self.get_tile_size() + 2,
-                         self.get_tile_size() + 2,
-                         pos_x - 1,
-                         pos_y + 1,
-                         "black",
-                         1)
+        # remove the border drawn at the previous position of the tile
+        self.tile_painter.clear()
+        if border:
+            utils.draw_board(self.get_tile_painter(),
+                             self.get_tile_size() + 2,
+                             self.get_tile_size() + 2,
+                             pos_x - 1,
+                             pos_y + 1,
+                             "black",
+                             1)
         self.tile_painter.penup()
         self.tile_painter.goto(pos_x + self.get_tile_size() / 2,
                                pos_y - self.get_tile_size() / 2)
@@ -101,14 +135,17 @@ class Tile:
         """
         Method -- __eq__
             Compares the current tile instance with another one
-            based on whether they have the same size and the same
-            image
+            based on their numbers when both have one, otherwise on
+            whether they have the same size and the same image
         Parameters:
             other(Tile) -- the other tile instance to be compared
                 with the current tile instance
         Returns a boolean indicating whether the current tile
             instance equals to the other one
         """
+        # the numbers of two tiles tell them apart without the images
+        if self.tile_id is not None and other.tile_id is not None:
+            return self.tile_id == other.tile_id
         # check whether the two tiles have the same size and image
         return self.get_tile_image() == other.get_tile_image() and \
                self.get_tile_size() == other.get_tile_size()
@@ -0,0 +1,382 @@
+"""
+Calibrates the difficulty of the scrambles the game makes.
+
+A game is scrambled with as many random moves as its move limit, but many
+of those moves undo each other, so the move limit alone says little about
+how far from solved the board is. For every board size and scramble length
+this tool scrambles many boards the way the game does and finds the fewest
+moves each one can be solved in: from a table of every board for sizes
+small enough to have one, such as 3x3, and otherwise with the IDA* solver
+on a process pool, taking the solutions found before from the solution
+cache. A search that reaches the node limit gives the depth it got to,
+which is a number of moves the board can't be solved in, so percentiles
+that count such boards are marked as at least that many moves.
+
+The percentiles and histograms are printed and written to the calibration
+file, which the game reads to turn a difficulty into a scramble length.
+
+Usage: python calibrate.py [--sizes RxC ...] [--budgets N ...]
+                           [--samples N] [--workers N] [--node-limit N]
+                           [--seed N] [--cache PATH] [--output PATH]
+                           [--histograms]
+"""
+import argparse
+import collections
+import concurrent.futures
+import json
+import math
+import os
+import time
+
+from GameSession import GameSession
+from Puzzleboard import Puzzleboard
+from Solvecache import Solvecache
+import config
+import solver
+
+
+def distance_table(rows, columns, blank_tile):
+    """
+    Function -- distance_table
+        Finds the fewest moves every board of a size can be solved in, by a
+        breadth first search from the solved board
+    Parameters:
+        rows(int) -- the number of rows of the boards
+        columns(int) -- the number of columns of the boards
+        blank_tile(int) -- the number of the blank tile
+    Returns a dictionary of the fewest moves by board, as bytes of the tile
+        numbers
+    """
+    board = Puzzleboard()
+    board.set_dimensions(rows, columns)
+    steps = board.blank_steps()
+    solved = bytes(range(rows * columns))
+    distances = {solved: 0}
+    level = [(solved, blank_tile)]
+    depth = 0
+    while level:
+        depth += 1
+        following = []
+        for tiles, blank in level:
+            for step in steps:
+                other = step[blank]
+                if other < 0:
+                    continue
+                cells = bytearray(tiles)
+                cells[blank], cells[other] = cells[other], cells[blank]
+                cells = bytes(cells)
+                if cells not in distances:
+                    distances[cells] = depth
+                    following.append((cells, other))
+        level = following
+    return distances
+
+
+def scramble_boards(rows, columns, budget, samples, seed=0):
+    """
+    Function -- scramble_boards
+        Scrambles boards the way the game does
+    Parameters:
+        rows(int) -- the number of rows of the boards
+        columns(int) -- the number of columns of the boards
+        budget(int) -- the move limit, which is the number of scramble
+            moves
+        samples(int) -- the number of boards
+        seed(int) -- the seed of the first board, the next ones taking the
+            following seeds
+    Returns a list of boards, as tuples of tile numbers
+    """
+    session = GameSession(rows, columns)
+    boards = []
+    for index in range(samples):
+        session.scramble(budget, seed + index)
+        boards.append(tuple(session.get_state()))
+    return boards
+
+
+def measure_task(tiles, rows, columns, blank_tile, node_limit):
+    """
+    Function -- measure_task
+        Solves one board within a node limit, in a worker process
+    Parameters:
+        tiles(tuple) -- the tile numbers of the cells, row by row
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        blank_tile(int) -- the number of the blank tile
+        node_limit(int) -- the boards the search may look at
+    Returns a tuple of the solution codes, or None if the limit was
+        reached, the fewest moves the board may be solved in, and the
+        seconds the search took
+    """
+    start = time.perf_counter()
+    codes, distance = solver.search_board(list(tiles), rows, columns,
+                                          blank_tile, node_limit=node_limit)
+    return codes, distance, time.perf_counter() - start
+
+
+def measure_boards(boards, rows, columns, blank_tile, workers=None,
+                   node_limit=None, cache=None):
+    """
+    Function -- measure_boards
+        Finds the fewest moves each distinct board can be solved in
+    Parameters:
+        boards(iterable) -- the boards, as tuples of tile numbers
+        rows(int) -- the number of rows of the boards
+        columns(int) -- the number of columns of the boards
+        blank_tile(int) -- the number of the blank tile
+        workers(int) -- the number of processes, one per CPU when not given
+        node_limit(int) -- the boards each search may look at, the
+            configured limit when not given
+        cache(Solvecache) -- the solutions found before, if any
+    Returns a dictionary of tuples of the fewest moves and whether that is
+        exact, or only a number of moves the board can't be solved in, by
+        board
+    """
+    node_limit = node_limit or config.CALIBRATE_NODE_LIMIT
+    boards = set(boards)
+    if math.factorial(rows * columns) // 2 <= config.CALIBRATE_TABLE_LIMIT:
+        table = distance_table(rows, columns, blank_tile)
+        return {board: (table[bytes(board)], True) for board in boards}
+
+    found = {}
+    missing = []
+    for board in boards:
+        codes = None
+        if cache is not None:
+            codes = cache.get(board, rows, columns, blank_tile)
+        if codes is None:
+            missing.append(board)
+        else:
+            found[board] = (len(codes), True)
+
+    solved = []
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        # the short searches come back in order, a few at a time
+        results = pool.map(measure_task, missing,
+                           *[[value] * len(missing)
+                             for value in (rows, columns, blank_tile,
+                                           node_limit)],
+                           chunksize=16)
+        for board, (codes, distance, seconds) in zip(missing, results):
+            found[board] = (distance, codes is not None)
+            if codes is not None:
+                solved.append((board, rows, columns, blank_tile, codes,
+                               seconds))
+    if cache is not None and solved:
+        cache.put_many(solved)
+    return found
+
+
+def summarize(results):
+    """
+    Function -- summarize
+        Works out the statistics of the fewest moves of many boards
+    Parameters:
+        results(list) -- tuples of the fewest moves of each board and
+            whether that is exact
+    Returns a dictionary with the number of boards, the number whose
+        search reached the node limit, the mean, the percentiles, the
+        percentiles that are only lower bounds, and the histogram
+    """
+    ordered = sorted(results)
+    percentiles = {}
+    bounded = []
+    for percentile in config.CALIBRATE_PERCENTILES:
+        index = min(len(ordered) - 1, len(ordered) * percentile // 100)
+        percentiles[str(percentile)] = ordered[index][0]
+        # a board at or below the percentile might need more moves
+        if not all(exact for _, exact in ordered[:index + 1]):
+            bounded.append(str(percentile))
+    histogram = collections.Counter(distance for distance, _ in ordered)
+    return {"samples": len(ordered),
+            "censored": sum(not exact for _, exact in ordered),
+            "mean": round(sum(distance for distance, _ in ordered) /
+                          len(ordered), 2),
+            "percentiles": percentiles,
+            "bounded": bounded,
+            "histogram": {str(distance): histogram[distance]
+                          for distance in sorted(histogram)}}
+
+
+def calibrate(rows, columns, budgets, samples, workers=None,
+              node_limit=None, seed=0, cache=None):
+    """
+    Function -- calibrate
+        Measures the scrambles of one board size at every scramble length
+    Parameters:
+        rows(int) -- the number of rows of the boards
+        columns(int) -- the number of columns of the boards
+        budgets(list) -- the scramble lengths
+        samples(int) -- the number of boards per scramble length
+        workers(int) -- the number of processes
+        node_limit(int) -- the boards each search may look at
+        seed(int) -- the seed of the first board of each scramble length
+        cache(Solvecache) -- the solutions found before, if any
+    Returns a dictionary with the node limit and the statistics of each
+        scramble length
+    """
+    node_limit = node_limit or config.CALIBRATE_NODE_LIMIT
+    blank_tile = rows * columns - 1
+    scrambles = {budget: scramble_boards(rows, columns, budget, samples,
+                                         seed)
+                 for budget in budgets}
+    # a board that comes up at several lengths is only solved once
+    found = measure_boards((board for boards in scrambles.values()
+                            for board in boards),
+                           rows, columns, blank_tile, workers, node_limit,
+                           cache)
+    return {"node_limit": node_limit,
+            "budgets": {str(budget): summarize([found[board]
+                                                for board in boards])
+                        for budget, boards in scrambles.items()}}
+
+
+def read_calibration(path=None):
+    """
+    Function -- read_calibration
+        Reads the calibration file
+    Parameters:
+        path(str) -- the path to the file, the configured one when not given
+    Returns a dictionary of the calibration of each board size, by "RxC"
+    Raises OSError if the file can't be read, and ValueError if it doesn't
+        hold a calibration
+    """
+    with open(path or config.CALIBRATION_PATH) as infile:
+        calibration = json.load(infile)
+    if not isinstance(calibration, dict):
+        raise ValueError("The calibration file is damaged.")
+    return calibration
+
+
+def scramble_length(rows, columns, difficulty, path=None):
+    """
+    Function -- scramble_length
+        Turns a difficulty into the shortest scramble whose boards take, at
+        the median, the difficulty's share of the moves of the longest
+        scramble calibrated
+    Parameters:
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        difficulty(str) -- a difficulty of DIFFICULTY_LEVELS
+        path(str) -- the path to the calibration file
+    Returns an integer with the scramble length, which is also the move
+        limit of the game
+    Raises OSError if the calibration file can't be read, and ValueError
+        if the difficulty or the board size isn't calibrated
+    """
+    if difficulty not in config.DIFFICULTY_LEVELS:
+        raise ValueError(f"{difficulty} is not a difficulty.")
+    size = f"{rows}x{columns}"
+    budgets = read_calibration(path).get(size, {}).get("budgets")
+    if not budgets:
+        raise ValueError(f"{size} boards haven't been calibrated.")
+    medians = sorted((int(budget), stats["percentiles"]["50"])
+                     for budget, stats in budgets.items())
+    target = config.DIFFICULTY_LEVELS[difficulty] * \
+        max(median for _, median in medians)
+    for budget, median in medians:
+        if median >= target:
+            return budget
+    return medians[-1][0]
+
+
+def print_report(size, report, histograms=False):
+    """
+    Function -- print_report
+        Prints the statistics of one board size
+    Parameters:
+        size(str) -- the board size, as "RxC"
+        report(dict) -- the statistics calibrate worked out
+        histograms(bool) -- whether to print the histogram of every
+            scramble length
+    """
+    names = [f"p{percentile}" for percentile in config.CALIBRATE_PERCENTILES]
+    print(f"{size}, node limit {report['node_limit']}")
+    print(f"{'moves':>6} {'boards':>7} {'over':>5} {'mean':>6} " +
+          " ".join(f"{name:>5}" for name in names))
+    for budget, stats in report["budgets"].items():
+        # a + marks the percentiles that are only lower bounds
+        values = [f"{value}{'+' if percentile in stats['bounded'] else ''}"
+                  for percentile, value in stats["percentiles"].items()]
+        print(f"{budget:>6} {stats['samples']:>7} {stats['censored']:>5} "
+              f"{stats['mean']:>6} " +
+              " ".join(f"{value:>5}" for value in values))
+    if not histograms:
+        return
+    for budget, stats in report["budgets"].items():
+        print(f"{size}, {budget} scramble moves")
+        largest = max(stats["histogram"].values())
+        for distance, count in stats["histogram"].items():
+            print(f"{distance:>6} {count:>7} " +
+                  "#" * max(1, count * 50 // largest))
+
+
+def main():
+    """
+    Program entry point
+    """
+    parser = argparse.ArgumentParser(description="Calibrate the difficulty "
+                                                 "of the scrambles.")
+    parser.add_argument("--sizes", nargs="+", default=config.CALIBRATE_SIZES,
+                        help="board sizes, such as 3x3 4x4")
+    parser.add_argument("--budgets", nargs="+", type=int,
+                        default=config.CALIBRATE_BUDGETS,
+                        help="scramble lengths")
+    parser.add_argument("--samples", type=int,
+                        default=config.CALIBRATE_SAMPLES,
+                        help="boards per size and scramble length")
+    parser.add_argument("--workers", type=int, default=config.SOLVER_WORKERS)
+    parser.add_argument("--node-limit", type=int,
+                        default=config.CALIBRATE_NODE_LIMIT,
+                        help="boards each search may look at")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the first board")
+    parser.add_argument("--cache", default=config.SOLVER_CACHE_PATH,
+                        help="solution cache database")
+    parser.add_argument("--output", default=config.CALIBRATION_PATH,
+                        help="calibration file to update")
+    parser.add_argument("--histograms", action="store_true",
+                        help="print the histogram of every scramble length")
+    args = parser.parse_args()
+
+    sizes = []
+    for size in args.sizes:
+        try:
+            rows, columns = (int(value) for value in size.split("x"))
+        except ValueError:
+            parser.error(f"{size} is not a board size such as 4x4")
+        if not config.PUZZLE_MIN_GRID <= rows <= config.PUZZLE_MAX_GRID or \
+                not config.PUZZLE_MIN_GRID <= columns <= \
+                config.PUZZLE_MAX_GRID:
+            parser.error(f"grid size {size} is not supported")
+        sizes.append((rows, columns))
+
+    # keep the sizes calibrated before that aren't measured again
+    calibration = {}
+    if os.path.exists(args.output):
+        try:
+            calibration = read_calibration(args.output)
+        except (OSError, ValueError) as err:
+            raise SystemExit(str(err))
+
+    cache = Solvecache(args.cache)
+    try:
+        for rows, columns in sizes:
+            start = time.perf_counter()
+            report = calibrate(rows, columns, args.budgets, args.samples,
+                               args.workers, args.node_limit, args.seed,
+                               cache)
+            size = f"{rows}x{columns}"
+            calibration[size] = report
+            print_report(size, report, args.histograms)
+            print(f"{size} calibrated in "
+                  f"{time.perf_counter() - start:.1f} s")
+    finally:
+        cache.close()
+
+    with open(args.output, "w") as outfile:
+        json.dump(calibration, outfile, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -37,15 +37,43 @@ BUTTON_BOARD_COLOR = "black"
 BUTTON_BOARD_PENSIZE = 5
 
 # button position
-BUTTON_X = 80
+BUTTON_X = -10
 BUTTON_Y = -230
 
 # player move position
 MOVE_X = -330
 MOVE_Y = -240
 
+# leaderboard records
+LEADERS_SHOWN = 5
+LEADER_BOARD_COMPACT_EVERY = 1000
+# "file" for the leaderboard text file, "sqlite" for the database,
+# "service" for the leaderboard service with the text file as fallback
+LEADER_BOARD_BACKEND = "file"
+LEADER_DB_PATH = "leaderboard.db"
+
+# leaderboard file locking, in seconds
+LOCK_TIMEOUT = 5
+LOCK_RETRY_DELAY = 0.001
+LOCK_RETRY_MAX = 0.05
+
+# leaderboard service, used when LEADER_BOARD_BACKEND is "service"
+LEADER_SERVICE_HOST = "127.0.0.1"
+LEADER_SERVICE_PORT = 50015
+LEADER_SERVICE_SOCKET = None
+LEADER_SERVICE_TIMEOUT = 1.0
+LEADER_SERVICE_RETRY = 30
+LEADER_SERVICE_BATCH = 512
+LEADER_SERVICE_BATCH_DELAY = 0.005
+LEADER_SERVICE_QUEUE = 10000
+# the most records a client may ask the service for at once
+LEADER_SERVICE_TOP_MAX = 100
+# whether the service only takes scores sent with the replay of the game
+LEADER_REQUIRE_REPLAY = False
+
 # file paths
 LEADER_BOARD_PATH = "leaderboard.txt"
+REPLAY_PATH = "replays.bin"
 LEADERBOARD_ERR = "Resources/leaderboard_error.gif"
 SPLASH_PIC_PATH = "Resources/splash_screen.gif"
 FILE_ERR = "Resources/file_error.gif"
@@ -53,8 +81,123 @@ LOSE_GAME = "Resources/Lose.gif"
 WIN_GAME = "Resources/winner.gif"
 QUIT_GAME = "Resources/quitmsg.gif"
 GAME_CREDIT = "Resources/credits.gif"
-BUTTON_PATHS = ["Resources/resetbutton.gif", "Resources/loadbutton.gif", "Resources/quitbutton.gif"]
+BUTTON_PATHS = ["Resources/hintbutton.gif", "Resources/resetbutton.gif",
+                "Resources/loadbutton.gif", "Resources/quitbutton.gif"]
 
 # error logging
 ERROR_LOG = "5001_puzzle.err"
-LOG_FORMAT = "TIMESTAMP: %(asctime)s - ERROR: %(message)s - LOCATION: %(module)s.%(funcName)s"
+
+# puzzle grid limits and tile layout
+PUZZLE_MIN_GRID = 2
+PUZZLE_MAX_GRID = 20
+MOVE_LIMIT_MAX = 10000
+TILE_GAP = 2
+
+# generated puzzle properties
+IMAGES_PATH = "Images"
+THUMBNAIL_SIZE = 100
+SLICER_WORKERS = None
+
+# multi-session game server
+GAME_SERVER_HOST = "127.0.0.1"
+GAME_SERVER_PORT = 50016
+GAME_SERVER_MAX_SESSIONS = 20000
+
+# replays, in moves per second
+REPLAY_SPEED = 4
+
+# replay verification
+VERIFY_WORKERS = None
+VERIFY_BATCH = 10000
+
+# daily challenge, the move limit every player gets
+DAILY_MOVE_LIMIT = 100
+
+# undo history, the moves between two copies of the board, a multiple of 4
+UNDO_CHECKPOINT_EVERY = 64
+# keys taking back and making again one move, or all of them
+UNDO_KEY = "z"
+REDO_KEY = "y"
+UNDO_ALL_KEY = "Home"
+REDO_ALL_KEY = "End"
+
+# optimal solver farm, the seconds a board may take and the cache file
+SOLVER_TIME_LIMIT = 60
+SOLVER_WORKERS = None
+SOLVER_CACHE_PATH = "solutions.db"
+
+# hints, the boards kept with their best next move, the seconds a search
+# may take, how often to look for its result, how the tile is marked and
+# the key asking for a hint
+HINT_CACHE_SIZE = 100000
+HINT_TIME_LIMIT = 30
+HINT_POLL_MS = 100
+HINT_COLOR = "red"
+HINT_PENSIZE = 4
+HINT_KEY = "h"
+# the most cells of a board whose hints are shortest solutions, larger
+# boards being solved by placing the tiles, and the moves of a solution
+# kept as hints
+HINT_OPTIMAL_CELLS = 16
+HINT_PATH_KEEP = 200
+
+# difficulty calibration, the boards measured for each size and scramble
+# length, the boards a search may look at, and the sizes small enough to
+# look up every board in a table
+CALIBRATION_PATH = "calibration.json"
+CALIBRATE_SIZES = ["2x2", "3x3", "4x4"]
+CALIBRATE_BUDGETS = [5, 10, 20, 30, 40, 50, 60, 80, 100, 150, 200]
+CALIBRATE_SAMPLES = 1000
+CALIBRATE_NODE_LIMIT = 20000
+CALIBRATE_TABLE_LIMIT = 200000
+CALIBRATE_PERCENTILES = [10, 25, 50, 75, 90]
+# the difficulties, as the share of the median moves of the longest
+# calibrated scramble that the boards should take
+DIFFICULTY_LEVELS = {"easy": 0.25, "medium": 0.5, "hard": 0.75,
+                     "expert": 1.0}
+
+# hot path instrumentation, enabled here or by setting the environment
+# variable, the bits kept of each latency, the file the latencies are
+# appended to and the key appending them
+INSTRUMENT = False
+INSTRUMENT_ENV = "PUZZLE_INSTRUMENT"
+INSTRUMENT_BITS = 7
+INSTRUMENT_PATH = "latency.txt"
+INSTRUMENT_KEY = "F12"
+
+# error log rotation, the size of a log file and the old files kept, and
+# the seconds during which the repeats of a message are dropped
+LOG_MAX_BYTES = 1000000
+LOG_BACKUPS = 3
+LOG_REPEAT_WINDOW = 60
+LOG_REPEAT_LIMIT = 1000
+
+# the most clicks and key presses waiting to be handled
+EVENT_QUEUE_MAX = 32
+
+# adaptive drawing quality, the milliseconds a redraw may take before the
+# game drops to the cheap tier, the share of them to go back under, the
+# redraws judged at once, the milliseconds text updates are batched over
+# in the cheap tier, the most redraws the cheap tier is kept, and the
+# turtle speed of the full tier
+FRAME_BUDGET_MS = 50
+QUALITY_HEADROOM = 0.5
+QUALITY_WINDOW = 8
+QUALITY_MAX_HOLD = 512
+QUALITY_TEXT_MS = 250
+ANIMATION_SPEED = 3
+
+# the solver portfolio, the engines raced on a board, the seconds a race
+# may take, the weight of the weighted A* estimate, the boards the
+# bidirectional search may keep, and the file of the engines' stats
+PORTFOLIO_ENGINES = ["ida", "bfs", "weighted"]
+PORTFOLIO_TIME_LIMIT = 60
+PORTFOLIO_WEIGHT = 2
+PORTFOLIO_BFS_LIMIT = 2000000
+PORTFOLIO_STATS_PATH = "portfolio.json"
+
+# the directory the thumbnails made from the tiles of puzzles without one
+# are cached in, under the hash of the tile images, and the directory of
+# the tiles scaled down to fit the player board
+THUMBNAIL_CACHE_PATH = "Images/thumbnails"
+SCALED_TILE_PATH = "Images/scaled"
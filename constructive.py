@@ -0,0 +1,417 @@
+"""
+Solves boards of any size, not in the fewest moves, by placing the tiles
+one at a time.
+
+The optimal solver can't finish boards much larger than 4x4, so for large
+boards the tiles are put in place the way people solve the puzzle: the top
+rows are solved one after the other until two rows are left, then the two
+rows are solved one column at a time from the left until a 2x2 square is
+left, which is solved by turning its tiles round. A tile is walked to its
+cell one step at a time, the blank tile being brought in front of it by
+the shortest way around the tiles already placed, and the last two tiles
+of a row or column are first lined up next to their cells and then slid in
+together, since placing one of them would shut the other out. Where the
+second of them shuts the blank tile in, and for the last square, the few
+cells around are solved by a search. Moves that undo the move before them
+are dropped at the end.
+
+An n x n board takes about n cubed moves and a time in proportion to them,
+so a 20x20 board is solved in a fraction of a second. Run on its own, the
+tool benchmarks the solver on scrambled boards of growing size.
+
+Usage: python constructive.py [--sizes N ...] [--boards N] [--seed N]
+"""
+import argparse
+import collections
+import random
+import time
+
+from Puzzleboard import Puzzleboard
+import config
+import solver
+
+
+class Placement:
+    """
+    Class: Placement
+    This class represents a board being solved by placing its tiles. It
+    keeps the cell of every tile and the cells holding placed tiles, which
+    the blank tile goes around
+    ---
+    Attributes:
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        cells(list) -- the tile numbers of the cells, row by row
+        where(list) -- the cell of each tile
+        blank(int) -- the cell of the blank tile
+        blank_tile(int) -- the number of the blank tile
+        steps(tuple) -- the cell the blank tile moves to from each cell,
+            by move code, -1 off the board
+        fixed(bytearray) -- 1 for the cells the blank tile can't go
+            through
+        codes(list) -- the blank move codes made so far
+    """
+    __slots__ = ("rows", "columns", "cells", "where", "blank", "blank_tile",
+                 "steps", "fixed", "codes")
+
+    def __init__(self, cells, rows, columns, blank_tile):
+        """
+        Method -- __init__
+            The constructor of the class, creates Placement instances
+        Parameters:
+            cells(list) -- the tile numbers of the cells, row by row, each
+                tile numbered by the cell it is placed in
+            rows(int) -- the number of rows of the board
+            columns(int) -- the number of columns of the board
+            blank_tile(int) -- the number of the blank tile
+        """
+        self.rows = rows
+        self.columns = columns
+        self.cells = list(cells)
+        self.where = [0] * len(cells)
+        for cell, tile in enumerate(self.cells):
+            self.where[tile] = cell
+        self.blank_tile = blank_tile
+        self.blank = self.where[blank_tile]
+        board = Puzzleboard()
+        board.set_dimensions(rows, columns)
+        self.steps = board.blank_steps()
+        self.fixed = bytearray(len(cells))
+        self.codes = []
+
+    def move(self, code):
+        """
+        Method -- move
+            Moves the blank tile one cell
+        Parameters:
+            code(int) -- the move code, 0 up, 1 down, 2 left or 3 right
+        """
+        other = self.steps[code][self.blank]
+        tile = self.cells[other]
+        self.cells[self.blank] = tile
+        self.where[tile] = self.blank
+        self.cells[other] = self.blank_tile
+        self.blank = other
+        self.codes.append(code)
+
+    def route_blank(self, target, avoid):
+        """
+        Method -- route_blank
+            Moves the blank tile to a cell by the shortest way that goes
+            through neither the fixed cells nor a cell to avoid
+        Parameters:
+            target(int) -- the cell to move the blank tile to
+            avoid(int) -- a cell not to go through, such as the cell of the
+                tile being placed
+        Returns a boolean indicating whether the blank tile got there
+        """
+        if self.blank == target:
+            return True
+        steps = self.steps
+        fixed = self.fixed
+        # each cell reached by the code of the move into it
+        reached = {self.blank: None}
+        frontier = collections.deque([self.blank])
+        while frontier:
+            cell = frontier.popleft()
+            for code in (0, 1, 2, 3):
+                other = steps[code][cell]
+                if other < 0 or other == avoid or fixed[other] or \
+                        other in reached:
+                    continue
+                reached[other] = code
+                if other == target:
+                    frontier.clear()
+                    break
+                frontier.append(other)
+        if target not in reached:
+            return False
+        path = []
+        cell = target
+        while reached[cell] is not None:
+            code = reached[cell]
+            path.append(code)
+            # the cell the move came from is one step the other way
+            cell = steps[code ^ 1][cell]
+        for code in reversed(path):
+            self.move(code)
+        return True
+
+    def place(self, tile, target):
+        """
+        Method -- place
+            Walks a tile to a cell, a step along its row first where it can
+            and along its column otherwise
+        Parameters:
+            tile(int) -- the tile
+            target(int) -- the cell to walk it to
+        Raises ValueError if the tile can't get there, which only happens
+            if a tile that would have to move was fixed
+        """
+        columns = self.columns
+        while self.where[tile] != target:
+            cell = self.where[tile]
+            row, column = divmod(cell, columns)
+            target_row, target_column = divmod(target, columns)
+            choices = []
+            if column != target_column:
+                choices.append(cell + (1 if target_column > column else -1))
+            if row != target_row:
+                choices.append(cell + (columns if target_row > row
+                                       else -columns))
+            for step in choices:
+                # the blank tile goes to the next cell and the tile slides
+                # into the blank
+                if not self.fixed[step] and self.route_blank(step, cell):
+                    self.route_blank(cell, -1)
+                    break
+            else:
+                raise ValueError(f"Tile {tile} can't reach cell {target}.")
+
+    def place_pair(self, first, second, first_cell, second_cell,
+                   second_stop, region):
+        """
+        Method -- place_pair
+            Places the last two tiles of a row or a column: the first tile
+            is parked in the cell of the second and the second one next to
+            it, and the blank tile slides them both in. When the blank tile
+            is shut in the cell of the first tile by the second one, the
+            small region around the two cells is solved by a search
+        Parameters:
+            first(int) -- the tile whose cell is next to the placed tiles
+            second(int) -- the tile of the last cell of the row or column
+            first_cell(int) -- the cell of the first tile
+            second_cell(int) -- the cell of the second tile, where the
+                first one is parked
+            second_stop(int) -- the cell next to second_cell, outside the
+                row or column, where the second tile is parked
+            region(list) -- the six cells of the 2x3 or 3x2 block holding
+                the two cells and the parking cells
+        """
+        if self.where[first] != first_cell or \
+                self.where[second] != second_cell:
+            self.place(first, second_cell)
+            self.fixed[second_cell] = 1
+            try:
+                self.place(second, second_stop)
+            except ValueError:
+                if self.blank not in region:
+                    raise
+                self.fixed[second_cell] = 0
+                self.solve_region(region, {first_cell: first,
+                                           second_cell: second})
+            else:
+                self.fixed[second_stop] = 1
+                self.route_blank(first_cell, -1)
+                self.fixed[second_cell] = self.fixed[second_stop] = 0
+                # the first tile slides into its cell, then the second one
+                self.route_blank(second_cell, -1)
+                self.route_blank(second_stop, -1)
+        self.fixed[first_cell] = self.fixed[second_cell] = 1
+
+    def solve_region(self, region, wanted):
+        """
+        Method -- solve_region
+            Puts some tiles in their cells by a breadth-first search over
+            the boards of a small region holding the blank tile, the blank
+            tile staying in the region
+        Parameters:
+            region(list) -- the cells of the region
+            wanted(dict) -- the tile wanted in each of some of the cells
+        Raises ValueError if the tiles can't be put there, which only
+            happens if the board can't be solved
+        """
+        inside = set(region)
+        start = (self.blank, tuple(self.cells[cell] for cell in region))
+        position = {cell: index for index, cell in enumerate(region)}
+        goals = [(position[cell], tile) for cell, tile in wanted.items()]
+        # each board of the region by the board before it and the move
+        reached = {start: None}
+        frontier = collections.deque([start])
+        while frontier:
+            state = frontier.popleft()
+            blank, tiles = state
+            if all(tiles[index] == tile for index, tile in goals):
+                path = []
+                while reached[state] is not None:
+                    state, code = reached[state]
+                    path.append(code)
+                for code in reversed(path):
+                    self.move(code)
+                return
+            for code in (0, 1, 2, 3):
+                other = self.steps[code][blank]
+                if other not in inside:
+                    continue
+                following = list(tiles)
+                following[position[blank]] = tiles[position[other]]
+                following[position[other]] = self.blank_tile
+                following = (other, tuple(following))
+                if following not in reached:
+                    reached[following] = (state, code)
+                    frontier.append(following)
+        raise ValueError("The board can't be solved.")
+
+    def solve(self, goal):
+        """
+        Method -- solve
+            Places every tile of the board in its cell of a goal board
+            whose blank tile is in the last cell
+        Parameters:
+            goal(list) -- the tile of each cell of the goal board
+        """
+        rows, columns = self.rows, self.columns
+        # the top rows, one at a time, until two are left
+        for row in range(rows - 2):
+            start = row * columns
+            for column in range(columns - 2):
+                self.place(goal[start + column], start + column)
+                self.fixed[start + column] = 1
+            corner = start + columns - 1
+            self.place_pair(goal[corner - 1], goal[corner], corner - 1,
+                            corner, corner + columns,
+                            [corner - 1 + step * columns + side
+                             for step in range(3) for side in (0, 1)])
+        # the two rows left, one column at a time, until a square is left
+        top = (rows - 2) * columns
+        for column in range(columns - 2):
+            cell = top + column
+            self.place_pair(goal[cell + columns], goal[cell],
+                            cell + columns, cell, cell + 1,
+                            [cell + step * columns + side
+                             for step in range(2) for side in range(3)])
+        # the last square is solved by a search, turning its tiles round
+        last = rows * columns - 1
+        square = [last - columns - 1, last - columns, last - 1, last]
+        self.solve_region(square, {cell: goal[cell] for cell in square})
+
+
+def solve(tiles, rows, columns, blank_tile=None):
+    """
+    Function -- solve
+        Finds a solution of a board of any size, by placing the tiles row
+        by row and then column by column
+    Parameters:
+        tiles(list) -- the tile numbers of the cells, row by row
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        blank_tile(int) -- the number of the blank tile, the last one when
+            not given
+    Returns a list of the blank move codes of the solution
+    Raises ValueError if the board isn't valid or can't be solved
+    """
+    count = rows * columns
+    if blank_tile is None:
+        blank_tile = count - 1
+    tiles = list(tiles)
+    solver.check_board(tiles, rows, columns, blank_tile)
+    if rows < 2 or columns < 2:
+        raise ValueError("The board must have two rows and two columns.")
+
+    # the solved board with its blank tile moved right and then down to
+    # the last cell, the board the placing leads to
+    board = Puzzleboard()
+    board.set_dimensions(rows, columns)
+    board.set_tiles(list(range(count)))
+    board.set_board(list(range(count)), blank_tile)
+    detour = [3] * (columns - 1 - blank_tile % columns) + \
+        [1] * (rows - 1 - blank_tile // columns)
+    for code in detour:
+        board.move_blank(code)
+    goal = list(board.cells)
+
+    placement = Placement(tiles, rows, columns, blank_tile)
+    placement.solve(goal)
+    # then the blank tile goes back the way it came
+    codes = placement.codes + [code ^ 1 for code in reversed(detour)]
+
+    # drop the moves that undo the move before them
+    kept = []
+    for code in codes:
+        if kept and kept[-1] == code ^ 1:
+            kept.pop()
+        else:
+            kept.append(code)
+    return kept
+
+
+def solve_board(board):
+    """
+    Function -- solve_board
+        Finds a solution of the board of a Puzzleboard holding tile
+        numbers, such as the board of a GameSession
+    Parameters:
+        board(Puzzleboard) -- the board
+    Returns a list of the blank move codes of the solution
+    Raises ValueError if the board can't be solved
+    """
+    return solve(list(board.cells), board.get_rows(), board.get_columns(),
+                 board.cells[board.blank])
+
+
+def benchmark(sizes, boards, seed=0):
+    """
+    Function -- benchmark
+        Solves random boards of each size and checks every solution
+    Parameters:
+        sizes(list) -- the number of rows and columns of each size
+        boards(int) -- the number of boards of each size
+        seed(int) -- the seed of the first board
+    Returns a list of tuples of the size, the mean moves of the
+        solutions and the mean seconds a board took
+    """
+    results = []
+    for size in sizes:
+        count = size * size
+        moves = 0
+        seconds = 0.0
+        for number in range(boards):
+            rng = random.Random(seed + number)
+            tiles = list(range(count))
+            rng.shuffle(tiles)
+            # swap two tiles to make an unsolvable board solvable
+            try:
+                solver.check_board(tiles, size, size, count - 1)
+            except ValueError:
+                first, second = [index for index, tile in enumerate(tiles)
+                                 if tile != count - 1][:2]
+                tiles[first], tiles[second] = tiles[second], tiles[first]
+            start = time.perf_counter()
+            codes = solve(tiles, size, size)
+            seconds += time.perf_counter() - start
+            if list(solver.apply_moves(tiles, size, size, count - 1,
+                                       codes)) != list(range(count)):
+                raise RuntimeError(f"A {size}x{size} board was not solved.")
+            moves += len(codes)
+        results.append((size, moves / boards, seconds / boards))
+    return results
+
+
+def main():
+    """
+    Program entry point
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the solver of "
+                                                 "large boards.")
+    parser.add_argument("--sizes", nargs="+", type=int,
+                        default=[3, 4, 5, 8, 10, 15, 20],
+                        help="rows and columns of the boards")
+    parser.add_argument("--boards", type=int, default=10,
+                        help="random boards of each size")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the first board")
+    args = parser.parse_args()
+    for size in args.sizes:
+        if not max(2, config.PUZZLE_MIN_GRID) <= size <= \
+                config.PUZZLE_MAX_GRID:
+            parser.error(f"grid size {size} is not supported")
+
+    print(f"{'size':>6} {'moves':>9} {'moves/n^3':>10} {'ms':>9}")
+    for size, moves, seconds in benchmark(args.sizes, args.boards,
+                                          args.seed):
+        print(f"{size:>3}x{size:<2} {moves:>9.0f} {moves / size ** 3:>10.2f} "
+              f"{seconds * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
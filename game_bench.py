@@ -0,0 +1,171 @@
+"""
+Benchmark client for the game server.
+
+Starts a private game server, unless --external is given, opens many
+connections that each start a game, and then has every connection play
+random moves at the same time. The round-trip latency of the moves is
+printed as percentiles, with the memory the server needed per session.
+
+Usage: python game_bench.py [--sessions N] [--moves N] [--grid N]
+                            [--external] [--port N]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from leaderboard_stress import percentile
+import config
+
+
+async def open_session(args):
+    """
+    Function -- open_session
+        Connects to the server and starts a game
+    Parameters:
+        args(Namespace) -- the command line arguments
+    Returns a tuple of the reader and writer of the connection
+    """
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    writer.write(json.dumps({"op": "new", "rows": args.grid,
+                             "limit": args.moves + 1}).encode("utf-8") + b"\n")
+    reply = json.loads(await reader.readline())
+    if not reply.get("ok"):
+        raise RuntimeError(reply.get("error"))
+    return reader, writer
+
+
+async def play(reader, writer, count):
+    """
+    Function -- play
+        Plays random moves on a game
+    Parameters:
+        reader(StreamReader) -- the stream of the server replies
+        writer(StreamWriter) -- the stream to send the moves to
+        count(int) -- the number of moves to send
+    Returns a list of floats with the seconds each move took
+    """
+    latencies = []
+    for _ in range(count):
+        message = {"op": "move", "target": random.choice(
+            ("up", "down", "left", "right"))}
+        start = time.perf_counter()
+        writer.write(json.dumps(message).encode("utf-8") + b"\n")
+        json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+    return latencies
+
+
+async def run_sessions(args, server):
+    """
+    Function -- run_sessions
+        Opens all the sessions, then plays them at the same time
+    Parameters:
+        args(Namespace) -- the command line arguments
+        server(Popen) -- the server process, or None for an external one
+    Returns a tuple of the sorted move latencies, the seconds the moves took
+        and the memory the server used per session in bytes, or None
+    """
+    before = resident_memory(server.pid) if server else None
+    connections = []
+    # open the connections in groups, so the listen backlog isn't overrun
+    for first in range(0, args.sessions, 500):
+        connections += await asyncio.gather(
+            *(open_session(args)
+              for _ in range(first, min(first + 500, args.sessions))))
+    per_session = None
+    if before is not None:
+        per_session = (resident_memory(server.pid) - before) / args.sessions
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(play(reader, writer, args.moves)
+                                     for reader, writer in connections))
+    elapsed = time.perf_counter() - start
+    return sorted(latency for result in results for latency in result), \
+        elapsed, per_session
+
+
+def resident_memory(pid):
+    """
+    Function -- resident_memory
+        Gets the resident memory of a process, where the system tells
+    Parameters:
+        pid(int) -- the process id
+    Returns an integer with the memory in bytes, or None
+    """
+    try:
+        with open(f"/proc/{pid}/status") as infile:
+            for line in infile:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def start_server(args):
+    """
+    Function -- start_server
+        Starts a private game server and waits until it listens
+    Parameters:
+        args(Namespace) -- the command line arguments
+    Returns the Popen instance of the server process
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    server = subprocess.Popen([sys.executable, "game_server.py",
+                               "--host", args.host, "--port", str(args.port)],
+                              cwd=directory)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((args.host, args.port)).close()
+            return server
+        except OSError:
+            time.sleep(0.05)
+    server.kill()
+    raise SystemExit("The game server didn't start.")
+
+
+def main():
+    """
+    Program entry point
+    """
+    parser = argparse.ArgumentParser(description="Measure the move latency "
+                                                 "of the game server.")
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--moves", type=int, default=20,
+                        help="moves played by each session")
+    parser.add_argument("--grid", type=int, default=4)
+    parser.add_argument("--external", action="store_true",
+                        help="use a running server instead of starting one")
+    parser.add_argument("--host", default=config.GAME_SERVER_HOST)
+    parser.add_argument("--port", type=int, default=config.GAME_SERVER_PORT)
+    args = parser.parse_args()
+
+    server = None if args.external else start_server(args)
+    try:
+        latencies, elapsed, per_session = asyncio.run(run_sessions(args,
+                                                                   server))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print(f"{len(latencies)} moves from {args.sessions} sessions in "
+          f"{elapsed:.2f} s, {len(latencies) / elapsed:.0f} per second")
+    print("move round trip " + ", ".join(
+        f"{name}: {percentile(latencies, fraction) * 1000:.3f} ms"
+        for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))) +
+        f", max: {latencies[-1] * 1000:.3f} ms")
+    if per_session is not None:
+        print(f"server memory per session: {per_session:.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
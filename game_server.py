@@ -0,0 +1,311 @@
+"""
+Sliding puzzle server for remote players.
+
+Every connection plays its own game, kept in a GameSession with the tiles
+as numbers in a small array, so a session holds no turtle objects and takes
+a few hundred bytes until its player starts moving. The connections are
+plain asyncio protocols answering each request line as it arrives. Clients
+send one JSON request per line and get one JSON reply per line:
+
+    {"op": "new", "puzzle": "mario", "limit": 50}
+    {"op": "new", "rows": 4, "columns": 5, "limit": 80, "seed": 7}
+    {"op": "new", "puzzle": "mario", "daily": true}
+    {"op": "move", "target": "up"}      also a cell index or [row, column]
+    {"op": "undo"}, {"op": "redo"}
+    {"op": "jump", "position": 0}      back to the start of the history
+    {"op": "state"}
+    {"op": "reset"}
+
+Replies have "ok": true with the moves made and the status of the game,
+"playing", "win" or "lose", or "ok": false with an error message. Games
+started with the same puzzle or size, limit and seed get the same board,
+and the daily challenge gives every player of the day the same board.
+
+Usage: python game_server.py [--host HOST] [--port N] [--directory DIR]
+"""
+import argparse
+import asyncio
+import json
+import logging
+
+from GameSession import GameSession
+from GameSession import daily_seed
+import config
+import puzzle_file
+import puzzle_log
+
+# the longest request line a client may send, in bytes
+LINE_LIMIT = 1024
+
+
+class Gameserver:
+    """
+    Class: Gameserver
+    This class represents the game server. It keeps one GameSession for
+    each connected player and plays the requested moves on it
+    ---
+    Attributes:
+        puzzles(dict) -- the number of rows and columns and the blank tile
+            of each puzzle the players can choose, by puzzle name
+        sessions(int) -- the number of connected players
+    """
+    def __init__(self, directory="."):
+        """
+        Method -- __init__
+            The constructor of the class, creates Gameserver instances and
+            reads the puzzles of a directory
+        Parameters:
+            directory(str) -- the game directory with the .puz files
+        """
+        self.puzzles = puzzle_file.read_shapes(directory)
+        self.sessions = 0
+
+    def answer(self, connection, line):
+        """
+        Method -- answer
+            Carries out one request of a player
+        Parameters:
+            connection(Gameconnection) -- the connection of the player
+            line(bytes) -- the request line
+        Returns a dictionary with the reply
+        """
+        try:
+            request = json.loads(line)
+            if request["op"] == "new":
+                connection.session = self.new_session(request)
+                return state(connection.session)
+            if connection.session is None:
+                raise ValueError("Start a game first.")
+            return self.play(connection.session, request)
+        except (ValueError, KeyError, TypeError, OverflowError) as err:
+            session = connection.session
+            logging.error(f"Request refused. {err}",
+                          extra={"puzzle": session and session.get_puzzle(),
+                                 "session": connection.name,
+                                 "event": "bad_request"})
+            return {"ok": False, "error": str(err)}
+
+    def new_session(self, request):
+        """
+        Method -- new_session
+            Starts a new scrambled game
+        Parameters:
+            request(dict) -- the request, with the move limit and either
+                the puzzle name or the number of rows and columns, and
+                optionally the seed of the board or the daily flag
+        Returns the GameSession instance of the game
+        """
+        if "puzzle" in request:
+            if request["puzzle"] not in self.puzzles:
+                raise ValueError(f"{request['puzzle']} is not a valid game.")
+            rows, columns, blank_tile = self.puzzles[request["puzzle"]]
+        else:
+            rows = int(request["rows"])
+            columns = int(request.get("columns", rows))
+            blank_tile = None
+        if not config.PUZZLE_MIN_GRID <= rows <= config.PUZZLE_MAX_GRID or \
+                not config.PUZZLE_MIN_GRID <= columns <= \
+                config.PUZZLE_MAX_GRID:
+            raise ValueError(f"Grid size {rows}x{columns} is not supported.")
+        # the daily challenge has its own seed and, by default, move limit
+        seed = request.get("seed")
+        if request.get("daily"):
+            seed = daily_seed()
+            limit = int(request.get("limit", config.DAILY_MOVE_LIMIT))
+        else:
+            limit = int(request["limit"])
+        if not 1 <= limit <= config.MOVE_LIMIT_MAX:
+            raise ValueError(f"The move limit must be between 1 and "
+                             f"{config.MOVE_LIMIT_MAX}.")
+        if seed is not None:
+            seed = int(seed)
+            if not 0 <= seed < 1 << 63:
+                raise ValueError("The seed is out of range.")
+
+        session = GameSession()
+        session.new_board(rows, columns, blank_tile)
+        session.set_puzzle(request.get("puzzle", ""))
+        session.scramble(limit, seed)
+        return session
+
+    def play(self, session, request):
+        """
+        Method -- play
+            Carries out a request on a game in progress
+        Parameters:
+            session(GameSession) -- the game of the player
+            request(dict) -- the request
+        Returns a dictionary with the reply
+        """
+        operation = request["op"]
+        if operation == "move":
+            target = request["target"]
+            if isinstance(target, list):
+                target = tuple(target)
+            moved = session.move(target)
+            return {"ok": True, "moved": moved, "moves": session.get_moves(),
+                    "status": session.get_status(),
+                    "blank": session.get_blank()}
+        if operation in ("undo", "redo", "jump"):
+            if operation == "undo":
+                moved = session.undo()
+            elif operation == "redo":
+                moved = session.redo()
+            else:
+                moved = session.jump(int(request["position"]))
+            return dict(state(session), moved=moved)
+        if operation == "state":
+            return state(session)
+        if operation == "reset":
+            session.reset()
+            return state(session)
+        raise ValueError(f"Unknown operation {operation}.")
+
+    async def serve(self, host, port):
+        """
+        Method -- serve
+            Runs the server until it is stopped
+        Parameters:
+            host(str) -- the address to listen on
+            port(int) -- the TCP port to listen on
+        """
+        loop = asyncio.get_running_loop()
+        server = await loop.create_server(lambda: Gameconnection(self),
+                                          host, port, backlog=1024)
+        async with server:
+            await server.serve_forever()
+
+
+class Gameconnection(asyncio.Protocol):
+    """
+    Class: Gameconnection
+    This class represents the connection of one player. The requests are
+    answered as soon as their line has arrived, without a task or stream
+    buffers for each connection, which keeps many idle players cheap
+    ---
+    Attributes:
+        server(Gameserver) -- the server the player is connected to
+        transport(Transport) -- the connection
+        session(GameSession) -- the game of the player, or None before the
+            first game is started
+        buffer(bytes) -- the start of a request line that hasn't fully
+            arrived yet
+        name(str) -- the session of the player in the error log
+    """
+    def __init__(self, server):
+        """
+        Method -- __init__
+            The constructor of the class, creates Gameconnection instances
+        Parameters:
+            server(Gameserver) -- the server the player is connected to
+        """
+        self.server = server
+        self.transport = None
+        self.session = None
+        self.buffer = b""
+        self.name = puzzle_log.new_session()
+
+    def connection_made(self, transport):
+        """
+        Method -- connection_made
+            Takes a new player, unless the server is full
+        Parameters:
+            transport(Transport) -- the connection
+        """
+        if self.server.sessions >= config.GAME_SERVER_MAX_SESSIONS:
+            transport.write(b'{"ok": false, "error": "The server is full."}\n')
+            transport.close()
+            return
+        self.transport = transport
+        self.server.sessions += 1
+
+    def connection_lost(self, exc):
+        """
+        Method -- connection_lost
+            Lets go of the game of a player who disconnected
+        Parameters:
+            exc(Exception) -- the error that closed the connection, or None
+        """
+        if self.transport is not None:
+            self.server.sessions -= 1
+        self.session = None
+        self.transport = None
+
+    def data_received(self, data):
+        """
+        Method -- data_received
+            Answers the complete request lines that have arrived
+        Parameters:
+            data(bytes) -- the bytes received
+        """
+        if self.transport is None:
+            return
+        lines = (self.buffer + data).split(b"\n")
+        self.buffer = lines.pop()
+        # a player sending a line over the limit is disconnected
+        if len(self.buffer) > LINE_LIMIT:
+            logging.error("Request line over the limit.",
+                          extra={"session": self.name,
+                                 "event": "line_too_long"})
+            self.transport.close()
+            return
+        replies = [json.dumps(self.server.answer(self, line)).encode("utf-8")
+                   for line in lines if line.strip()]
+        if replies:
+            self.transport.write(b"\n".join(replies) + b"\n")
+
+    def pause_writing(self):
+        """
+        Method -- pause_writing
+            Stops reading requests while the player doesn't read the replies
+        """
+        self.transport.pause_reading()
+
+    def resume_writing(self):
+        """
+        Method -- resume_writing
+            Reads requests again once the replies have been sent
+        """
+        self.transport.resume_reading()
+
+
+def state(session):
+    """
+    Function -- state
+        Describes a game for a reply
+    Parameters:
+        session(GameSession) -- the game
+    Returns a dictionary with the reply
+    """
+    board = session.get_board()
+    return {"ok": True, "puzzle": session.get_puzzle(),
+            "rows": board.get_rows(), "columns": board.get_columns(),
+            "board": session.get_state(), "moves": session.get_moves(),
+            "limit": session.get_move_limit(), "seed": session.get_log().seed,
+            "status": session.get_status()}
+
+
+def main():
+    """
+    Program entry point
+    """
+    parser = argparse.ArgumentParser(description="Host sliding puzzle games "
+                                                 "for remote players.")
+    parser.add_argument("--host", default=config.GAME_SERVER_HOST,
+                        help="address to listen on")
+    parser.add_argument("--port", type=int, default=config.GAME_SERVER_PORT,
+                        help="TCP port to listen on")
+    parser.add_argument("--directory", default=".",
+                        help="game directory with the .puz files")
+    args = parser.parse_args()
+
+    puzzle_log.setup_logging()
+    server = Gameserver(args.directory)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
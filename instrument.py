@@ -0,0 +1,140 @@
+"""
+Times the hot paths of the game in named spans.
+
+Instrumentation is enabled by INSTRUMENT in config.py or by setting the
+environment variable named by INSTRUMENT_ENV to anything but 0. When it is
+disabled, span gives back the function it decorates and timed gives back
+one shared context that does nothing, so the timed code runs as if it
+weren't instrumented. When it is enabled, every span keeps a Histogram of
+its latencies in nanoseconds, and the percentiles of all the spans are
+appended to INSTRUMENT_PATH when the program exits, or whenever dump is
+called, such as from the INSTRUMENT_KEY of the game.
+"""
+import atexit
+import contextlib
+import functools
+import logging
+import os
+import time
+
+from Histogram import Histogram
+import config
+
+# whether the spans are timed, decided once when the module is loaded
+ENABLED = bool(config.INSTRUMENT) or \
+    os.environ.get(config.INSTRUMENT_ENV, "0") not in ("", "0")
+
+# the latency histogram of each span by name
+SPANS = {}
+
+# the context handed out by timed when instrumentation is disabled
+NO_SPAN = contextlib.nullcontext()
+
+
+def record(name, nanoseconds):
+    """
+    Function -- record
+        Adds a latency to the histogram of a span
+    Parameters:
+        name(str) -- the name of the span
+        nanoseconds(int) -- the latency
+    """
+    histogram = SPANS.get(name)
+    if histogram is None:
+        histogram = SPANS[name] = Histogram(config.INSTRUMENT_BITS)
+    histogram.record(nanoseconds)
+
+
+def span(name):
+    """
+    Function -- span
+        Makes a decorator timing every call of a function in a span
+    Parameters:
+        name(str) -- the name of the span
+    Returns a decorator that gives back the function itself when
+        instrumentation is disabled
+    """
+    def decorate(function):
+        if not ENABLED:
+            return function
+
+        @functools.wraps(function)
+        def timed_function(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter_ns() - start)
+        return timed_function
+    return decorate
+
+
+@contextlib.contextmanager
+def _timed(name):
+    """
+    Function -- _timed
+        Times the code run in a with block in a span
+    Parameters:
+        name(str) -- the name of the span
+    """
+    start = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter_ns() - start)
+
+
+def timed(name):
+    """
+    Function -- timed
+        Times a block of code in a span, used as "with timed(name):"
+    Parameters:
+        name(str) -- the name of the span
+    Returns a context manager, one that does nothing when instrumentation
+        is disabled
+    """
+    if not ENABLED:
+        return NO_SPAN
+    return _timed(name)
+
+
+def report():
+    """
+    Function -- report
+        Describes the latencies of every span
+    Returns a list of strings, a header and one line per span with its
+        count and its mean, p50, p95, p99 and maximum in milliseconds
+    """
+    lines = [f"{'span':<32} {'count':>8} {'mean':>9} {'p50':>9} "
+             f"{'p95':>9} {'p99':>9} {'max':>9}"]
+    for name in sorted(SPANS):
+        histogram = SPANS[name]
+        values = [histogram.mean(), histogram.percentile(50),
+                  histogram.percentile(95), histogram.percentile(99),
+                  histogram.highest]
+        lines.append(f"{name:<32} {histogram.count:>8} " +
+                     " ".join(f"{value / 1e6:>9.3f}" for value in values))
+    return lines
+
+
+def dump(path=None):
+    """
+    Function -- dump
+        Appends the latencies of every span to a file, with the time of
+        the dump
+    Parameters:
+        path(str) -- the path to the file, the configured one when not given
+    """
+    if not SPANS:
+        return
+    stamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    try:
+        with open(path or config.INSTRUMENT_PATH, "a") as outfile:
+            outfile.write(f"# {stamp}, pid {os.getpid()}, milliseconds\n")
+            outfile.write("\n".join(report()) + "\n\n")
+    except OSError as err:
+        logging.error(str(err), extra={"event": "dump_failed"})
+
+
+if ENABLED:
+    atexit.register(dump)
@@ -0,0 +1,191 @@
+"""
+Load generator for the leaderboard service.
+
+Starts a private leaderboard service on a temporary log file, unless
+--external is given, and opens many client connections that submit records
+as fast as the service accepts them, asking for the top records every few
+submissions. When they are done, the log is read back and every record must
+be there exactly once. The throughput, the latency percentiles of the
+requests and the peak memory of the service are printed.
+
+Usage: python leader_loadgen.py [--clients N] [--records N] [--top-every N]
+                                [--external] [--port N] [--socket PATH]
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from Leaderlog import Leaderlog
+from leaderboard_stress import percentile
+import config
+
+
+async def client(worker, count, top_every, host, port, socket_path):
+    """
+    Function -- client
+        Submits records to the service from one connection
+    Parameters:
+        worker(int) -- the number of the client, used in the names
+        count(int) -- the number of records to submit
+        top_every(int) -- the number of submissions between top queries,
+            no queries when 0
+        host(str) -- the address of the service
+        port(int) -- the TCP port of the service
+        socket_path(str) -- the Unix socket of the service, if used
+    Returns a tuple of two lists of floats with the seconds each submission
+        and each query took
+    """
+    if socket_path:
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    submissions, queries = [], []
+
+    async def request(message, latencies):
+        start = time.perf_counter()
+        writer.write(json.dumps(message).encode("utf-8") + b"\n")
+        reply = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        if not reply.get("ok"):
+            raise RuntimeError(reply.get("error"))
+
+    for index in range(count):
+        await request({"op": "add", "moves": index % 200 + 1,
+                       "name": f"c{worker}-{index}",
+                       "puzzle": f"p{worker % 4}", "size": "4x4",
+                       "limit": 200}, submissions)
+        if top_every and index % top_every == 0:
+            await request({"op": "top", "count": config.LEADERS_SHOWN,
+                           "puzzle": f"p{worker % 4}"}, queries)
+    writer.close()
+    return submissions, queries
+
+
+async def run_clients(args):
+    """
+    Function -- run_clients
+        Runs all the clients at the same time
+    Parameters:
+        args(Namespace) -- the command line arguments
+    Returns a tuple of the sorted submission latencies, the sorted query
+        latencies and the seconds the clients took
+    """
+    start = time.perf_counter()
+    results = await asyncio.gather(*(client(worker, args.records,
+                                            args.top_every, args.host,
+                                            args.port, args.socket)
+                                     for worker in range(args.clients)))
+    elapsed = time.perf_counter() - start
+    submissions = sorted(latency for result in results
+                         for latency in result[0])
+    queries = sorted(latency for result in results for latency in result[1])
+    return submissions, queries, elapsed
+
+
+def start_service(args, path):
+    """
+    Function -- start_service
+        Starts a private leaderboard service and waits until it listens
+    Parameters:
+        args(Namespace) -- the command line arguments
+        path(str) -- the path to the leaderboard log file
+    Returns the Popen instance of the service process
+    """
+    command = [sys.executable, "leader_service.py", "--path", path,
+               "--host", args.host, "--port", str(args.port)]
+    if args.socket:
+        command += ["--socket", args.socket]
+    service = subprocess.Popen(command, cwd=os.path.dirname(
+        os.path.abspath(__file__)))
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            asyncio.run(client(-1, 0, 0, args.host, args.port, args.socket))
+            return service
+        except OSError:
+            time.sleep(0.05)
+    service.kill()
+    raise SystemExit("The leaderboard service didn't start.")
+
+
+def peak_memory(pid):
+    """
+    Function -- peak_memory
+        Gets the peak resident memory of a process, where the system tells
+    Parameters:
+        pid(int) -- the process id
+    Returns a string with the peak memory, or "unknown"
+    """
+    try:
+        with open(f"/proc/{pid}/status") as infile:
+            for line in infile:
+                if line.startswith("VmHWM:"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return "unknown"
+
+
+def main():
+    """
+    Program entry point
+    """
+    parser = argparse.ArgumentParser(description="Load the leaderboard "
+                                                 "service with many clients.")
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--records", type=int, default=100,
+                        help="records submitted by each client")
+    parser.add_argument("--top-every", type=int, default=10,
+                        help="submissions between top queries, 0 for none")
+    parser.add_argument("--external", action="store_true",
+                        help="use a running service instead of starting one")
+    parser.add_argument("--host", default=config.LEADER_SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=config.LEADER_SERVICE_PORT)
+    parser.add_argument("--socket", default=config.LEADER_SERVICE_SOCKET)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "leaderboard.txt")
+        service = None if args.external else start_service(args, path)
+        try:
+            submissions, queries, elapsed = asyncio.run(run_clients(args))
+            memory = "unknown" if service is None else peak_memory(service.pid)
+        finally:
+            if service is not None:
+                service.terminate()
+                service.wait()
+
+        # every record must have been written exactly once
+        lost = duplicated = 0
+        if service is not None:
+            names = [record[2] for record in Leaderlog(path).get_records()]
+            expected = {f"c{worker}-{index}"
+                        for worker in range(args.clients)
+                        for index in range(args.records)}
+            lost = len(expected - set(names))
+            duplicated = len(names) - len(set(names))
+
+    print(f"{len(submissions)} submissions from {args.clients} clients "
+          f"in {elapsed:.2f} s, {len(submissions) / elapsed:.0f} per second")
+    for label, latencies in (("submit", submissions), ("top", queries)):
+        if not latencies:
+            continue
+        print(f"{label} " + ", ".join(
+            f"{name}: {percentile(latencies, fraction) * 1000:.3f} ms"
+            for name, fraction in (("p50", 0.5), ("p95", 0.95),
+                                   ("p99", 0.99))) +
+            f", max: {latencies[-1] * 1000:.3f} ms")
+    print(f"service peak memory: {memory}")
+    if service is not None:
+        print(f"lost records: {lost}, duplicated records: {duplicated}")
+        if lost or duplicated:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
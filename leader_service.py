@@ -0,0 +1,300 @@
+"""
+Leaderboard service shared by the game processes.
+
+Game clients connect over TCP, or a Unix socket when one is configured, and
+send one JSON request per line:
+
+    {"op": "add", "moves": 30, "name": "ann", "puzzle": "mario",
+     "size": "4x4", "limit": 50, "seed": 20261019, "replay": "..."}
+    {"op": "top", "count": 5, "puzzle": "mario"}
+    {"op": "version"}
+
+and get one JSON reply per line, such as {"ok": true} or
+{"ok": true, "leaders": [[30, "ann"]]}. Submissions go through a bounded
+queue to a single writer, which appends them to the leaderboard log in
+groups of up to LEADER_SERVICE_BATCH records, so thousands of submissions
+cost a few writes. A submission is only answered once it is on disk. Top
+queries, for up to LEADER_SERVICE_TOP_MAX records, are answered from the
+records in memory without touching the file.
+The log is the same file the games use when the service isn't running, so
+the two can be mixed.
+
+A submission may carry the record of the winning game, encoded by
+Movelog.encode and then in base64. The service replays it against the
+puzzles of the game directory and refuses the score, with "refused" set in
+the reply, unless the game is a win with exactly that score. With
+LEADER_REQUIRE_REPLAY set, submissions without a game are refused too.
+
+Usage: python leader_service.py [--host HOST] [--port N] [--socket PATH]
+                                 [--path FILE] [--directory DIR]
+"""
+import argparse
+import asyncio
+import base64
+import binascii
+import json
+import logging
+
+from Leaderlog import Leaderlog
+from Movelog import Movelog
+from Movelog import decode_varint
+from verifier import check_log
+import config
+import puzzle_file
+import puzzle_log
+
+# the longest request line a client may send, in bytes, enough for the
+# record of a game of MOVE_LIMIT_MAX moves
+LINE_LIMIT = 16384
+
+
+class Leaderservice:
+    """
+    Class: Leaderservice
+    This class represents the leaderboard service. It answers the requests
+    of the connected clients and writes the submitted records in batches
+    ---
+    Attributes:
+        records(Leaderlog) -- the leaderboard records
+        shapes(dict) -- the board shape and blank tile of each puzzle the
+            submitted games are checked against, or None to skip the check
+        queue(Queue) -- the submitted records waiting to be written, with
+            the futures of the requests waiting for them
+        written(int) -- the number of records written so far
+        batches(int) -- the number of writes made so far
+    """
+    def __init__(self, path, shapes=None):
+        """
+        Method -- __init__
+            The constructor of the class, creates Leaderservice instances
+        Parameters:
+            path(str) -- the path to the leaderboard log file
+            shapes(dict) -- the board shape and blank tile of each puzzle,
+                as read by puzzle_file.read_shapes
+        """
+        self.records = Leaderlog(path)
+        self.shapes = shapes
+        self.records.get_records()
+        self.queue = asyncio.Queue(config.LEADER_SERVICE_QUEUE)
+        self.written = 0
+        self.batches = 0
+
+    async def handle(self, reader, writer):
+        """
+        Method -- handle
+            Answers the requests of a client until it disconnects
+        Parameters:
+            reader(StreamReader) -- the stream of the client requests
+            writer(StreamWriter) -- the stream to write the replies to
+        """
+        # the errors of the client are logged under its own session
+        session = puzzle_log.new_session()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    reply = await self.dispatch(json.loads(line), session)
+                except (ValueError, KeyError, IndexError, TypeError,
+                        OverflowError) as err:
+                    reply = {"ok": False, "error": str(err)}
+                writer.write(json.dumps(reply).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            # the client went away or sent a line over the limit
+            pass
+        finally:
+            writer.close()
+
+    async def dispatch(self, request, session=None):
+        """
+        Method -- dispatch
+            Answers one request
+        Parameters:
+            request(dict) -- the decoded request
+            session(str) -- the session of the client in the error log
+        Returns a dictionary with the reply
+        """
+        operation = request["op"]
+        if operation == "add":
+            seed = request.get("seed")
+            score = (int(request["moves"]), str(request.get("name", "")),
+                     str(request.get("puzzle", "")),
+                     str(request.get("size", "")),
+                     int(request.get("limit", 0)),
+                     None if seed is None else int(seed))
+            reason = self.check_score(score, request.get("replay"), session)
+            if reason:
+                return {"ok": False, "refused": True, "error": reason}
+            # wait until the writer has the record on disk
+            written = asyncio.get_running_loop().create_future()
+            await self.queue.put((score, written))
+            try:
+                await written
+            except (OSError, TimeoutError) as err:
+                # the client is told the score wasn't kept, rather than
+                # losing the connection and sending it again
+                return {"ok": False, "error": str(err)}
+            return {"ok": True}
+        if operation == "top":
+            puzzle = request.get("puzzle")
+            count = int(request.get("count", config.LEADERS_SHOWN))
+            # a negative count would slice off all but a few records
+            if not 0 <= count <= config.LEADER_SERVICE_TOP_MAX:
+                raise ValueError(f"The count must be between 0 and "
+                                 f"{config.LEADER_SERVICE_TOP_MAX}.")
+            leaders = self.records.top(count,
+                                       None if puzzle is None else str(puzzle),
+                                       refresh=False)
+            return {"ok": True, "leaders": leaders}
+        if operation == "version":
+            return {"ok": True, "version": self.version()}
+        if operation == "ping":
+            return {"ok": True}
+        raise ValueError(f"Unknown operation {operation}.")
+
+    def check_score(self, score, replay, session=None):
+        """
+        Method -- check_score
+            Checks a submitted score against the record of the game
+        Parameters:
+            score(tuple) -- the moves, name, puzzle, size, limit and seed
+                submitted
+            replay(str) -- the record of the game in base64, or None
+            session(str) -- the session of the client in the error log
+        Returns None if the score holds up, or a string with the reason it
+            doesn't
+        """
+        if replay is None:
+            if config.LEADER_REQUIRE_REPLAY:
+                return "The score has no game to back it up."
+            return None
+        moves, _, puzzle, size, limit, seed = score
+        try:
+            data = base64.b64decode(str(replay), validate=True)
+            _, start = decode_varint(data, 0)
+            log = Movelog.decode(memoryview(data)[start:])
+            if log.puzzle != puzzle or log.move_limit != limit or \
+                    f"{log.rows}x{log.columns}" != size or \
+                    seed is not None and log.seed != seed:
+                raise ValueError("The game doesn't match the score.")
+            check_log(log, moves, self.shapes)
+        except (ValueError, binascii.Error) as err:
+            logging.error(f"Score of {score[1]} refused. {err}",
+                          extra={"puzzle": puzzle, "session": session,
+                                 "event": "score_refused"})
+            return str(err)
+        return None
+
+    def version(self):
+        """
+        Method -- version
+            Gets a value that changes whenever the records change
+        Returns a list with the inode, size and modification time of the
+            log file as last read or written
+        """
+        return list(self.records.stamp or [])
+
+    async def write_batches(self):
+        """
+        Method -- write_batches
+            Writes the submitted records to the log file, taking as many
+            waiting records as a batch holds for each write
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            # give the other clients a moment to join a small batch
+            if self.queue.qsize() < config.LEADER_SERVICE_BATCH:
+                await asyncio.sleep(config.LEADER_SERVICE_BATCH_DELAY)
+            while len(batch) < config.LEADER_SERVICE_BATCH and \
+                    not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            # write in a thread, so the clients are served in the meantime
+            try:
+                await loop.run_in_executor(
+                    None, self.records.add_many,
+                    [score for score, _ in batch])
+                error = None
+                self.written += len(batch)
+                self.batches += 1
+            except (OSError, TimeoutError) as err:
+                logging.error(str(err), extra={"event": "write_failed"})
+                error = err
+            for _, written in batch:
+                if written.done():
+                    continue
+                if error is None:
+                    written.set_result(None)
+                else:
+                    written.set_exception(error)
+
+    async def refresh(self):
+        """
+        Method -- refresh
+            Reads the records the games added to the log file by themselves
+            while the service was unreachable, once a second
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(1)
+            if self.records.changed():
+                await loop.run_in_executor(None, self.records.catch_up)
+
+    async def serve(self, host, port, socket_path=None):
+        """
+        Method -- serve
+            Runs the service until it is stopped
+        Parameters:
+            host(str) -- the address to listen on
+            port(int) -- the TCP port to listen on
+            socket_path(str) -- the Unix socket to listen on instead of the
+                TCP port, if given
+        """
+        if socket_path:
+            server = await asyncio.start_unix_server(self.handle, socket_path,
+                                                     limit=LINE_LIMIT)
+        else:
+            server = await asyncio.start_server(self.handle, host, port,
+                                                limit=LINE_LIMIT)
+        tasks = [asyncio.create_task(self.write_batches()),
+                 asyncio.create_task(self.refresh())]
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+def main():
+    """
+    Program entry point
+    """
+    parser = argparse.ArgumentParser(description="Run the leaderboard "
+                                                 "service.")
+    parser.add_argument("--host", default=config.LEADER_SERVICE_HOST,
+                        help="address to listen on")
+    parser.add_argument("--port", type=int, default=config.LEADER_SERVICE_PORT,
+                        help="TCP port to listen on")
+    parser.add_argument("--socket", default=config.LEADER_SERVICE_SOCKET,
+                        help="Unix socket to listen on instead of the port")
+    parser.add_argument("--path", default=config.LEADER_BOARD_PATH,
+                        help="leaderboard log file")
+    parser.add_argument("--directory", default=".",
+                        help="game directory to check the games against")
+    args = parser.parse_args()
+
+    puzzle_log.setup_logging()
+    service = Leaderservice(args.path,
+                            puzzle_file.read_shapes(args.directory))
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.socket))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Stress test for concurrent leaderboard writes.
+
+Starts many processes that all add records to the same leaderboard log as
+fast as they can, with a small compaction threshold so compactions run in
+the middle of the appends. When they are done, the log is read back and
+every record must be there exactly once. The per-write latency of all the
+processes is printed as percentiles.
+
+Usage: python leaderboard_stress.py [--processes N] [--records N]
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from Leaderlog import Leaderlog
+import config
+
+
+def hammer(path, worker, count, compact_every):
+    """
+    Function -- hammer
+        Adds records to the leaderboard log from one process
+    Parameters:
+        path(str) -- the path to the leaderboard log file
+        worker(int) -- the number of the process, used in the names
+        count(int) -- the number of records to add
+        compact_every(int) -- the compaction threshold to use
+    Returns a list of floats with the seconds each add took
+    """
+    config.LEADER_BOARD_COMPACT_EVERY = compact_every
+    records = Leaderlog(path)
+    latencies = []
+    for index in range(count):
+        start = time.perf_counter()
+        records.add(index % 200 + 1, f"w{worker}-{index}", f"p{worker % 4}",
+                    "4x4", 200)
+        latencies.append(time.perf_counter() - start)
+    # let a running compaction finish before the process ends
+    if records.compactor is not None:
+        records.compactor.join()
+    return latencies
+
+
+def percentile(values, fraction):
+    """
+    Function -- percentile
+        Gets a percentile of a list of numbers
+    Parameters:
+        values(list) -- the sorted numbers
+        fraction(float) -- the percentile as a fraction between 0 and 1
+    Returns the number at the percentile
+    """
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def main():
+    """
+    Program entry point
+    """
+    parser = argparse.ArgumentParser(description="Hammer the leaderboard "
+                                                 "log from many processes.")
+    parser.add_argument("--processes", type=int, default=16)
+    parser.add_argument("--records", type=int, default=500,
+                        help="records added by each process")
+    parser.add_argument("--compact-every", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "leaderboard.txt")
+        start = time.perf_counter()
+        with multiprocessing.Pool(args.processes) as pool:
+            results = pool.starmap(hammer,
+                                   [(path, worker, args.records,
+                                     args.compact_every)
+                                    for worker in range(args.processes)])
+        elapsed = time.perf_counter() - start
+
+        # every record must have been written exactly once
+        names = [record[2] for record in Leaderlog(path).get_records()]
+        expected = {f"w{worker}-{index}"
+                    for worker in range(args.processes)
+                    for index in range(args.records)}
+        lost = expected - set(names)
+        duplicated = len(names) - len(set(names))
+
+    latencies = sorted(latency for result in results for latency in result)
+    print(f"{len(latencies)} writes from {args.processes} processes "
+          f"in {elapsed:.2f} s")
+    for label, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+        print(f"{label}: {percentile(latencies, fraction) * 1000:.3f} ms")
+    print(f"max: {latencies[-1] * 1000:.3f} ms")
+    print(f"lost records: {len(lost)}, duplicated records: {duplicated}")
+    if lost or duplicated:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
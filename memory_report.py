@@ -0,0 +1,250 @@
+"""
+Reports the memory a tile, a board and a game session take.
+
+Tiles, boards and sessions are made the way a game makes them, a session
+being scrambled and played for some moves so its record and undo history
+hold something, and the memory allocated is measured with tracemalloc and
+divided by the number made. Each is compared with the object model the
+game had before: Tiles keeping their size and image path in a __dict__ and
+told apart by the path, a read from the .puz file for every tile, and a
+board holding the Tiles in a list of rows besides the list in solved
+order. The old game had no session, its state being that board and its
+move count, so a session is compared with the board of Tiles. The turtles
+drawing the tiles, one per tile in both models, need a screen and are
+left out.
+
+Usage: python memory_report.py [--count N] [--rows N] [--columns N]
+                               [--moves N]
+"""
+import argparse
+import random
+import sys
+import tracemalloc
+
+from Puzzleboard import Puzzleboard
+from Tile import Tile
+import GameSession
+
+
+class BaselineTile:
+    """
+    Class: BaselineTile
+    This class represents a tile as the game kept it before, with its
+    attributes in a __dict__ and its own copy of its image path
+    ---
+    Attributes:
+        tile_painter(Turtle) -- the turtle drawing the tile, left out
+        tile_size(int) -- the size of the tile
+        tile_image(str) -- the path to the tile image file
+    """
+    def __init__(self, tile_size, tile_image):
+        """
+        Method -- __init__
+            The constructor of the class, creates BaselineTile instances
+        Parameters:
+            tile_size(int) -- the size of the tile
+            tile_image(str) -- the path to the tile image file
+        """
+        self.tile_painter = None
+        self.tile_size = tile_size
+        self.tile_image = tile_image
+
+
+class BaselineBoard:
+    """
+    Class: BaselineBoard
+    This class represents a puzzle board as the game kept it before, with
+    its attributes in a __dict__ and the tiles in a list of rows
+    ---
+    Attributes:
+        moves(int) -- the moves that the user has made
+        size(int) -- the number of rows of the board
+        tiles(list) -- the tiles in solved order
+        board(list) -- a list of lists with each row of tiles
+    """
+    def __init__(self):
+        """
+        Method -- __init__
+            The constructor of the class, creates BaselineBoard instances
+        """
+        self.moves = 0
+        self.size = 4
+        self.tiles = []
+        self.board = []
+
+
+def tile_path(number):
+    """
+    Function -- tile_path
+        Makes the path of a tile image the way reading a .puz file does,
+        as a new string
+    Parameters:
+        number(int) -- the number of the tile
+    Returns a string with the path
+    """
+    return "".join(["Images/puzzle/", str(number), ".gif"])
+
+
+def make_tile(number, count=16):
+    """
+    Function -- make_tile
+        Makes a tile the way the game makes them now, without its turtle
+    Parameters:
+        number(int) -- the number of the tile
+        count(int) -- the number of tiles of the puzzle
+    Returns the Tile instance
+    """
+    tile = Tile.__new__(Tile)
+    tile.tile_painter = None
+    tile.tile_size = 98
+    tile.tile_image = sys.intern(tile_path(number % count))
+    tile.tile_id = number % count
+    tile.blank = number % count == count - 1
+    return tile
+
+
+def make_baseline_tile(number):
+    """
+    Function -- make_baseline_tile
+        Makes a tile the way the game made them before, without its turtle
+    Parameters:
+        number(int) -- the number of the tile
+    Returns the BaselineTile instance
+    """
+    return BaselineTile(98, tile_path(number % 16))
+
+
+def measure(make, count):
+    """
+    Function -- measure
+        Measures the memory each of many objects takes
+    Parameters:
+        make(function) -- makes one object from its number
+        count(int) -- the number of objects to make
+    Returns a float with the bytes allocated per object
+    """
+    # the tables shared by all the objects are made before measuring
+    make(0)
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    objects = [make(number) for number in range(count)]
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del objects
+    return used / count
+
+
+def make_board(rows, columns):
+    """
+    Function -- make_board
+        Makes a scrambled board of tile numbers the way a GameSession does,
+        with the Tiles a game window draws them with
+    Parameters:
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+    Returns a function making a board and its tiles from its number
+    """
+    # the solved tiles the sessions of this size share
+    tiles = GameSession.GameSession(rows, columns).get_board().get_tiles()
+
+    def make(number):
+        board = Puzzleboard()
+        board.set_dimensions(rows, columns)
+        board.set_tiles(tiles)
+        board.set_board(tiles, rows * columns - 1)
+        board.scramble_board(rows * columns * 4, random.Random(number))
+        return board, [make_tile(tile, rows * columns)
+                       for tile in range(rows * columns)]
+    return make
+
+
+def make_baseline_board(rows, columns):
+    """
+    Function -- make_baseline_board
+        Makes a scrambled board of Tiles the way the game did before
+    Parameters:
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+    Returns a function making a board from its number
+    """
+    def make(number):
+        board = BaselineBoard()
+        board.size = rows
+        board.tiles = [BaselineTile(98, tile_path(tile))
+                       for tile in range(rows * columns)]
+        cells = board.tiles[:]
+        random.Random(number).shuffle(cells)
+        board.board = [cells[row * columns:(row + 1) * columns]
+                       for row in range(rows)]
+        return board
+    return make
+
+
+def make_session(rows, columns, moves):
+    """
+    Function -- make_session
+        Makes a scrambled game session with some moves played
+    Parameters:
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        moves(int) -- the number of random moves to play
+    Returns a function making a session from its number
+    """
+    def make(number):
+        rng = random.Random(number)
+        session = GameSession.GameSession(rows, columns)
+        # a limit the moves played can't use up
+        session.scramble(moves * 2, number)
+        for _ in range(moves):
+            session.move_blank(rng.randrange(4))
+        return session
+    return make
+
+
+def report(count, rows, columns, moves):
+    """
+    Function -- report
+        Measures a tile, a board and a session, and what they took before
+    Parameters:
+        count(int) -- the number of objects to measure
+        rows(int) -- the number of rows of the boards
+        columns(int) -- the number of columns of the boards
+        moves(int) -- the number of moves played in each session
+    Returns a list of tuples of the name of each object and the bytes it
+        takes now and took before
+    """
+    size = f"{rows}x{columns}"
+    baseline_board = measure(make_baseline_board(rows, columns), count)
+    return [("tile", measure(make_tile, count),
+             measure(make_baseline_tile, count)),
+            (f"board {size} with tiles",
+             measure(make_board(rows, columns), count), baseline_board),
+            (f"session {size}, {moves} moves",
+             measure(make_session(rows, columns, moves), count),
+             baseline_board)]
+
+
+def main():
+    """
+    Program entry point
+    """
+    parser = argparse.ArgumentParser(description="Report the memory of "
+                                                 "tiles, boards and "
+                                                 "sessions.")
+    parser.add_argument("--count", type=int, default=10000,
+                        help="objects to make of each kind")
+    parser.add_argument("--rows", type=int, default=4)
+    parser.add_argument("--columns", type=int)
+    parser.add_argument("--moves", type=int, default=100,
+                        help="moves played in each session")
+    args = parser.parse_args()
+
+    print(f"{'bytes per object':<28} {'now':>9} {'before':>9} {'saved':>7}")
+    for name, now, before in report(args.count, args.rows,
+                                    args.columns or args.rows, args.moves):
+        print(f"{name:<28} {now:>9.0f} {before:>9.0f} "
+              f"{1 - now / before:>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+"""
+Races several solvers on a board in separate processes.
+
+Which search solves a board first depends on the board: IDA* with the
+Manhattan distance and linear conflicts is quick on most boards, the
+bidirectional breadth-first search on boards close to solved, and the
+weighted A* finds a solution that may be a little longer on boards that
+take the others long. Every engine named in PORTFOLIO_ENGINES searches the
+board in its own process. The first shortest solution wins and the other
+processes are stopped; a solution from the weighted A* is only taken if no
+shortest one arrives in time, unless it is as short as the estimate of the
+board and so a shortest one too.
+
+The outcome of every race is added to the stats file: the races each
+engine ran, won, solved and gave up on, and the seconds it took when it
+finished, so the engines that never win can be left out of
+PORTFOLIO_ENGINES. Run on its own, the tool races scrambled boards and
+prints the stats.
+
+Usage: python portfolio.py [--boards N] [--rows N] [--columns N]
+                           [--moves N] [--engines NAME ...] [--seed N]
+                           [--time-limit SECONDS] [--stats PATH]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import time
+
+from Filelock import Filelock
+from GameSession import GameSession
+import config
+import solver
+
+# the engines by name, whether their solutions are shortest, and the
+# limits they are given besides the time
+ENGINES = {
+    "ida": (solver.solve, True, {}),
+    "bfs": (solver.bidirectional_search, True,
+            {"node_limit": config.PORTFOLIO_BFS_LIMIT}),
+    "weighted": (solver.weighted_search, False,
+                 {"weight": config.PORTFOLIO_WEIGHT}),
+}
+
+
+def engine_task(name, tiles, rows, columns, blank_tile, time_limit,
+                results):
+    """
+    Function -- engine_task
+        Runs one engine on a board, in its own process, and sends back what
+        it found
+    Parameters:
+        name(str) -- the name of the engine
+        tiles(list) -- the tile numbers of the cells, row by row
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        blank_tile(int) -- the number of the blank tile
+        time_limit(float) -- the seconds to search for
+        results(Queue) -- the queue taking tuples of the name, the solution
+            codes or None, and the seconds the search took
+    """
+    search, _, limits = ENGINES[name]
+    start = time.perf_counter()
+    try:
+        codes = search(tiles, rows, columns, blank_tile,
+                       time_limit=time_limit, **limits)
+    except MemoryError:
+        codes = None
+    results.put((name, codes, time.perf_counter() - start))
+
+
+def race(tiles, rows, columns, blank_tile=None, engines=None,
+         time_limit=None, stats_path=None):
+    """
+    Function -- race
+        Races the engines on a board and stops them once one of them found
+        a shortest solution
+    Parameters:
+        tiles(list) -- the tile numbers of the cells, row by row
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        blank_tile(int) -- the number of the blank tile, the last one when
+            not given
+        engines(list) -- the names of the engines to race, the configured
+            ones when not given
+        time_limit(float) -- the seconds the race may take, the configured
+            limit when not given
+        stats_path(str) -- the stats file the outcome is added to, the
+            configured one when not given, or "" to keep no stats
+    Returns a tuple of the solution codes, or None if no engine found one
+        in time, the name of the engine that found them, or None, and
+        whether the solution is known to be a shortest one
+    Raises ValueError if the board isn't valid or can't be solved, or an
+        engine is unknown
+    """
+    if blank_tile is None:
+        blank_tile = rows * columns - 1
+    tiles = list(tiles)
+    engines = engines or config.PORTFOLIO_ENGINES
+    time_limit = time_limit or config.PORTFOLIO_TIME_LIMIT
+    for name in engines:
+        if name not in ENGINES:
+            raise ValueError(f"{name} is not a solver engine.")
+    # an invalid board is told apart once, not by every engine
+    solver.check_board(tiles, rows, columns, blank_tile)
+    lower_bound = solver.estimate(tiles, rows, columns, blank_tile)
+
+    results = multiprocessing.Queue()
+    processes = {name: multiprocessing.Process(
+                     target=engine_task,
+                     args=(name, tiles, rows, columns, blank_tile,
+                           time_limit, results),
+                     daemon=True)
+                 for name in engines}
+    for process in processes.values():
+        process.start()
+
+    outcomes = {name: ("cancelled", None) for name in engines}
+    deadline = time.monotonic() + time_limit
+    best = None
+    try:
+        while any(outcome == "cancelled" for outcome, _ in outcomes.values()):
+            try:
+                name, codes, seconds = results.get(
+                    timeout=max(0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if codes is None:
+                outcomes[name] = ("unsolved", seconds)
+                continue
+            outcomes[name] = ("solved", seconds)
+            shortest = ENGINES[name][1] or len(codes) == lower_bound
+            if best is None or shortest or len(codes) < len(best[1]):
+                best = (name, codes, shortest)
+            if shortest:
+                break
+    finally:
+        # the engines still searching are stopped
+        for process in processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in processes.values():
+            process.join()
+        results.close()
+
+    name, codes, shortest = best or (None, None, False)
+    if stats_path != "":
+        add_stats(outcomes, name, stats_path)
+    return codes, name, shortest
+
+
+def race_board(board, engines=None, time_limit=None, stats_path=None):
+    """
+    Function -- race_board
+        Races the engines on the board of a Puzzleboard holding tile
+        numbers, such as the board of a GameSession
+    Parameters:
+        board(Puzzleboard) -- the board
+        engines(list) -- the names of the engines to race
+        time_limit(float) -- the seconds the race may take
+        stats_path(str) -- the stats file the outcome is added to
+    Returns the tuple race returns
+    Raises ValueError if the board can't be solved
+    """
+    return race(list(board.cells), board.get_rows(), board.get_columns(),
+                board.cells[board.blank], engines, time_limit, stats_path)
+
+
+def read_stats(path=None):
+    """
+    Function -- read_stats
+        Reads the stats of the engines
+    Parameters:
+        path(str) -- the path to the stats file, the configured one when
+            not given
+    Returns a dictionary with the races, wins, solved boards, boards given
+        up on and seconds taken of each engine, empty if there is no file
+    Raises ValueError if the file isn't a stats file
+    """
+    path = path or config.PORTFOLIO_STATS_PATH
+    if not os.path.exists(path):
+        return {}
+    with open(path) as infile:
+        try:
+            stats = json.load(infile)
+        except json.JSONDecodeError as err:
+            raise ValueError(f"{path} is not a stats file: {err}")
+    if not isinstance(stats, dict):
+        raise ValueError(f"{path} is not a stats file.")
+    return stats
+
+
+def add_stats(outcomes, winner, path=None):
+    """
+    Function -- add_stats
+        Adds the outcome of a race to the stats file, under a lock so races
+        run at once don't lose each other's counts
+    Parameters:
+        outcomes(dict) -- tuples of "solved", "unsolved" or "cancelled"
+            and the seconds the search took, or None, by engine name
+        winner(str) -- the name of the engine whose solution was taken,
+            or None
+        path(str) -- the path to the stats file, the configured one when
+            not given
+    """
+    path = path or config.PORTFOLIO_STATS_PATH
+    with Filelock(path + ".lock"):
+        try:
+            stats = read_stats(path)
+        except ValueError:
+            # a damaged file is started over rather than stopping races
+            stats = {}
+        for name, (outcome, seconds) in outcomes.items():
+            engine = stats.setdefault(name, {"races": 0, "wins": 0,
+                                             "solved": 0, "unsolved": 0,
+                                             "cancelled": 0, "seconds": 0.0})
+            engine["races"] += 1
+            engine["wins"] += name == winner
+            engine[outcome] += 1
+            if seconds is not None:
+                engine["seconds"] += seconds
+        with open(path, "w") as outfile:
+            json.dump(stats, outfile, indent=1)
+
+
+def print_stats(stats):
+    """
+    Function -- print_stats
+        Prints the win rate of each engine and the mean seconds of the
+        searches it finished
+    Parameters:
+        stats(dict) -- the stats read_stats gives
+    """
+    print(f"{'engine':<10} {'races':>7} {'wins':>6} {'win rate':>9} "
+          f"{'solved':>7} {'unsolved':>9} {'cancelled':>10} "
+          f"{'mean s':>8}")
+    for name, engine in sorted(stats.items()):
+        finished = engine["solved"] + engine["unsolved"]
+        mean = engine["seconds"] / finished if finished else 0.0
+        print(f"{name:<10} {engine['races']:>7} {engine['wins']:>6} "
+              f"{engine['wins'] / max(engine['races'], 1):>9.1%} "
+              f"{engine['solved']:>7} {engine['unsolved']:>9} "
+              f"{engine['cancelled']:>10} {mean:>8.3f}")
+
+
+def main():
+    """
+    Program entry point
+    """
+    parser = argparse.ArgumentParser(description="Race the solver engines "
+                                                 "on scrambled boards.")
+    parser.add_argument("--boards", type=int, default=0,
+                        help="scrambled boards to race, none to only print "
+                             "the stats")
+    parser.add_argument("--rows", type=int, default=4)
+    parser.add_argument("--columns", type=int)
+    parser.add_argument("--moves", type=int, default=80,
+                        help="scramble moves of each board")
+    parser.add_argument("--engines", nargs="+",
+                        default=config.PORTFOLIO_ENGINES,
+                        choices=sorted(ENGINES))
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the first board")
+    parser.add_argument("--time-limit", type=float,
+                        default=config.PORTFOLIO_TIME_LIMIT,
+                        help="seconds each race may take")
+    parser.add_argument("--stats", default=config.PORTFOLIO_STATS_PATH,
+                        help="stats file to update")
+    args = parser.parse_args()
+
+    rows = args.rows
+    columns = args.columns or rows
+    for number in range(args.boards):
+        session = GameSession(rows, columns)
+        session.scramble(args.moves, args.seed + number)
+        start = time.perf_counter()
+        codes, name, shortest = race_board(session.get_board(), args.engines,
+                                           args.time_limit, args.stats)
+        seconds = time.perf_counter() - start
+        if codes is None:
+            print(f"board {number}: unsolved in {seconds:.3f} s")
+        else:
+            print(f"board {number}: {len(codes)} moves by {name}"
+                  f"{'' if shortest else ' (may not be shortest)'} in "
+                  f"{seconds:.3f} s")
+
+    try:
+        print_stats(read_stats(args.stats))
+    except (OSError, ValueError) as err:
+        raise SystemExit(str(err))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Functions to read and write the .puz files describing the puzzles.
+
+A .puz file holds one "key: value" pair per line. The name, number, size
+and thumbnail keys describe the puzzle, the optional rows and columns keys
+give the shape of a rectangular board, and every numbered key holds the
+path of a tile image, in solved order with the blank tile last. The
+thumbnail may be left out, and one is then made from the tiles.
+"""
+import logging
+import os
+
+import config
+
+
+def read_puzzle(game_path, base_dir="."):
+    """
+    Function -- read_puzzle
+        Reads and validates the information of a puzzle from its .puz file
+    Parameters:
+        game_path(str) -- a string representing the path of the .puz file
+        base_dir(str) -- the game directory the image paths are relative to
+    Returns a dictionary with the meta data of the puzzle, where "size",
+        "rows" and "columns" are the tile size and the board shape as
+        integers, "images" is the list of the tile image paths in solved
+        order and "thumbnail" is "" if the puzzle has no thumbnail image
+    Raises ValueError if an image is missing or the tiles can't form a
+        puzzle board
+    """
+    # create a dictionary to store the data in .puz file
+    data_dict = {}
+    with open(game_path) as infile:
+        for line in infile:
+            if line.strip() == "":
+                continue
+            meta_data, data = line.strip().split(":", 1)
+            data_dict[meta_data.strip()] = data.strip()
+
+    # a missing thumbnail image is left to be made from the tiles
+    thumbnail = data_dict.get("thumbnail", "")
+    if not os.path.isfile(os.path.join(base_dir, thumbnail)):
+        thumbnail = ""
+    data_dict["thumbnail"] = thumbnail
+
+    # collect the tile images in the order of their numbers
+    puzzle_images = []
+    for key in sorted((key for key in data_dict if key.isdecimal()), key=int):
+        if not os.path.isfile(os.path.join(base_dir, data_dict[key])):
+            raise ValueError("Tile image doesn't exist.")
+        puzzle_images.append(data_dict[key])
+
+    # the tiles must fill a board within the limits, square by default
+    rows = columns = int(round(len(puzzle_images) ** 0.5))
+    if data_dict.get("rows", "").isdecimal():
+        rows = int(data_dict["rows"])
+        columns = len(puzzle_images) // rows
+    if data_dict.get("columns", "").isdecimal():
+        columns = int(data_dict["columns"])
+    if rows * columns != len(puzzle_images) or \
+            not config.PUZZLE_MIN_GRID <= rows <= config.PUZZLE_MAX_GRID or \
+            not config.PUZZLE_MIN_GRID <= columns <= config.PUZZLE_MAX_GRID:
+        raise ValueError(f"Only {len(puzzle_images)} tiles found. "
+                         f"Not a valid puzzle.")
+    data_dict["rows"] = rows
+    data_dict["columns"] = columns
+
+    if not data_dict.get("size", "").isdecimal():
+        raise ValueError("Tile size is missing.")
+    data_dict["size"] = int(data_dict["size"])
+    data_dict["images"] = puzzle_images
+    return data_dict
+
+
+def write_puzzle(game_path, name, tile_size, thumbnail, puzzle_images,
+                 rows, columns, extra=None):
+    """
+    Function -- write_puzzle
+        Writes the information of a puzzle to a .puz file
+    Parameters:
+        game_path(str) -- the path of the .puz file to write
+        name(str) -- the name of the puzzle
+        tile_size(int) -- the size of the tiles in pixels
+        thumbnail(str) -- the path to the thumbnail image
+        puzzle_images(list) -- the tile image paths in solved order with
+            the blank tile last
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        extra(dict) -- additional meta data to store in the file
+    """
+    lines = [f"name: {name}",
+             f"number: {len(puzzle_images)}",
+             f"size: {tile_size}",
+             f"thumbnail: {thumbnail}",
+             f"rows: {rows}",
+             f"columns: {columns}"]
+    for key, value in (extra or {}).items():
+        lines.append(f"{key}: {value}")
+    for index, puzzle_image in enumerate(puzzle_images):
+        lines.append(f"{index + 1}: {puzzle_image}")
+    with open(game_path, "w") as outfile:
+        outfile.write("\n".join(lines) + "\n")
+
+
+def find_blank(puzzle_images):
+    """
+    Function -- find_blank
+        Finds the blank tile among the tile images of a puzzle
+    Parameters:
+        puzzle_images(list) -- the tile image paths in solved order
+    Returns an integer with the number of the first tile whose image is
+        named blank, or of the last tile if none is
+    """
+    for index, puzzle_image in enumerate(puzzle_images):
+        if "blank" in puzzle_image:
+            return index
+    return len(puzzle_images) - 1
+
+
+def read_shapes(directory="."):
+    """
+    Function -- read_shapes
+        Reads the board shapes of all the valid puzzles of a directory,
+        logging the ones that can't be read
+    Parameters:
+        directory(str) -- the game directory with the .puz files
+    Returns a dictionary mapping each puzzle name to a tuple of its number
+        of rows and columns and the number of its blank tile
+    """
+    shapes = {}
+    for file in sorted(os.listdir(directory)):
+        if not file.endswith(".puz"):
+            continue
+        try:
+            data_dict = read_puzzle(os.path.join(directory, file), directory)
+        except (OSError, ValueError) as err:
+            logging.error(f"{file}: {err}",
+                          extra={"puzzle": file, "event": "load_failed"})
+            continue
+        shapes[os.path.splitext(file)[0]] = \
+            (data_dict["rows"], data_dict["columns"],
+             find_blank(data_dict["images"]))
+    return shapes
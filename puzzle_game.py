@@ -11,17 +11,28 @@ finish the puzzles within the maximum number of moves, they win
 the game and their name and score will be written into the
 leaderboard file for display. Users can also see how many moves
 they have already made on the game window.
+
+With --daily, every player gets the same board of the day, and with
+--seed and --moves players can share any board. With --difficulty, the
+move limit of each board is taken from the calibration made by
+calibrate.py for the size of the board.
+
+Usage: python puzzle_game.py [--daily | --seed N]
+                             [--moves N | --difficulty LEVEL]
 """
+import argparse
 import logging
 import os
 import turtle
 
 import config
+import puzzle_log
 import utils
+from GameSession import daily_seed
 from PuzzleGame import PuzzleGame
 
 
-def play_game():
+def play_game(seed=None, move_limit=0, difficulty=None):
     """
     Function - play_game
         Configures the resources that will be used during the game,
@@ -30,10 +41,15 @@ def play_game():
         instance where the game will be drawn, registering the
         images that will be used by the game to the screen, checking
         the leaderboard file. Then starts the game
+    Parameters:
+        seed(int) -- the seed every board is scrambled with, random
+            boards when not given
+        move_limit(int) -- the move limit, asked for when not given
+        difficulty(str) -- the difficulty setting the move limit of each
+            board, if any
     """
-    # configure the log file path and logging format
-    logging.basicConfig(filename=config.ERROR_LOG,
-                        format=config.LOG_FORMAT)
+    # log errors through a queue, so the game never waits for the log file
+    puzzle_log.setup_logging()
 
     # create　a screen instance and set up screen size
     screen = turtle.Screen()
@@ -54,6 +70,9 @@ def play_game():
 
     # create a puzzle game instance and start game
     puzzle_game = PuzzleGame(painter, screen)
+    puzzle_game.set_seed(seed)
+    puzzle_game.set_move(move_limit)
+    puzzle_game.set_difficulty(difficulty)
     puzzle_game.start_game()
 
 
@@ -68,7 +87,8 @@ def check_leader_board():
     if not os.path.exists(config.LEADER_BOARD_PATH):
         # display an error to the user and log the error
         utils.display_msg(config.LEADERBOARD_ERR)
-        logging.error("Leader file doesn't exist. Creating one.")
+        logging.error("Leader file doesn't exist. Creating one.",
+                      extra={"event": "no_leaderboard"})
 
         # create a leaderboard file at the configured path
         leader_file = open(config.LEADER_BOARD_PATH, "w")
@@ -100,7 +120,27 @@ def main():
     """
     Program entry point
     """
-    play_game()
+    parser = argparse.ArgumentParser(description="Play the sliding puzzle "
+                                                 "game.")
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--daily", action="store_true",
+                       help="play the daily challenge")
+    group.add_argument("--seed", type=int, help="seed of the boards")
+    limit = parser.add_mutually_exclusive_group()
+    limit.add_argument("--moves", type=int, default=0,
+                       help="move limit, asked for when not given")
+    limit.add_argument("--difficulty", choices=config.DIFFICULTY_LEVELS,
+                       help="difficulty setting the move limit of each "
+                            "board")
+    args = parser.parse_args()
+
+    # everyone playing the daily challenge gets the same boards
+    if args.daily and not args.difficulty:
+        play_game(daily_seed(), args.moves or config.DAILY_MOVE_LIMIT)
+    elif args.daily:
+        play_game(daily_seed(), difficulty=args.difficulty)
+    else:
+        play_game(args.seed, args.moves, args.difficulty)
 
 
 if __name__ == "__main__":
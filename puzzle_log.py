@@ -0,0 +1,84 @@
+"""
+Sets up the error log of the game and the services.
+
+Records are put on a queue by the thread that logs them, which never waits
+for the disk, and written by a listener thread to a log file that is
+rotated once it reaches LOG_MAX_BYTES. The repeats of a message within
+LOG_REPEAT_WINDOW seconds are dropped and counted. Every line is a JSON
+object with the time, message and location of the record and the
+structured fields puzzle, session, event and repeats, which callers fill
+in with the extra argument of the logging functions, such as
+logging.error(message, extra={"puzzle": name, "event": "load"}). Fields
+left out are null, except the session, which is the session of the
+process unless the caller names one, such as a player connection of a
+server.
+"""
+import atexit
+import logging
+import logging.handlers
+import itertools
+import queue
+import uuid
+
+from Jsonformatter import Jsonformatter
+from Jsonformatter import keep_traceback
+from Repeatfilter import Repeatfilter
+import config
+
+# the session of the lines logged without one, a new one for each run
+SESSION = uuid.uuid4().hex[:12]
+
+# the listener writing the queued records, once logging is set up
+LISTENER = None
+
+# the numbers of the connections of a server, for their sessions
+CONNECTIONS = itertools.count(1)
+
+
+def setup_logging(path=None, session=None):
+    """
+    Function -- setup_logging
+        Routes the records of the root logger through a queue to the
+        rotating log file. Setting up logging again does nothing
+    Parameters:
+        path(str) -- the path to the log file, the configured one when not
+            given
+        session(str) -- the session of the lines logged without one, a
+            new one when not given
+    Returns the QueueListener writing the records
+    """
+    global LISTENER
+    if LISTENER is not None:
+        return LISTENER
+
+    # the file is only opened once there is something to write
+    handler = logging.handlers.RotatingFileHandler(
+        path or config.ERROR_LOG, maxBytes=config.LOG_MAX_BYTES,
+        backupCount=config.LOG_BACKUPS, encoding="utf-8", delay=True)
+    handler.setFormatter(Jsonformatter(
+        {"puzzle": None, "session": session or SESSION, "event": None,
+         "repeats": 0}))
+    # the repeats are dropped in the listener thread, off the game's thread
+    handler.addFilter(Repeatfilter())
+
+    records = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(records)
+    queue_handler.addFilter(keep_traceback)
+    logging.getLogger().addHandler(queue_handler)
+    LISTENER = logging.handlers.QueueListener(records, handler,
+                                              respect_handler_level=True)
+    LISTENER.start()
+    # write the records still queued when the program ends
+    atexit.register(LISTENER.stop)
+    return LISTENER
+
+
+def new_session():
+    """
+    Function -- new_session
+        Names the session of a new connection to a server, so the lines of
+        its players can be told apart
+    Returns a string with the session of the process and the number of
+        the connection
+    """
+    return f"{SESSION}-{next(CONNECTIONS)}"
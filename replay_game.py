@@ -0,0 +1,114 @@
+"""
+Replays recorded sliding puzzle games.
+
+Every game played is appended to the replay file (REPLAY_PATH in
+config.py) as a compact record of its scramble seed and moves. This program
+shows one of the recorded games in the game window at a chosen speed, or,
+with --list or --scan, replays all of them without graphics and prints
+their results or only the totals. The file is read as a stream, so it can
+be of any size.
+
+Usage: python replay_game.py [FILE] [--index N] [--speed MOVES_PER_SECOND]
+                              [--list | --scan]
+"""
+import argparse
+import collections
+import itertools
+import time
+
+from GameSession import replay
+import Movelog
+import config
+
+
+def list_replays(path, verbose=True):
+    """
+    Function -- list_replays
+        Replays all the recorded games without graphics and prints the
+        number of games of each result, with the number of moves replayed
+        per second
+    Parameters:
+        path(str) -- the path to the replay file
+        verbose(bool) -- whether to print the result of every game too
+    """
+    results = collections.Counter()
+    moves = 0
+    start = time.perf_counter()
+    for index, log in enumerate(Movelog.read_logs(path)):
+        session = replay(log)
+        result = session.get_status()
+        if session.get_moves() < log.count:
+            result = "invalid"
+        if verbose:
+            print(f"{index}: {log.player or 'anonymous'} played "
+                  f"{log.puzzle} ({log.rows}x{log.columns}), {log.count} of "
+                  f"{log.move_limit} moves, {result}")
+        results[result] += 1
+        moves += log.count
+    elapsed = time.perf_counter() - start
+    print(", ".join(f"{count} {result}"
+                    for result, count in sorted(results.items())) or
+          "no games")
+    print(f"{moves} moves replayed in {elapsed:.3f} s, "
+          f"{moves / max(elapsed, 1e-9):.0f} per second")
+
+
+def show_replay(path, index, speed):
+    """
+    Function -- show_replay
+        Shows a recorded game in the game window
+    Parameters:
+        path(str) -- the path to the replay file
+        index(int) -- the number of the game in the file, counted from
+            the end when negative
+        speed(float) -- the number of moves to show per second
+    """
+    # keep only the games needed to find the one to show
+    if index >= 0:
+        log = next(itertools.islice(Movelog.read_logs(path), index, None),
+                   None)
+    else:
+        kept = collections.deque(Movelog.read_logs(path), maxlen=-index)
+        log = kept[0] if len(kept) == -index else None
+    if log is None:
+        raise SystemExit(f"There is no game {index} in {path}.")
+
+    # only the window needs turtle
+    import turtle
+    from PuzzleGame import PuzzleGame
+    from puzzle_game import load_resources
+    screen = turtle.Screen()
+    screen.setup(config.SCREEN_WIDTH, config.SCREEN_LENGTH)
+    painter = turtle.Turtle()
+    painter.hideturtle()
+    for resource in load_resources():
+        screen.addshape(resource)
+    PuzzleGame(painter, screen).start_replay(log, speed)
+    turtle.mainloop()
+
+
+def main():
+    """
+    Program entry point
+    """
+    parser = argparse.ArgumentParser(description="Replay recorded games.")
+    parser.add_argument("path", nargs="?", default=config.REPLAY_PATH,
+                        help="replay file")
+    parser.add_argument("--index", type=int, default=-1,
+                        help="game to show, the last one by default")
+    parser.add_argument("--speed", type=float, default=config.REPLAY_SPEED,
+                        help="moves shown per second")
+    parser.add_argument("--list", action="store_true",
+                        help="replay all the games without graphics")
+    parser.add_argument("--scan", action="store_true",
+                        help="like --list, printing only the totals")
+    args = parser.parse_args()
+
+    if args.list or args.scan:
+        list_replays(args.path, args.list)
+    else:
+        show_replay(args.path, args.index, args.speed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,531 @@
+"""
+Optimal solver for sliding puzzle boards.
+
+A board is given as the tile numbers of its cells, row by row, where every
+tile's number is the cell it has in the solved puzzle, the way a
+GameSession keeps them. The solver runs IDA*, a depth-first search whose
+depth bound is raised to the next smallest estimate after every pass, with
+the Manhattan distance plus linear conflicts as the estimate. Both are
+updated for the one tile each move slides, so a node costs a few table
+lookups. Solutions are lists of blank move codes, 0 up, 1 down, 2 left and
+3 right, which GameSession.move_blank and Movelog take as they are.
+
+Two more engines are kept for the solver portfolio: a bidirectional
+breadth-first search, also optimal, which is quick on boards a few moves
+from solved but keeps every board it reaches, and a weighted A*, which
+trusts the estimate more than the moves made so far and finds a solution
+at most weight times the shortest, usually much sooner.
+"""
+import heapq
+import math
+import time
+
+from Puzzleboard import Puzzleboard
+
+# the linear conflicts of the lines seen so far, by their tiles' positions
+CONFLICTS = {}
+
+
+def check_board(tiles, rows, columns, blank_tile):
+    """
+    Function -- check_board
+        Checks that a board holds every tile once and can be solved
+    Parameters:
+        tiles(list) -- the tile numbers of the cells, row by row
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        blank_tile(int) -- the number of the blank tile
+    Raises ValueError if the board isn't a valid board or can't be solved
+    """
+    count = rows * columns
+    if sorted(tiles) != list(range(count)):
+        raise ValueError(f"The board doesn't hold the {count} tiles of a "
+                         f"{rows}x{columns} puzzle.")
+    if not 0 <= blank_tile < count:
+        raise ValueError("The blank tile is not on the board.")
+
+    # every move swaps the blank tile with a neighbour, changing both the
+    # parity of the tile order and of the blank tile's distance from home
+    seen = [False] * count
+    swaps = 0
+    for start in range(count):
+        length = 0
+        cell = start
+        while not seen[cell]:
+            seen[cell] = True
+            cell = tiles[cell]
+            length += 1
+        swaps += max(length - 1, 0)
+    blank = tiles.index(blank_tile)
+    distance = abs(blank // columns - blank_tile // columns) + \
+        abs(blank % columns - blank_tile % columns)
+    if swaps % 2 != distance % 2:
+        raise ValueError("The board can't be solved.")
+
+
+def line_conflict(goals):
+    """
+    Function -- line_conflict
+        Counts the tiles that must leave a row or column to let the others
+        pass each other, which is the length of the line less its longest
+        run of tiles already in order
+    Parameters:
+        goals(tuple) -- the solved positions along the line of the tiles
+            that belong in the line, in the order they are in
+    Returns an integer with the number of tiles
+    """
+    if goals in CONFLICTS:
+        return CONFLICTS[goals]
+    # the longest increasing subsequence, by the smallest end of each length
+    ends = []
+    for goal in goals:
+        low, high = 0, len(ends)
+        while low < high:
+            middle = (low + high) // 2
+            if ends[middle] < goal:
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(ends):
+            ends.append(goal)
+        else:
+            ends[low] = goal
+    CONFLICTS[goals] = len(goals) - len(ends)
+    return CONFLICTS[goals]
+
+
+def estimate(tiles, rows, columns, blank_tile):
+    """
+    Function -- estimate
+        Estimates the number of moves a board needs, never more than the
+        fewest it can be solved in
+    Parameters:
+        tiles(list) -- the tile numbers of the cells, row by row
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        blank_tile(int) -- the number of the blank tile
+    Returns an integer with the Manhattan distance plus two moves for each
+        tile in a linear conflict
+    """
+    total = 0
+    for cell, tile in enumerate(tiles):
+        if tile != blank_tile:
+            total += abs(cell // columns - tile // columns) + \
+                abs(cell % columns - tile % columns)
+    for row in range(rows):
+        total += 2 * row_conflict(tiles, row, columns, blank_tile)
+    for column in range(columns):
+        total += 2 * column_conflict(tiles, column, rows, columns,
+                                     blank_tile)
+    return total
+
+
+def row_conflict(tiles, row, columns, blank_tile):
+    """
+    Function -- row_conflict
+        Counts the linear conflicts of a row
+    Parameters:
+        tiles(list) -- the tile numbers of the cells, row by row
+        row(int) -- the row
+        columns(int) -- the number of columns of the board
+        blank_tile(int) -- the number of the blank tile
+    Returns an integer with the number of tiles that must leave the row
+    """
+    start = row * columns
+    return line_conflict(tuple(tile % columns
+                               for tile in tiles[start:start + columns]
+                               if tile // columns == row and
+                               tile != blank_tile))
+
+
+def column_conflict(tiles, column, rows, columns, blank_tile):
+    """
+    Function -- column_conflict
+        Counts the linear conflicts of a column
+    Parameters:
+        tiles(list) -- the tile numbers of the cells, row by row
+        column(int) -- the column
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        blank_tile(int) -- the number of the blank tile
+    Returns an integer with the number of tiles that must leave the column
+    """
+    return line_conflict(tuple(tile // columns
+                               for tile in tiles[column::columns]
+                               if tile % columns == column and
+                               tile != blank_tile))
+
+
+def solve(tiles, rows, columns, blank_tile=None, time_limit=None,
+          node_limit=None):
+    """
+    Function -- solve
+        Finds a shortest solution of a board with IDA*
+    Parameters:
+        tiles(list) -- the tile numbers of the cells, row by row
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        blank_tile(int) -- the number of the blank tile, the last one when
+            not given
+        time_limit(float) -- the seconds to search for, no limit when not
+            given
+        node_limit(int) -- the boards to look at, no limit when not given
+    Returns a list of the blank move codes of the solution, or None if a
+        limit was reached first
+    Raises ValueError if the board isn't valid or can't be solved
+    """
+    return search_board(tiles, rows, columns, blank_tile, time_limit,
+                        node_limit)[0]
+
+
+def search_board(tiles, rows, columns, blank_tile=None, time_limit=None,
+                 node_limit=None):
+    """
+    Function -- search_board
+        Runs IDA* on a board, keeping the depth bound it got to if a limit
+        stops it, since every bound passed is a number of moves the board
+        can't be solved in
+    Parameters:
+        tiles(list) -- the tile numbers of the cells, row by row
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        blank_tile(int) -- the number of the blank tile, the last one when
+            not given
+        time_limit(float) -- the seconds to search for, no limit when not
+            given
+        node_limit(int) -- the boards to look at, no limit when not given
+    Returns a tuple of a list of the blank move codes of the solution, or
+        None if a limit was reached first, and the fewest moves the board
+        may be solved in, which is the length of the solution when found
+    Raises ValueError if the board isn't valid or can't be solved
+    """
+    count = rows * columns
+    if blank_tile is None:
+        blank_tile = count - 1
+    cells = list(tiles)
+    check_board(cells, rows, columns, blank_tile)
+    board = Puzzleboard()
+    board.set_dimensions(rows, columns)
+    steps = board.blank_steps()
+    # the Manhattan distance of each tile from each cell
+    distance = [[0 if tile == blank_tile else
+                 abs(cell // columns - tile // columns) +
+                 abs(cell % columns - tile % columns)
+                 for cell in range(count)] for tile in range(count)]
+    row_of = [cell // columns for cell in range(count)]
+    column_of = [cell % columns for cell in range(count)]
+    row_conflicts = [row_conflict(cells, row, columns, blank_tile)
+                     for row in range(rows)]
+    column_conflicts = [column_conflict(cells, column, rows, columns,
+                                        blank_tile)
+                        for column in range(columns)]
+    deadline = None if time_limit is None else \
+        time.monotonic() + time_limit
+    path = []
+    nodes = 0
+    bound = next_bound = 0
+
+    def search(blank, moves, remaining, previous):
+        nonlocal nodes, next_bound
+        total = moves + remaining
+        if total > bound:
+            next_bound = min(next_bound, total)
+            return False
+        if remaining == 0:
+            return True
+        nodes += 1
+        # look at the limits now and then, the clock is slow to read
+        if nodes & 0x3fff == 0:
+            if node_limit is not None and nodes >= node_limit or \
+                    deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError("The search limit was reached.")
+        for code in (0, 1, 2, 3):
+            # never take back the move just made
+            if code == previous ^ 1:
+                continue
+            other = steps[code][blank]
+            if other < 0:
+                continue
+            tile = cells[other]
+            cells[blank] = tile
+            cells[other] = blank_tile
+            change = distance[tile][blank] - distance[tile][other]
+            # only the lines the tile leaves or enters can change, and
+            # only if it belongs in one of them
+            saved = None
+            if code < 2:
+                home = tile // columns
+                if home == row_of[other] or home == row_of[blank]:
+                    line = row_of[other] if home == row_of[other] \
+                        else row_of[blank]
+                    saved = (row_conflicts, line, row_conflicts[line])
+                    row_conflicts[line] = row_conflict(cells, line, columns,
+                                                       blank_tile)
+            else:
+                home = tile % columns
+                if home == column_of[other] or home == column_of[blank]:
+                    line = column_of[other] if home == column_of[other] \
+                        else column_of[blank]
+                    saved = (column_conflicts, line, column_conflicts[line])
+                    column_conflicts[line] = column_conflict(
+                        cells, line, rows, columns, blank_tile)
+            if saved is not None:
+                change += 2 * (saved[0][line] - saved[2])
+            path.append(code)
+            if search(other, moves + 1, remaining + change, code):
+                return True
+            path.pop()
+            if saved is not None:
+                saved[0][line] = saved[2]
+            cells[other] = tile
+            cells[blank] = blank_tile
+        return False
+
+    remaining = estimate(cells, rows, columns, blank_tile)
+    bound = remaining
+    try:
+        while True:
+            next_bound = math.inf
+            if search(cells.index(blank_tile), 0, remaining, -2):
+                return path, len(path)
+            bound = next_bound
+    except TimeoutError:
+        return None, bound
+
+
+def bidirectional_search(tiles, rows, columns, blank_tile=None,
+                         time_limit=None, node_limit=None):
+    """
+    Function -- bidirectional_search
+        Finds a shortest solution of a board with a breadth-first search
+        from both the board and the solved board, always growing the side
+        with fewer boards, until the two meet
+    Parameters:
+        tiles(list) -- the tile numbers of the cells, row by row
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        blank_tile(int) -- the number of the blank tile, the last one when
+            not given
+        time_limit(float) -- the seconds to search for, no limit when not
+            given
+        node_limit(int) -- the boards to keep, no limit when not given
+    Returns a list of the blank move codes of the solution, or None if a
+        limit was reached first
+    Raises ValueError if the board isn't valid or can't be solved
+    """
+    count = rows * columns
+    if blank_tile is None:
+        blank_tile = count - 1
+    check_board(list(tiles), rows, columns, blank_tile)
+    board = Puzzleboard()
+    board.set_dimensions(rows, columns)
+    steps = board.blank_steps()
+    deadline = None if time_limit is None else \
+        time.monotonic() + time_limit
+    start = bytes(tiles)
+    goal = bytes(range(count))
+    if start == goal:
+        return []
+    # each board seen by the board it was reached from and the code of
+    # the move towards the solved board between them
+    sides = [{start: None}, {goal: None}]
+    frontiers = [[start], [goal]]
+
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        seen, other_seen = sides[side], sides[1 - side]
+        layer = []
+        meetings = []
+        for state in frontiers[side]:
+            blank = state.index(blank_tile)
+            for code in (0, 1, 2, 3):
+                other = steps[code][blank]
+                if other < 0:
+                    continue
+                cells = bytearray(state)
+                cells[blank], cells[other] = cells[other], blank_tile
+                following = bytes(cells)
+                if following in seen:
+                    continue
+                # the solved side is walked backwards, its moves reversed
+                seen[following] = (state, code if side == 0 else code ^ 1)
+                layer.append(following)
+                if following in other_seen:
+                    meetings.append(following)
+            if deadline is not None and len(layer) & 0xfff == 0 and \
+                    time.monotonic() > deadline:
+                return None
+        if node_limit is not None and \
+                len(sides[0]) + len(sides[1]) > node_limit:
+            return None
+        if meetings:
+            # every meeting of a whole layer is as short as the others
+            # from this side, the shortest of them is a shortest solution
+            paths = [bidirectional_path(sides, meeting)
+                     for meeting in meetings]
+            return min(paths, key=len)
+        frontiers[side] = layer
+    return None
+
+
+def bidirectional_path(sides, meeting):
+    """
+    Function -- bidirectional_path
+        Joins the moves from the board to a meeting board and from there to
+        the solved board
+    Parameters:
+        sides(list) -- the boards seen from the board and from the solved
+            board, each with the board it was reached from and the move
+        meeting(bytes) -- a board seen from both sides
+    Returns a list of the blank move codes of the solution
+    """
+    forward = []
+    state = meeting
+    while sides[0][state] is not None:
+        state, code = sides[0][state]
+        forward.append(code)
+    forward.reverse()
+    state = meeting
+    while sides[1][state] is not None:
+        state, code = sides[1][state]
+        forward.append(code)
+    return forward
+
+
+def weighted_search(tiles, rows, columns, blank_tile=None, weight=2,
+                    time_limit=None, node_limit=None):
+    """
+    Function -- weighted_search
+        Finds a solution of a board with weighted A*, which looks first at
+        the boards whose moves so far plus weight times their estimate are
+        fewest, so the solution found is at most weight times the shortest
+    Parameters:
+        tiles(list) -- the tile numbers of the cells, row by row
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        blank_tile(int) -- the number of the blank tile, the last one when
+            not given
+        weight(float) -- how much more the estimate counts than the moves,
+            1 finding a shortest solution
+        time_limit(float) -- the seconds to search for, no limit when not
+            given
+        node_limit(int) -- the boards to look at, no limit when not given
+    Returns a list of the blank move codes of the solution, or None if a
+        limit was reached first
+    Raises ValueError if the board isn't valid or can't be solved
+    """
+    count = rows * columns
+    if blank_tile is None:
+        blank_tile = count - 1
+    check_board(list(tiles), rows, columns, blank_tile)
+    board = Puzzleboard()
+    board.set_dimensions(rows, columns)
+    steps = board.blank_steps()
+    deadline = None if time_limit is None else \
+        time.monotonic() + time_limit
+    start = bytes(tiles)
+    # the fewest moves each board was reached in, and how
+    reached = {start: (0, None, None)}
+    # the number of each board breaks ties, so boards are never compared
+    queue = [(weight * estimate(start, rows, columns, blank_tile), 0, 0,
+              start)]
+    pushed = 0
+    nodes = 0
+    while queue:
+        _, _, moves, state = heapq.heappop(queue)
+        if reached[state][0] < moves:
+            continue
+        if all(tile == cell for cell, tile in enumerate(state)):
+            codes = []
+            while reached[state][1] is not None:
+                _, state, code = reached[state]
+                codes.append(code)
+            codes.reverse()
+            return codes
+        nodes += 1
+        if nodes & 0x3ff == 0:
+            if node_limit is not None and nodes >= node_limit or \
+                    deadline is not None and time.monotonic() > deadline:
+                return None
+        blank = state.index(blank_tile)
+        for code in (0, 1, 2, 3):
+            other = steps[code][blank]
+            if other < 0:
+                continue
+            cells = bytearray(state)
+            cells[blank], cells[other] = cells[other], blank_tile
+            following = bytes(cells)
+            if following in reached and reached[following][0] <= moves + 1:
+                continue
+            reached[following] = (moves + 1, state, code)
+            pushed += 1
+            heapq.heappush(queue, (moves + 1 + weight * estimate(
+                following, rows, columns, blank_tile), pushed, moves + 1,
+                following))
+    return None
+
+
+def apply_moves(tiles, rows, columns, blank_tile, codes):
+    """
+    Function -- apply_moves
+        Plays blank move codes on a board
+    Parameters:
+        tiles(list) -- the tile numbers of the cells, row by row
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        blank_tile(int) -- the number of the blank tile
+        codes(list) -- the blank move codes to play
+    Returns a list of the tile numbers after the moves
+    Raises ValueError if a move would take the blank tile off the board
+    """
+    board = Puzzleboard()
+    board.set_dimensions(rows, columns)
+    board.set_tiles(list(range(rows * columns)))
+    board.set_board(list(tiles), list(tiles).index(blank_tile))
+    for code in codes:
+        if not board.move_blank(code):
+            raise ValueError("The moves take the blank tile off the board.")
+    return board.cells
+
+
+def canonical_key(tiles, rows, columns, blank_tile):
+    """
+    Function -- canonical_key
+        Makes the key a board and its mirror image across the diagonal
+        share, since one's solution is the other's with up and left, and
+        down and right, swapped. Only square boards whose blank tile
+        belongs on the diagonal have a mirror image that is also a board
+    Parameters:
+        tiles(list) -- the tile numbers of the cells, row by row
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        blank_tile(int) -- the number of the blank tile
+    Returns a tuple of the key string and a boolean telling whether the
+        key is of the mirror image
+    """
+    key = f"{rows}x{columns}:{blank_tile}:" + ",".join(map(str, tiles))
+    if rows != columns or blank_tile // columns != blank_tile % columns:
+        return key, False
+    # the tile at row x and column y of the mirror image is the tile at
+    # row y and column x, numbered by its mirrored solved cell
+    mirror = [tiles[column * columns + row] for row in range(rows)
+              for column in range(columns)]
+    mirror = [tile % columns * columns + tile // columns for tile in mirror]
+    mirror_key = f"{rows}x{columns}:{blank_tile}:" + \
+        ",".join(map(str, mirror))
+    if mirror_key < key:
+        return mirror_key, True
+    return key, False
+
+
+def mirror_codes(codes):
+    """
+    Function -- mirror_codes
+        Turns the solution of a board into the solution of its mirror
+        image across the diagonal
+    Parameters:
+        codes(list) -- the blank move codes
+    Returns a list of the mirrored codes, up and left, and down and right
+        swapped
+    """
+    return [code ^ 2 for code in codes]
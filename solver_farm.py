@@ -0,0 +1,245 @@
+"""
+Solves many sliding puzzle boards at once on a process pool.
+
+Reads a file with one board per line, the tile numbers of its cells row by
+row separated by spaces or commas, numbered by their cells in the solved
+puzzle, the blank tile being the last number unless --blank says
+otherwise. Every board is first looked up in the solution cache, and each
+distinct board that isn't there becomes one task for the process pool, so
+repeated boards are solved once. A task gives up at the time limit, and
+its board is reported as unsolved and not cached. Solutions are stored in
+the cache as they arrive, so an interrupted run keeps what it solved, and
+the tasks not started yet are cancelled. With --random N, N random boards
+are solved instead, to measure how the farm scales with the workers.
+
+Each board is printed as the number of moves of its shortest solution
+followed by the blank moves, U, D, L and R, as "unsolved", or as
+"invalid" with the reason for boards that can't be solved at all.
+
+Usage: python solver_farm.py [FILE] [--rows N] [--columns N] [--blank N]
+                             [--workers N] [--time-limit SECONDS]
+                             [--cache PATH] [--random N] [--seed N]
+"""
+import argparse
+import concurrent.futures
+import math
+import random
+import time
+
+from Solvecache import Solvecache
+import config
+import solver
+
+# the letters of the blank move codes
+LETTERS = "UDLR"
+
+
+def read_boards(path, rows=None, columns=None):
+    """
+    Function -- read_boards
+        Reads the boards of a file, one per line, skipping empty lines and
+        lines starting with #
+    Parameters:
+        path(str) -- the path to the file
+        rows(int) -- the number of rows of the boards, worked out from the
+            first board as a square when not given
+        columns(int) -- the number of columns, the same as the number of
+            rows when not given
+    Returns a tuple of the list of boards, as lists of tile numbers, and
+        the number of rows and columns
+    Raises ValueError if a line doesn't hold a board of that shape
+    """
+    boards = []
+    with open(path) as infile:
+        for number, line in enumerate(infile, 1):
+            line = line.split("#", 1)[0].replace(",", " ").split()
+            if not line:
+                continue
+            try:
+                tiles = [int(tile) for tile in line]
+            except ValueError:
+                raise ValueError(f"Line {number} holds something other "
+                                 f"than tile numbers.") from None
+            if rows is None:
+                rows = math.isqrt(len(tiles))
+            columns = columns or rows
+            if len(tiles) != rows * columns:
+                raise ValueError(f"Line {number} doesn't hold a "
+                                 f"{rows}x{columns} board.")
+            boards.append(tiles)
+    return boards, rows, columns
+
+
+def random_boards(count, rows, columns, blank_tile, seed=None):
+    """
+    Function -- random_boards
+        Makes random boards that can be solved, taken evenly among all of
+        them
+    Parameters:
+        count(int) -- the number of boards
+        rows(int) -- the number of rows of the boards
+        columns(int) -- the number of columns of the boards
+        blank_tile(int) -- the number of the blank tile
+        seed(int) -- the seed of the boards, random ones when not given
+    Returns a list of boards, as lists of tile numbers
+    """
+    rng = random.Random(seed)
+    boards = []
+    for _ in range(count):
+        tiles = list(range(rows * columns))
+        rng.shuffle(tiles)
+        try:
+            solver.check_board(tiles, rows, columns, blank_tile)
+        except ValueError:
+            # swapping two tiles other than the blank one fixes the parity
+            first, second = [index for index, tile in enumerate(tiles)
+                             if tile != blank_tile][:2]
+            tiles[first], tiles[second] = tiles[second], tiles[first]
+        boards.append(tiles)
+    return boards
+
+
+def solve_task(tiles, rows, columns, blank_tile, time_limit):
+    """
+    Function -- solve_task
+        Solves one board, in a worker process
+    Parameters:
+        tiles(list) -- the tile numbers of the cells, row by row
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        blank_tile(int) -- the number of the blank tile
+        time_limit(float) -- the seconds to search for
+    Returns a tuple of the solution codes, or None if the time ran out,
+        and the seconds the search took
+    """
+    start = time.perf_counter()
+    codes = solver.solve(tiles, rows, columns, blank_tile, time_limit)
+    return codes, time.perf_counter() - start
+
+
+def solve_boards(boards, rows, columns, blank_tile, cache, workers=None,
+                 time_limit=None):
+    """
+    Function -- solve_boards
+        Solves boards on a process pool, taking the solutions found before
+        from the cache and storing the new ones in it
+    Parameters:
+        boards(list) -- the boards, as lists of tile numbers
+        rows(int) -- the number of rows of the boards
+        columns(int) -- the number of columns of the boards
+        blank_tile(int) -- the number of the blank tile
+        cache(Solvecache) -- the solutions found before
+        workers(int) -- the number of processes, one per CPU when not given
+        time_limit(float) -- the seconds each board may take, the
+            configured limit when not given
+    Returns a tuple of a list with the solution codes of each board, None
+        for the boards that weren't solved, or a string with the reason a
+        board is invalid, and a dictionary counting the distinct boards
+        found in the cache, solved, unsolved and invalid
+    """
+    time_limit = time_limit or config.SOLVER_TIME_LIMIT
+    found = {}
+    counts = {"cached": 0, "solved": 0, "unsolved": 0, "invalid": 0}
+    missing = []
+    # check every distinct board once before starting any process
+    for tiles in boards:
+        board = tuple(tiles)
+        if board in found:
+            continue
+        try:
+            solver.check_board(tiles, rows, columns, blank_tile)
+        except ValueError as err:
+            found[board] = str(err)
+            counts["invalid"] += 1
+            continue
+        found[board] = cache.get(tiles, rows, columns, blank_tile)
+        if found[board] is None:
+            missing.append(board)
+        else:
+            counts["cached"] += 1
+
+    if missing:
+        pool = concurrent.futures.ProcessPoolExecutor(workers)
+        try:
+            tasks = {pool.submit(solve_task, list(board), rows, columns,
+                                 blank_tile, time_limit): board
+                     for board in missing}
+            for task in concurrent.futures.as_completed(tasks):
+                codes, seconds = task.result()
+                board = tasks[task]
+                found[board] = codes
+                if codes is None:
+                    counts["unsolved"] += 1
+                    continue
+                counts["solved"] += 1
+                cache.put(list(board), rows, columns, blank_tile, codes,
+                          seconds)
+        finally:
+            # drop the tasks not started yet if the run is interrupted
+            pool.shutdown(cancel_futures=True)
+    return [found[tuple(tiles)] for tiles in boards], counts
+
+
+def main():
+    """
+    Program entry point
+    """
+    parser = argparse.ArgumentParser(description="Solve many boards on a "
+                                                 "process pool.")
+    parser.add_argument("path", nargs="?", help="file of boards")
+    parser.add_argument("--rows", type=int,
+                        help="rows of the boards, square boards by default")
+    parser.add_argument("--columns", type=int)
+    parser.add_argument("--blank", type=int,
+                        help="number of the blank tile, the last by default")
+    parser.add_argument("--workers", type=int, default=config.SOLVER_WORKERS)
+    parser.add_argument("--time-limit", type=float,
+                        default=config.SOLVER_TIME_LIMIT,
+                        help="seconds each board may take")
+    parser.add_argument("--cache", default=config.SOLVER_CACHE_PATH,
+                        help="solution cache database")
+    parser.add_argument("--random", type=int,
+                        help="solve this many random boards instead")
+    parser.add_argument("--seed", type=int, help="seed of the random boards")
+    args = parser.parse_args()
+
+    if args.random:
+        rows = args.rows or 4
+        columns = args.columns or rows
+        blank_tile = rows * columns - 1 if args.blank is None else args.blank
+        boards = random_boards(args.random, rows, columns, blank_tile,
+                               args.seed)
+    elif args.path:
+        try:
+            boards, rows, columns = read_boards(args.path, args.rows,
+                                                args.columns)
+        except (OSError, ValueError) as err:
+            raise SystemExit(str(err))
+        blank_tile = rows * columns - 1 if args.blank is None else args.blank
+    else:
+        parser.error("give a file of boards or --random N")
+
+    cache = Solvecache(args.cache)
+    start = time.perf_counter()
+    try:
+        solutions, counts = solve_boards(boards, rows, columns, blank_tile,
+                                         cache, args.workers, args.time_limit)
+    finally:
+        cache.close()
+    elapsed = time.perf_counter() - start
+
+    for codes in solutions:
+        if codes is None:
+            print("unsolved")
+        elif isinstance(codes, str):
+            print(f"invalid: {codes}")
+        else:
+            print(len(codes), "".join(LETTERS[code] for code in codes))
+    print(f"{len(boards)} boards in {elapsed:.2f} s, of the distinct ones "
+          f"{counts['cached']} cached, {counts['solved']} solved, "
+          f"{counts['unsolved']} unsolved in {args.time_limit:g} s and "
+          f"{counts['invalid']} invalid")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Boards for the tests of the solvers.
+"""
+from GameSession import GameSession
+import solver
+
+
+def scrambled(rows, columns, moves, seed, blank_tile=None):
+    """
+    Function -- scrambled
+        Makes a board scrambled the way a game is
+    Parameters:
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        moves(int) -- the number of scramble moves
+        seed(int) -- the seed of the scramble
+        blank_tile(int) -- the number of the blank tile, the last one when
+            not given
+    Returns a list of the tile numbers and the number of the blank tile
+    """
+    session = GameSession(rows, columns)
+    session.new_board(rows, columns, blank_tile)
+    session.scramble(moves, seed)
+    return session.get_state(), session.get_blank_tile()
+
+
+def is_solution(tiles, rows, columns, blank_tile, codes):
+    """
+    Function -- is_solution
+        Tells whether some moves solve a board
+    Parameters:
+        tiles(list) -- the tile numbers of the cells, row by row
+        rows(int) -- the number of rows of the board
+        columns(int) -- the number of columns of the board
+        blank_tile(int) -- the number of the blank tile
+        codes(list) -- the blank move codes
+    Returns a boolean indicating whether the board ends up solved
+    """
+    end = solver.apply_moves(tiles, rows, columns, blank_tile, codes)
+    return list(end) == list(range(rows * columns))
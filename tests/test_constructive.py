@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from GameSession import GameSession
+import constructive
+import solver
+
+SHAPES = [(2, 2), (2, 5), (5, 2), (3, 4), (4, 6), (6, 3), (7, 7), (10, 10)]
+
+
+@pytest.mark.parametrize("rows, columns", SHAPES)
+def test_solutions_solve_boards_with_blank_anywhere(rows, columns):
+    rng = random.Random(rows * 100 + columns)
+    for _ in range(5):
+        blank_tile = rng.randrange(rows * columns)
+        session = GameSession(rows, columns)
+        session.new_board(rows, columns, blank_tile)
+        session.scramble(rows * columns * 20, rng.getrandbits(32))
+        tiles = session.get_state()
+        codes = constructive.solve(tiles, rows, columns, blank_tile)
+        end = solver.apply_moves(tiles, rows, columns, blank_tile, codes)
+        assert list(end) == list(range(rows * columns))
+        # moves that undo the move before them are dropped
+        assert all(code != previous ^ 1
+                   for previous, code in zip(codes, codes[1:]))
+
+
+def test_solve_board_reads_a_session_board():
+    session = GameSession(5, 4)
+    session.scramble(300, 7)
+    board = session.get_board()
+    for code in constructive.solve_board(board):
+        assert board.move_blank(code)
+    assert board.is_solved()
+
+
+def test_solved_board_needs_no_moves():
+    assert constructive.solve(list(range(12)), 3, 4) == []
+
+
+def test_unsolvable_board_is_refused():
+    tiles = list(range(12))
+    tiles[0], tiles[1] = tiles[1], tiles[0]
+    with pytest.raises(ValueError):
+        constructive.solve(tiles, 3, 4)
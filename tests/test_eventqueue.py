@@ -0,0 +1,112 @@
+import pytest
+
+from Eventqueue import Eventqueue
+
+
+class Clock:
+    """
+    Class: Clock
+    This class stands in for the screen, keeping the timers set on it
+    until they are run by hand, as the Tk event loop would
+    ---
+    Attributes:
+        timers(list) -- the functions waiting to run
+    """
+    def __init__(self):
+        """
+        Method -- __init__
+            The constructor of the class, creates Clock instances
+        """
+        self.timers = []
+
+    def ontimer(self, function, delay):
+        """
+        Method -- ontimer
+            Keeps a function to run later
+        """
+        self.timers.append(function)
+
+    def tick(self):
+        """
+        Method -- tick
+            Runs the timers set so far, and the ones they set
+        """
+        while self.timers:
+            self.timers.pop(0)()
+
+
+def test_events_are_handled_in_order():
+    clock = Clock()
+    events = Eventqueue(clock, 10)
+    done = []
+    for number in range(3):
+        assert events.post(("tile", number),
+                           lambda number=number: done.append(number))
+    # nothing runs inside the click itself, and one timer runs them all
+    assert done == [] and len(clock.timers) == 1
+    clock.tick()
+    assert done == [0, 1, 2]
+    assert events.handled == 3
+
+
+def test_waiting_clicks_are_coalesced_and_extra_ones_dropped():
+    clock = Clock()
+    events = Eventqueue(clock, 3)
+    done = []
+    click = events.listener(("tile", 1), lambda: done.append("tile"))
+    key = events.listener(None, lambda: done.append("key"))
+    click(10, 20)
+    click(11, 21)
+    key()
+    key()
+    key()
+    clock.tick()
+    assert done == ["tile", "key", "key"]
+    assert (events.coalesced, events.dropped) == (1, 1)
+    # once handled, the same click counts again
+    click(0, 0)
+    clock.tick()
+    assert done[-1] == "tile"
+
+
+def test_handlers_never_run_inside_each_other():
+    clock = Clock()
+    events = Eventqueue(clock, 10)
+    done = []
+
+    def dialog():
+        """
+        Function -- dialog
+            Takes a click and lets the event loop run, as a dialog does
+        """
+        done.append("dialog opened")
+        events.post(("tile", 2), lambda: done.append("tile"))
+        clock.tick()
+        done.append("dialog closed")
+
+    events.post(("button", "load"), dialog)
+    clock.tick()
+    assert done == ["dialog opened", "dialog closed", "tile"]
+
+
+def test_failing_handler_leaves_the_queue_working():
+    clock = Clock()
+    events = Eventqueue(clock, 10)
+    done = []
+
+    def fail():
+        """
+        Function -- fail
+            Fails the way a broken handler does
+        """
+        raise RuntimeError("broken")
+
+    events.post(None, fail)
+    events.post(None, lambda: done.append("after"))
+    with pytest.raises(RuntimeError):
+        clock.tick()
+    assert not events.running
+    # the events left are run by the next event posted
+    events.post(None, lambda: done.append("next"))
+    clock.tick()
+    assert done == ["after", "next"]
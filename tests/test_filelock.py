@@ -0,0 +1,49 @@
+import multiprocessing
+
+import pytest
+
+from Filelock import Filelock
+
+
+def add_under_lock(path, times):
+    """
+    Function -- add_under_lock
+        Adds one to the number in a file many times, each under the lock
+    Parameters:
+        path(str) -- the path to the counter file
+        times(int) -- the number of times to add one
+    """
+    for _ in range(times):
+        with Filelock(path + ".lock"):
+            with open(path) as infile:
+                number = int(infile.read())
+            with open(path, "w") as outfile:
+                outfile.write(str(number + 1))
+
+
+def test_lock_is_exclusive(tmp_path):
+    path = str(tmp_path / "counter.lock")
+    with Filelock(path):
+        with pytest.raises(TimeoutError):
+            Filelock(path, timeout=0.05).acquire()
+    # once released the lock can be taken again
+    lock = Filelock(path, timeout=0.05)
+    lock.acquire()
+    lock.release()
+    lock.release()
+
+
+def test_processes_take_turns(tmp_path):
+    path = str(tmp_path / "counter")
+    with open(path, "w") as outfile:
+        outfile.write("0")
+    processes = [multiprocessing.Process(target=add_under_lock,
+                                         args=(path, 50))
+                 for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+    with open(path) as infile:
+        assert int(infile.read()) == 200
@@ -0,0 +1,169 @@
+import datetime
+import json
+
+import pytest
+
+from GameSession import daily_seed
+from game_server import LINE_LIMIT
+from game_server import Gameconnection
+from game_server import Gameserver
+import config
+
+
+class Wire:
+    """
+    Class: Wire
+    This class stands in for the transport of a connection, keeping what
+    the server writes
+    ---
+    Attributes:
+        data(bytes) -- the bytes written so far
+        closed(bool) -- whether the connection was closed
+    """
+    def __init__(self):
+        """
+        Method -- __init__
+            The constructor of the class, creates Wire instances
+        """
+        self.data = b""
+        self.closed = False
+
+    def write(self, data):
+        """
+        Method -- write
+            Keeps the bytes written
+        """
+        self.data += data
+
+    def close(self):
+        """
+        Method -- close
+            Marks the connection closed
+        """
+        self.closed = True
+
+    def replies(self):
+        """
+        Method -- replies
+            Takes the replies written so far
+        Returns a list of the decoded replies
+        """
+        lines, self.data = self.data.splitlines(), b""
+        return [json.loads(line) for line in lines]
+
+
+def connect(server):
+    """
+    Function -- connect
+        Connects a player to a server
+    Returns a tuple of the Gameconnection and its Wire
+    """
+    connection = Gameconnection(server)
+    wire = Wire()
+    connection.connection_made(wire)
+    return connection, wire
+
+
+def send(connection, wire, *requests):
+    """
+    Function -- send
+        Sends requests on a connection in one piece
+    Returns a list of the decoded replies
+    """
+    connection.data_received(b"".join(json.dumps(request).encode("utf-8") +
+                                      b"\n" for request in requests))
+    return wire.replies()
+
+
+@pytest.fixture
+def server(tmp_path):
+    """
+    Function -- server
+        Makes a server whose only puzzle is a 3x3 mario
+    Returns the Gameserver instance
+    """
+    server = Gameserver(str(tmp_path))
+    server.puzzles = {"mario": (3, 3, 8)}
+    return server
+
+
+def test_same_seed_gives_same_board(server):
+    first, first_wire = connect(server)
+    other, other_wire = connect(server)
+    request = {"op": "new", "puzzle": "mario", "limit": 30, "seed": 7}
+    board = send(first, first_wire, request)[0]
+    assert board["ok"] and board["rows"] == 3 and board["seed"] == 7
+    assert send(other, other_wire, request)[0]["board"] == board["board"]
+    sized = send(other, other_wire, {"op": "new", "rows": 4, "columns": 5,
+                                      "limit": 80})[0]
+    assert (sized["rows"], sized["columns"]) == (4, 5)
+    assert sized["puzzle"] == ""
+
+
+def test_moves_undo_and_jump(server):
+    connection, wire = connect(server)
+    start = send(connection, wire, {"op": "new", "puzzle": "mario",
+                                    "limit": 40, "seed": 3})[0]
+    moves = send(connection, wire, {"op": "move", "target": "up"},
+                 {"op": "move", "target": "left"},
+                 {"op": "move", "target": [0, 0]})
+    moved = [reply["moved"] for reply in moves]
+    played = sum(moved)
+    assert moves[-1]["moves"] == played
+    undo, jump = send(connection, wire, {"op": "undo"},
+                      {"op": "jump", "position": 0})
+    assert undo["moved"] == (played > 0)
+    assert jump["board"] == start["board"]
+    assert jump["status"] == "playing"
+    reset = send(connection, wire, {"op": "reset"})[0]
+    assert reset["board"] == list(range(9))
+
+
+def test_daily_game_is_shared(server):
+    connection, wire = connect(server)
+    reply = send(connection, wire, {"op": "new", "puzzle": "mario",
+                                    "daily": True})[0]
+    assert reply["seed"] == daily_seed()
+    assert reply["limit"] == config.DAILY_MOVE_LIMIT
+    assert daily_seed(datetime.date(2026, 10, 19)) == 20261019
+
+
+@pytest.mark.parametrize("request_", [
+    {"op": "move", "target": "up"},
+    {"op": "new", "puzzle": "zelda", "limit": 30},
+    {"op": "new", "rows": 1, "limit": 30},
+    {"op": "new", "rows": 3, "limit": 0},
+    {"op": "new", "rows": 3, "limit": 1e400},
+    {"op": "new", "rows": 3, "limit": 30, "seed": -1},
+    {"op": "new"},
+    [1, 2]])
+def test_bad_requests_are_refused(server, request_):
+    connection, wire = connect(server)
+    assert send(connection, wire, request_)[0]["ok"] is False
+    assert not wire.closed
+
+
+def test_requests_split_across_packets(server):
+    connection, wire = connect(server)
+    line = json.dumps({"op": "new", "rows": 3, "limit": 20}).encode("utf-8")
+    connection.data_received(line[:10])
+    assert wire.replies() == []
+    connection.data_received(line[10:] + b"\n" + b'{"op": "st')
+    assert wire.replies()[0]["ok"]
+    connection.data_received(b'ate"}\n')
+    assert wire.replies()[0]["moves"] == 0
+
+
+def test_long_lines_and_full_servers_are_cut_off(server, monkeypatch):
+    connection, wire = connect(server)
+    connection.data_received(b"x" * (LINE_LIMIT + 1))
+    assert wire.closed
+    connection.connection_lost(None)
+    assert server.sessions == 0
+
+    monkeypatch.setattr(config, "GAME_SERVER_MAX_SESSIONS", 1)
+    connect(server)
+    _, wire = connect(server)
+    assert wire.closed
+    assert wire.replies()[0]["error"] == "The server is full."
+    assert server.sessions == 1
@@ -0,0 +1,73 @@
+import os
+import random
+
+import pytest
+
+from Gifimage import Gifimage
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def random_image(width, height, colors, seed, transparent=None):
+    """
+    Function -- random_image
+        Makes an image of random pixels
+    Returns the Gifimage instance
+    """
+    rng = random.Random(seed)
+    palette = bytes(rng.randrange(256) for _ in range(3 * colors))
+    pixels = bytes(rng.randrange(colors) for _ in range(width * height))
+    return Gifimage(width, height, palette, pixels, transparent)
+
+
+@pytest.mark.parametrize("width, height, colors", [(1, 1, 2), (7, 3, 3),
+                                                   (40, 30, 16),
+                                                   (98, 98, 256)])
+def test_encode_decode_round_trip(width, height, colors):
+    image = random_image(width, height, colors, width)
+    other = Gifimage.decode(image.encode())
+    assert (other.width, other.height) == (width, height)
+    assert other.pixels == image.pixels
+    assert other.palette[:len(image.palette)] == image.palette
+
+
+def test_transparency_is_kept(tmp_path):
+    path = str(tmp_path / "tile.gif")
+    random_image(5, 5, 4, 1, transparent=3).save(path)
+    assert Gifimage.read(path).transparent == 3
+
+
+def test_tiles_of_the_game_are_read():
+    image = Gifimage.read(os.path.join(ROOT, "Images", "mario", "1.gif"))
+    assert (image.get_width(), image.get_height()) == (98, 98)
+    assert Gifimage.decode(image.encode()).pixels == image.pixels
+
+
+def test_damaged_files_are_refused():
+    data = random_image(30, 30, 16, 2).encode()
+    for cut in (4, 10, 13, len(data) // 2, len(data) - 3):
+        with pytest.raises(ValueError):
+            Gifimage.decode(data[:cut])
+    with pytest.raises(ValueError):
+        Gifimage(0, 5, b"\x00" * 6)
+    with pytest.raises(ValueError):
+        Gifimage(2, 2, b"\x00" * 6, b"\x00")
+
+
+def test_crop_scale_and_paste():
+    image = Gifimage(4, 3, b"\x00" * 6 + b"\xff" * 6, bytes(range(12)))
+    assert image.crop(1, 1, 2, 2).pixels == bytes([5, 6, 9, 10])
+    with pytest.raises(ValueError):
+        image.crop(3, 0, 2, 1)
+    double = image.scale(8, 6)
+    assert double.pixels[:8] == bytes([0, 0, 1, 1, 2, 2, 3, 3])
+    assert double.scale(4, 3).pixels == image.pixels
+    board = Gifimage(4, 3, image.palette)
+    board.paste(Gifimage(2, 2, image.palette, b"\x01" * 4), 3, 2)
+    assert board.pixels == bytes(11) + b"\x01"
+
+
+def test_nearest_color():
+    image = Gifimage(1, 1, bytes([0, 0, 0, 250, 250, 250, 200, 0, 0]))
+    assert image.nearest_color((255, 255, 255)) == 1
+    assert image.nearest_color((180, 30, 20)) == 2
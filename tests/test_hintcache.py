@@ -0,0 +1,72 @@
+from Hintcache import Hintcache
+from boards import scrambled
+import solver
+
+
+def follow(cache, tiles, rows, columns, blank_tile):
+    """
+    Function -- follow
+        Takes the cached hints from a board until the cache has none
+    Returns a list of the move codes taken
+    """
+    codes = []
+    code = cache.get(tiles, rows, columns, blank_tile)
+    while code is not None:
+        codes.append(code)
+        tiles = solver.apply_moves(tiles, rows, columns, blank_tile, [code])
+        code = cache.get(tiles, rows, columns, blank_tile)
+    return codes
+
+
+def mirror(tiles, size):
+    """
+    Function -- mirror
+        Mirrors a square board across its diagonal, numbering the tiles by
+        their mirrored cells
+    Returns a list of the tile numbers
+    """
+    flipped = [tiles[column * size + row] for row in range(size)
+               for column in range(size)]
+    return [tile % size * size + tile // size for tile in flipped]
+
+
+def test_hints_follow_the_solution():
+    tiles, blank_tile = scrambled(3, 3, 40, 1)
+    codes = solver.solve(tiles, 3, 3, blank_tile)
+    cache = Hintcache(100)
+    assert cache.get(tiles, 3, 3, blank_tile) is None
+    cache.put_path(tiles, 3, 3, blank_tile, codes)
+    assert cache.count() == len(codes)
+    assert follow(cache, tiles, 3, 3, blank_tile) == codes
+
+
+def test_mirror_board_gets_the_mirrored_hints():
+    for seed in range(10):
+        tiles, blank_tile = scrambled(3, 3, 40, seed)
+        codes = solver.solve(tiles, 3, 3, blank_tile)
+        cache = Hintcache(100)
+        cache.put_path(tiles, 3, 3, blank_tile, codes)
+        other = mirror(tiles, 3)
+        hints = follow(cache, other, 3, 3, blank_tile)
+        assert hints == solver.mirror_codes(codes)
+        end = solver.apply_moves(other, 3, 3, blank_tile, hints)
+        assert list(end) == list(range(9))
+
+
+def test_boards_used_longest_ago_are_dropped():
+    cache = Hintcache(6)
+    first, blank_tile = scrambled(3, 3, 40, 2)
+    first_codes = solver.solve(first, 3, 3, blank_tile)
+    start = solver.apply_moves(first, 3, 3, blank_tile, first_codes[:-4])
+    cache.put_path(start, 3, 3, blank_tile, first_codes[-4:])
+    # using the start of the path keeps it while newer boards come in
+    assert cache.get(start, 3, 3, blank_tile) == first_codes[-4]
+    other, _ = scrambled(3, 3, 40, 3)
+    other_codes = solver.solve(other, 3, 3, blank_tile)
+    cache.put_path(other, 3, 3, blank_tile, other_codes[:5])
+    assert cache.count() == 6
+    assert cache.get(start, 3, 3, blank_tile) == first_codes[-4]
+    assert cache.get(other, 3, 3, blank_tile) == other_codes[0]
+    # the rest of the first path was dropped
+    after = solver.apply_moves(start, 3, 3, blank_tile, first_codes[-4:-3])
+    assert cache.get(after, 3, 3, blank_tile) is None
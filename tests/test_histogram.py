@@ -0,0 +1,79 @@
+import math
+import random
+
+import pytest
+
+from Histogram import Histogram
+import instrument
+
+
+def test_percentiles_stay_within_the_bucket_size():
+    rng = random.Random(1)
+    values = [int(rng.lognormvariate(12, 2)) for _ in range(20000)]
+    histogram = Histogram(7)
+    for value in values:
+        histogram.record(value)
+    values.sort()
+    for percentile in (1, 50, 90, 99, 99.9, 100):
+        exact = values[max(1, math.ceil(len(values) * percentile / 100)) - 1]
+        assert exact <= histogram.percentile(percentile) <= \
+            exact * (1 + 2 ** -6)
+    assert histogram.mean() == pytest.approx(sum(values) / len(values))
+    assert (histogram.lowest, histogram.highest) == (values[0], values[-1])
+    # the buckets only grow with the powers of two recorded
+    assert len(histogram.counts) <= 64 * 40
+
+
+def test_small_values_are_exact():
+    histogram = Histogram(7)
+    for value in (0, 1, 5, 100, 127):
+        histogram.record(value)
+    assert [histogram.percentile(share) for share in (20, 40, 60, 80)] == \
+        [0, 1, 5, 100]
+
+
+def test_empty_histogram():
+    histogram = Histogram()
+    assert histogram.percentile(50) == 0
+    assert histogram.mean() == 0.0
+
+
+def test_spans_are_timed_when_enabled(tmp_path, monkeypatch):
+    monkeypatch.setattr(instrument, "ENABLED", True)
+    monkeypatch.setattr(instrument, "SPANS", {})
+
+    @instrument.span("test.add")
+    def add(one, other):
+        """
+        Function -- add
+            Adds two numbers in a span
+        """
+        return one + other
+
+    assert add(2, 3) == 5
+    with instrument.timed("test.block"):
+        add(1, 1)
+    assert instrument.SPANS["test.add"].count == 2
+    assert instrument.SPANS["test.block"].count == 1
+    lines = instrument.report()
+    assert len(lines) == 3 and lines[1].split()[:2] == ["test.add", "2"]
+    path = tmp_path / "spans.txt"
+    instrument.dump(str(path))
+    instrument.dump(str(path))
+    assert path.read_text().count("test.block") == 2
+
+
+def test_spans_cost_nothing_when_disabled(monkeypatch):
+    monkeypatch.setattr(instrument, "ENABLED", False)
+    monkeypatch.setattr(instrument, "SPANS", {})
+
+    def add(one, other):
+        """
+        Function -- add
+            Adds two numbers
+        """
+        return one + other
+
+    assert instrument.span("test.add")(add) is add
+    assert instrument.timed("test.block") is instrument.NO_SPAN
+    assert instrument.SPANS == {}
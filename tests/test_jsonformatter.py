@@ -0,0 +1,64 @@
+import io
+import json
+import logging
+import logging.handlers
+import queue
+
+from Jsonformatter import Jsonformatter
+from Jsonformatter import keep_traceback
+
+
+def make_logger(stream, queued=False):
+    """
+    Function -- make_logger
+        Makes a logger of its own writing JSON lines to a stream, through a
+        queue like the game's error log when asked
+    Returns a tuple of the Logger instance and the QueueListener, or None
+    """
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(Jsonformatter({"puzzle": None, "session": "s1",
+                                        "event": None}))
+    logger = logging.getLogger(f"test_jsonformatter.{id(stream)}")
+    logger.propagate = False
+    listener = None
+    if queued:
+        records = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(records)
+        queue_handler.addFilter(keep_traceback)
+        logger.addHandler(queue_handler)
+        listener = logging.handlers.QueueListener(records, handler)
+        listener.start()
+    else:
+        logger.addHandler(handler)
+    return logger, listener
+
+
+def test_lines_hold_the_fields():
+    stream = io.StringIO()
+    logger, _ = make_logger(stream)
+    logger.error("Tile image\ndoesn't exist.",
+                 extra={"puzzle": "mario", "event": "load_failed"})
+    logger.error("Request refused.", extra={"session": "s1-4",
+                                            "puzzle": None})
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 2
+    first, second = (json.loads(line) for line in lines)
+    assert first["message"] == "Tile image\ndoesn't exist."
+    assert (first["puzzle"], first["session"], first["event"]) == \
+        ("mario", "s1", "load_failed")
+    assert first["level"] == "ERROR"
+    assert first["location"] == "test_jsonformatter.test_lines_hold_the_fields"
+    assert (second["puzzle"], second["session"]) == (None, "s1-4")
+
+
+def test_traceback_is_kept_through_the_queue():
+    stream = io.StringIO()
+    logger, listener = make_logger(stream, queued=True)
+    try:
+        {}["missing"]
+    except KeyError:
+        logger.exception("Lookup failed.")
+    listener.stop()
+    line = json.loads(stream.getvalue())
+    assert line["message"] == "Lookup failed."
+    assert "KeyError: 'missing'" in line["traceback"]
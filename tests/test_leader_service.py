@@ -0,0 +1,112 @@
+import asyncio
+import base64
+import json
+
+from GameSession import GameSession
+from leader_service import LINE_LIMIT
+from leader_service import Leaderservice
+import config
+import solver
+
+
+def talk(tmp_path, requests, shapes=None):
+    """
+    Function -- talk
+        Runs the service on a Unix socket and sends it requests from one
+        client
+    Parameters:
+        tmp_path(Path) -- the directory of the socket and the log file
+        requests(list) -- the requests, as JSON values or raw lines
+        shapes(dict) -- the board shape and blank tile of each puzzle
+    Returns a list of the decoded replies
+    """
+    async def run():
+        service = Leaderservice(str(tmp_path / "leaderboard.txt"), shapes)
+        path = str(tmp_path / "service.sock")
+        server = await asyncio.start_unix_server(service.handle, path,
+                                                 limit=LINE_LIMIT)
+        writer_task = asyncio.create_task(service.write_batches())
+        reader, writer = await asyncio.open_unix_connection(path)
+        replies = []
+        for request in requests:
+            if not isinstance(request, bytes):
+                request = json.dumps(request).encode("utf-8") + b"\n"
+            writer.write(request)
+            replies.append(json.loads(await reader.readline()))
+        writer.close()
+        writer_task.cancel()
+        server.close()
+        await server.wait_closed()
+        return replies
+    return asyncio.run(run())
+
+
+def won_replay(seed):
+    """
+    Function -- won_replay
+        Plays a game of mario to the end and encodes its record
+    Parameters:
+        seed(int) -- the seed of the scramble
+    Returns a tuple of the number of moves and the record in base64
+    """
+    session = GameSession(3, 3, 60)
+    session.set_puzzle("mario")
+    session.scramble(60, seed)
+    for code in solver.solve(session.get_state(), 3, 3, 8):
+        session.move_blank(code)
+    log = session.get_log()
+    return log.count, base64.b64encode(log.encode()).decode("ascii")
+
+
+def test_added_scores_are_the_top_ones(tmp_path):
+    replies = talk(tmp_path, [
+        {"op": "version"},
+        {"op": "add", "moves": 30, "name": "ann", "puzzle": "mario"},
+        {"op": "add", "moves": 12, "name": "bob", "puzzle": "mario"},
+        {"op": "add", "moves": 5, "name": "cy", "puzzle": "luigi"},
+        {"op": "top", "count": 5, "puzzle": "mario"},
+        {"op": "top", "count": 1},
+        {"op": "version"}])
+    assert all(reply["ok"] for reply in replies)
+    assert replies[4]["leaders"] == [[12, "bob"], [30, "ann"]]
+    assert replies[5]["leaders"] == [[5, "cy"]]
+    assert replies[0]["version"] != replies[6]["version"]
+
+
+def test_counts_out_of_range_are_refused(tmp_path):
+    replies = talk(tmp_path, [
+        {"op": "add", "moves": 30, "name": "ann"},
+        {"op": "top", "count": -1},
+        {"op": "top", "count": config.LEADER_SERVICE_TOP_MAX + 1},
+        {"op": "top", "count": "many"},
+        {"op": "top", "count": config.LEADER_SERVICE_TOP_MAX}])
+    assert [reply["ok"] for reply in replies] == \
+        [True, False, False, False, True]
+    assert replies[4]["leaders"] == [[30, "ann"]]
+
+
+def test_bad_requests_keep_the_connection(tmp_path):
+    replies = talk(tmp_path, [
+        b"not json\n",
+        {"op": "fly"},
+        {"op": "add", "name": "ann"},
+        {"op": "add", "moves": 1e400, "name": "ann"},
+        [1, 2],
+        {"op": "ping"}])
+    assert [reply["ok"] for reply in replies] == \
+        [False, False, False, False, False, True]
+
+
+def test_scores_are_checked_against_their_game(tmp_path):
+    shapes = {"mario": (3, 3, 8)}
+    moves, replay = won_replay(3)
+    score = {"op": "add", "name": "ann", "puzzle": "mario", "size": "3x3",
+             "limit": 60, "replay": replay}
+    replies = talk(tmp_path, [dict(score, moves=moves + 1),
+                              dict(score, moves=moves),
+                              dict(score, moves=moves, replay="!!"),
+                              {"op": "top", "count": 5}], shapes)
+    assert replies[0]["refused"]
+    assert replies[1]["ok"]
+    assert not replies[2]["ok"]
+    assert replies[3]["leaders"] == [[moves, "ann"]]
@@ -0,0 +1,107 @@
+import multiprocessing
+import sqlite3
+
+from Leaderdb import Leaderdb
+from Leaderlog import Leaderlog
+
+
+def migrate_database(path, log_path, results):
+    """
+    Function -- migrate_database
+        Opens the database and copies the leaderboard file into it, in a
+        process of its own
+    Parameters:
+        path(str) -- the path to the database file
+        log_path(str) -- the path to the leaderboard text file
+        results(Queue) -- the queue taking the number of records copied
+    """
+    database = Leaderdb(path)
+    results.put(database.migrate(log_path))
+    database.close()
+
+
+def test_best_records_come_first(tmp_path):
+    database = Leaderdb(str(tmp_path / "leaderboard.db"))
+    for moves, name, puzzle in [(30, "ann", "mario"), (12, "bob", "luigi"),
+                                (30, "cy", "mario"), (7, "d:ee", "mario")]:
+        database.add(moves, name, puzzle, "4x4", 50, 99)
+    assert database.top(3) == [(7, "d ee"), (12, "bob"), (30, "ann")]
+    assert database.top(5, "mario") == [(7, "d ee"), (30, "ann"),
+                                        (30, "cy")]
+    assert database.top(5, "yoshi") == []
+    database.close()
+
+
+def test_changes_of_others_are_seen(tmp_path):
+    path = str(tmp_path / "leaderboard.db")
+    database = Leaderdb(path)
+    other = Leaderdb(path)
+    assert not database.changed()
+    other.add(10, "bob")
+    assert database.changed()
+    assert not database.changed()
+    assert database.top(1) == [(10, "bob")]
+    database.close()
+    other.close()
+
+
+def test_migration_copies_the_file_once(tmp_path):
+    log_path = str(tmp_path / "leaderboard.txt")
+    board = Leaderlog(log_path)
+    board.add(20, "ann", "mario", "3x5", 40, 123)
+    board.add(10, "bob", "luigi", "4x4", 50)
+    path = str(tmp_path / "leaderboard.db")
+    database = Leaderdb(path)
+    assert database.migrate(log_path) == 2
+    assert database.migrate(log_path) == 0
+    assert Leaderdb(path).migrate(log_path) == 0
+    assert database.top(5) == [(10, "bob"), (20, "ann")]
+    assert database.connection.execute(
+        "SELECT seed FROM scores WHERE name = 'ann'").fetchone() == (123,)
+    database.close()
+
+
+def test_migration_without_a_file(tmp_path):
+    database = Leaderdb(str(tmp_path / "leaderboard.db"))
+    assert database.migrate(str(tmp_path / "missing.txt")) == 0
+    assert database.top(5) == []
+    database.close()
+
+
+def test_games_starting_at_once_migrate_once(tmp_path):
+    log_path = str(tmp_path / "leaderboard.txt")
+    board = Leaderlog(log_path)
+    board.add_many([(moves, f"p{moves}", "mario", "4x4", 200, None)
+                    for moves in range(1, 2001)])
+    path = str(tmp_path / "leaderboard.db")
+    # the database exists before the games start, as it does once one of
+    # them opened it
+    Leaderdb(path).close()
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=migrate_database,
+                                         args=(path, log_path, results))
+                 for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+    assert sorted(results.get() for _ in processes) == [0, 0, 0, 2000]
+    with sqlite3.connect(path) as connection:
+        assert connection.execute(
+            "SELECT COUNT(*) FROM scores").fetchone() == (2000,)
+
+
+def test_seed_column_is_added_to_older_databases(tmp_path):
+    path = str(tmp_path / "leaderboard.db")
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE scores (id INTEGER PRIMARY KEY, "
+                           "puzzle TEXT NOT NULL, size TEXT NOT NULL, "
+                           "moves INTEGER NOT NULL, move_limit INTEGER "
+                           "NOT NULL, name TEXT NOT NULL, timestamp REAL "
+                           "NOT NULL)")
+    connection.close()
+    database = Leaderdb(path)
+    database.add(5, "ann", seed=7)
+    assert database.top(1) == [(5, "ann")]
+    database.close()
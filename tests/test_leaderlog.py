@@ -0,0 +1,111 @@
+import multiprocessing
+
+from Leaderlog import Leaderlog
+from Leaderlog import clean_name
+from Leaderlog import parse_record
+
+
+def add_scores(path, worker, count):
+    """
+    Function -- add_scores
+        Adds scores to a leaderboard file one at a time, in a process of
+        its own
+    Parameters:
+        path(str) -- the path to the leaderboard log file
+        worker(int) -- the number of the process, which names its players
+        count(int) -- the number of scores to add
+    """
+    board = Leaderlog(path)
+    for index in range(count):
+        board.add(index, f"w{worker}-{index}", "mario")
+
+
+def test_best_records_come_first(tmp_path):
+    board = Leaderlog(str(tmp_path / "leaderboard.txt"))
+    for moves, name, puzzle in [(30, "ann", "mario"), (12, "bob", "luigi"),
+                                (30, "cy", "mario"), (7, "dee", "mario")]:
+        board.add(moves, name, puzzle, "4x4", 50)
+    assert board.top(3) == [(7, "dee"), (12, "bob"), (30, "ann")]
+    # ties keep the order they were recorded in
+    assert board.top(5, "mario") == [(7, "dee"), (30, "ann"), (30, "cy")]
+    assert board.top(5, "yoshi") == []
+
+
+def test_file_is_read_back(tmp_path):
+    path = str(tmp_path / "leaderboard.txt")
+    board = Leaderlog(path)
+    board.add(20, "ann", "mario", "3x5", 40, 123)
+    board.add(10, "b:o\nb", "luigi", "4x4", 50)
+    records = Leaderlog(path).get_records()
+    assert [record[:6] for record in records] == \
+        [(10, 1, "b o b", "luigi", "4x4", 50),
+         (20, 0, "ann", "mario", "3x5", 40)]
+    assert [record[7] for record in records] == [None, 123]
+
+
+def test_older_lines_are_read(tmp_path):
+    path = tmp_path / "leaderboard.txt"
+    path.write_text("15 : ann\n9 : bob : mario : 4x4 : 50 : 1.5\n"
+                    "not a record\n")
+    assert Leaderlog(str(path)).top(5) == [(9, "bob"), (15, "ann")]
+    assert parse_record("", 0) is None
+    assert parse_record("x : ann", 0) is None
+
+
+def test_appends_of_others_are_read(tmp_path):
+    path = str(tmp_path / "leaderboard.txt")
+    board = Leaderlog(path)
+    other = Leaderlog(path)
+    board.add(20, "ann")
+    assert other.top(5) == [(20, "ann")]
+    board.add(10, "bob")
+    other.add(30, "cy")
+    assert board.top(5) == other.top(5) == \
+        [(10, "bob"), (20, "ann"), (30, "cy")]
+
+
+def test_compaction_sorts_the_file(tmp_path):
+    path = tmp_path / "leaderboard.txt"
+    board = Leaderlog(str(path))
+    for moves in (5, 3, 9, 1):
+        board.add(moves, f"p{moves}", "mario")
+    board.compact()
+    scores = [int(line.split(":")[0]) for line in
+              path.read_text().splitlines()]
+    assert scores == [1, 3, 5, 9]
+    assert board.unsorted == 0
+    assert Leaderlog(str(path)).top(2, "mario") == [(1, "p1"), (3, "p3")]
+
+
+def test_names_are_cleaned():
+    assert clean_name(" a : b \n c ") == "a b c"
+    assert clean_name("  ") == "anonymous"
+    assert clean_name("", "") == ""
+
+
+def test_unfinished_line_is_cut_off(tmp_path):
+    path = tmp_path / "leaderboard.txt"
+    board = Leaderlog(str(path))
+    board.add(20, "ann")
+    # a process crashed while writing the score of a line
+    with open(path, "ab") as outfile:
+        outfile.write(b"12")
+    board.add(30, "bob")
+    assert Leaderlog(str(path)).top(5) == [(20, "ann"), (30, "bob")]
+    assert len(path.read_text().splitlines()) == 2
+    assert parse_record("12", 0) is None
+
+
+def test_processes_lose_no_records(tmp_path):
+    path = str(tmp_path / "leaderboard.txt")
+    processes = [multiprocessing.Process(target=add_scores,
+                                         args=(path, worker, 40))
+                 for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert all(process.exitcode == 0 for process in processes)
+    names = {name for _, name in Leaderlog(path).top(1000)}
+    assert names == {f"w{worker}-{index}" for worker in range(4)
+                     for index in range(40)}
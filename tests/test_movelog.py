@@ -0,0 +1,124 @@
+import random
+
+import pytest
+
+from Movelog import MAGIC
+from Movelog import Movelog
+from Movelog import append_log
+from Movelog import decode_varint
+from Movelog import encode_varint
+from Movelog import read_logs
+
+
+def make_log(count, seed, resets=()):
+    """
+    Function -- make_log
+        Makes a record with random moves
+    Parameters:
+        count(int) -- the number of moves
+        seed(int) -- the seed of the moves and of the record
+        resets(tuple) -- the numbers of moves after which to add a reset
+    Returns the Movelog instance
+    """
+    rng = random.Random(seed)
+    log = Movelog(4, 5, 19, 80, seed * 7919, "mario", "ann")
+    for number in range(count):
+        if number in resets:
+            log.add_reset()
+        log.append(rng.randrange(4))
+    return log
+
+
+def same_log(log, other):
+    """
+    Function -- same_log
+        Tells whether two records hold the same game
+    Returns a boolean indicating whether every field is the same
+    """
+    return all(getattr(log, name) == getattr(other, name)
+               for name in Movelog.__slots__)
+
+
+@pytest.mark.parametrize("number", [0, 1, 127, 128, 300, 1 << 40, 1 << 63])
+def test_varint_round_trip(number):
+    data = b"\x05" + encode_varint(number)
+    assert decode_varint(data, 1) == (number, len(data))
+
+
+def test_varint_cut_short():
+    with pytest.raises(ValueError):
+        decode_varint(encode_varint(1 << 20)[:-1], 0)
+
+
+@pytest.mark.parametrize("count", [0, 1, 3, 4, 5, 100, 1001])
+def test_codes_come_back_in_order(count):
+    rng = random.Random(count)
+    codes = [rng.randrange(4) for _ in range(count)]
+    log = Movelog(3, 3, 8, 50, 1)
+    for code in codes:
+        log.append(code)
+    assert list(log.codes()) == codes
+    assert len(log.packed) == (count + 3) // 4
+
+
+@pytest.mark.parametrize("count, resets", [(0, ()), (7, (3,)),
+                                           (100, (0, 40, 41, 99))])
+def test_encode_decode_round_trip(count, resets):
+    log = make_log(count, count, resets)
+    data = log.encode()
+    length, start = decode_varint(data, 0)
+    assert start + length == len(data)
+    assert same_log(Movelog.decode(data[start:]), log)
+
+
+def test_segments_split_at_resets():
+    log = make_log(30, 3, (10, 21))
+    codes = list(log.codes())
+    pieces = []
+    for packed, count in log.segments():
+        part = Movelog(0, 0, 0, 0, 0)
+        part.packed = bytearray(packed)
+        part.count = count
+        pieces.append(list(part.codes()))
+    assert pieces == [codes[:10], codes[10:21], codes[21:]]
+
+
+def test_damaged_moves_are_refused():
+    data = make_log(20, 1).encode()
+    _, start = decode_varint(data, 0)
+    with pytest.raises(ValueError):
+        Movelog.decode(data[start:-1])
+
+
+def test_replay_file_round_trip(tmp_path):
+    path = str(tmp_path / "replays.bin")
+    logs = [make_log(count, count, (count // 2,)) for count in range(1, 60)]
+    for log in logs:
+        append_log(path, log)
+    with open(path, "rb") as infile:
+        assert infile.read(len(MAGIC)) == MAGIC
+    # records crossing the chunks are read whole
+    for chunk_size in (7, 64, 1 << 20):
+        read = list(read_logs(path, chunk_size))
+        assert len(read) == len(logs)
+        assert all(same_log(one, other) for one, other in zip(read, logs))
+
+
+def test_record_cut_short_is_left_out(tmp_path):
+    path = str(tmp_path / "replays.bin")
+    append_log(path, make_log(10, 1))
+    append_log(path, make_log(20, 2))
+    with open(path, "r+b") as outfile:
+        outfile.truncate(outfile.seek(0, 2) - 3)
+    read = list(read_logs(path, 16))
+    assert len(read) == 1
+    assert same_log(read[0], make_log(10, 1))
+
+
+def test_other_files_are_refused(tmp_path):
+    path = tmp_path / "replays.bin"
+    path.write_bytes(b"not a replay file\n")
+    with pytest.raises(ValueError):
+        list(read_logs(str(path)))
+    with pytest.raises(ValueError):
+        append_log(str(path), make_log(1, 1))
@@ -0,0 +1,114 @@
+import array
+import random
+
+from GameSession import GameSession
+from Movestack import Movestack
+from Puzzleboard import Puzzleboard
+
+
+def make_board(rows=3, columns=4):
+    """
+    Function -- make_board
+        Makes a solved board of tile numbers
+    Returns the Puzzleboard instance
+    """
+    tiles = array.array("H", range(rows * columns))
+    board = Puzzleboard()
+    board.set_dimensions(rows, columns)
+    board.set_tiles(tiles)
+    board.set_board(tiles, rows * columns - 1)
+    return board
+
+
+def play(board, history, count, seed):
+    """
+    Function -- play
+        Makes random moves on a board, adding them to a history
+    Returns a list of the boards after each move, the first one before
+        any move
+    """
+    rng = random.Random(seed)
+    boards = [list(board.cells)]
+    while len(boards) <= count:
+        code = rng.randrange(4)
+        if board.move_blank(code):
+            history.push(code, board.cells, board.blank)
+            boards.append(list(board.cells))
+    return boards
+
+
+def test_undo_and_redo_give_the_moves_back():
+    board = make_board()
+    history = Movestack(board.cells, board.blank, every=4)
+    boards = play(board, history, 30, 1)
+    for position in range(30, 0, -1):
+        board.move_blank(history.undo() ^ 1)
+        assert list(board.cells) == boards[position - 1]
+    assert history.undo() is None
+    for position in range(1, 31):
+        board.move_blank(history.redo())
+        assert list(board.cells) == boards[position]
+    assert history.redo() is None
+    assert history.get_length() == 30
+
+
+def test_new_move_drops_the_undone_ones():
+    board = make_board()
+    history = Movestack(board.cells, board.blank, every=4)
+    play(board, history, 10, 2)
+    for _ in range(6):
+        board.move_blank(history.undo() ^ 1)
+    boards = play(board, history, 5, 3)
+    assert history.get_length() == history.get_position() == 9
+    assert history.redo() is None
+    # the checkpoints past the new moves were made again
+    for position in range(4, 10):
+        tiles, blank, packed, count = history.checkpoint(position)
+        other = make_board()
+        other.set_board(tiles, blank)
+        assert other.play_packed(packed, count) == count
+        assert list(other.cells) == boards[position - 4]
+
+
+def test_checkpoints_reach_every_position():
+    board = make_board(4, 4)
+    history = Movestack(board.cells, board.blank, every=8)
+    boards = play(board, history, 100, 4)
+    for position in range(101):
+        tiles, blank, packed, count = history.checkpoint(position)
+        other = make_board(4, 4)
+        other.set_board(tiles, blank)
+        other.play_packed(packed, count)
+        assert list(other.cells) == boards[position]
+
+
+def test_session_jump_matches_undo_and_redo():
+    session = GameSession(3, 3)
+    session.scramble(500, 5)
+    rng = random.Random(6)
+    for _ in range(40):
+        session.move_blank(rng.randrange(4))
+    length = session.get_history().get_length()
+    states = {}
+    other = GameSession(3, 3)
+    other.scramble(500, 5)
+    rng = random.Random(6)
+    for _ in range(40):
+        other.move_blank(rng.randrange(4))
+    states[length] = other.get_state()
+    for position in range(length - 1, -1, -1):
+        other.undo()
+        states[position] = other.get_state()
+
+    for position in (0, 17, length, 3, length - 1):
+        moves = session.get_moves() + \
+            abs(position - session.get_history().get_position())
+        session.jump(position)
+        assert session.get_state() == states[position]
+        assert session.get_moves() == moves
+    # the jumps are recorded as the moves undoing or redoing them make
+    replay = GameSession(3, 3)
+    replay.scramble(500, 5)
+    for code in session.get_log().codes():
+        replay.move_blank(code)
+    assert replay.get_state() == session.get_state()
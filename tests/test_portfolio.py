@@ -0,0 +1,90 @@
+import pytest
+
+from GameSession import GameSession
+from boards import is_solution
+from boards import scrambled
+import portfolio
+import solver
+
+BOARDS = [(3, 3, 40, seed, None) for seed in range(4)] + \
+    [(2, 4, 40, 1, 0), (3, 4, 30, 2, 5), (4, 4, 30, 3, None)]
+
+
+@pytest.mark.parametrize("rows, columns, moves, seed, blank", BOARDS)
+def test_engines_solve_and_agree(rows, columns, moves, seed, blank):
+    tiles, blank_tile = scrambled(rows, columns, moves, seed, blank)
+    shortest = solver.solve(tiles, rows, columns, blank_tile)
+    both_ways = solver.bidirectional_search(tiles, rows, columns,
+                                            blank_tile)
+    weighted = solver.weighted_search(tiles, rows, columns, blank_tile)
+    for codes in (both_ways, weighted):
+        assert is_solution(tiles, rows, columns, blank_tile, codes)
+    # the breadth-first search is shortest too, the weighted A* may not be
+    assert len(both_ways) == len(shortest)
+    assert len(weighted) >= len(shortest)
+
+
+def test_solved_board_needs_no_moves():
+    tiles = list(range(9))
+    assert solver.bidirectional_search(tiles, 3, 3) == []
+    assert solver.weighted_search(tiles, 3, 3) == []
+
+
+def test_race_takes_a_shortest_solution(tmp_path):
+    path = str(tmp_path / "stats.json")
+    tiles, blank_tile = scrambled(3, 3, 40, 7)
+    codes, name, shortest = portfolio.race(tiles, 3, 3, blank_tile,
+                                           time_limit=30, stats_path=path)
+    assert name in ("ida", "bfs")
+    assert shortest
+    assert is_solution(tiles, 3, 3, blank_tile, codes)
+    assert len(codes) == len(solver.solve(tiles, 3, 3, blank_tile))
+
+    stats = portfolio.read_stats(path)
+    assert stats[name]["wins"] == 1
+    assert all(engine["races"] == 1 for engine in stats.values())
+    assert sum(engine["wins"] for engine in stats.values()) == 1
+
+
+def test_race_board_reads_a_session_board():
+    session = GameSession(3, 3)
+    session.scramble(40, 8)
+    board = session.get_board()
+    codes, name, _ = portfolio.race_board(board, ["weighted"], 30, "")
+    assert name == "weighted"
+    for code in codes:
+        assert board.move_blank(code)
+    assert board.is_solved()
+
+
+def test_race_refuses_bad_requests():
+    tiles = list(range(9))
+    tiles[0], tiles[1] = tiles[1], tiles[0]
+    with pytest.raises(ValueError):
+        portfolio.race(tiles, 3, 3, stats_path="")
+    with pytest.raises(ValueError):
+        portfolio.race(list(range(9)), 3, 3, engines=["guess"],
+                       stats_path="")
+
+
+def test_stats_add_up(tmp_path):
+    path = str(tmp_path / "stats.json")
+    assert portfolio.read_stats(path) == {}
+    portfolio.add_stats({"ida": ("solved", 0.5), "bfs": ("cancelled", None)},
+                        "ida", path)
+    portfolio.add_stats({"ida": ("unsolved", 1.5), "bfs": ("solved", 0.25)},
+                        "bfs", path)
+    stats = portfolio.read_stats(path)
+    assert stats["ida"] == {"races": 2, "wins": 1, "solved": 1,
+                            "unsolved": 1, "cancelled": 0, "seconds": 2.0}
+    assert stats["bfs"] == {"races": 2, "wins": 1, "solved": 1,
+                            "unsolved": 0, "cancelled": 1, "seconds": 0.25}
+
+
+def test_damaged_stats_file_is_started_over(tmp_path):
+    path = tmp_path / "stats.json"
+    path.write_text("[1, 2")
+    with pytest.raises(ValueError):
+        portfolio.read_stats(str(path))
+    portfolio.add_stats({"ida": ("solved", 1.0)}, "ida", str(path))
+    assert portfolio.read_stats(str(path))["ida"]["wins"] == 1
@@ -0,0 +1,118 @@
+import array
+import random
+
+import pytest
+
+from Puzzleboard import Puzzleboard
+
+
+class Card:
+    """
+    Class: Card
+    This class stands in for a Tile, which needs a screen to draw on
+    ---
+    Attributes:
+        number(int) -- the number of the tile in the solved puzzle
+        blank(bool) -- whether the tile is the blank tile
+    """
+    def __init__(self, number, blank=False):
+        """
+        Method -- __init__
+            The constructor of the class, creates Card instances
+        """
+        self.number = number
+        self.blank = blank
+
+    def is_blank(self):
+        """
+        Method -- is_blank
+            Tells whether the card is the blank tile
+        Returns a boolean indicating whether the card is blank
+        """
+        return self.blank
+
+
+def make_board(rows, columns, tiles=None, blank=None):
+    """
+    Function -- make_board
+        Makes a board of tile numbers, solved unless tiles are given
+    Returns the Puzzleboard instance
+    """
+    solved = list(range(rows * columns))
+    board = Puzzleboard()
+    board.set_dimensions(rows, columns)
+    board.set_tiles(solved)
+    board.set_board(tiles or solved,
+                    rows * columns - 1 if blank is None else blank)
+    return board
+
+
+def test_blank_tile_is_found_among_tiles():
+    cards = [Card(number, number == 2) for number in range(6)]
+    board = Puzzleboard()
+    board.set_dimensions(2, 3)
+    board.set_tiles(cards)
+    board.set_board(cards)
+    assert board.find_blank() == (0, 2)
+
+
+def test_board_without_blank_is_refused():
+    board = Puzzleboard()
+    board.set_dimensions(2, 2)
+    with pytest.raises(ValueError):
+        board.set_board([Card(number) for number in range(4)])
+    with pytest.raises(ValueError):
+        board.set_board([0, 1, 2, 3])
+    with pytest.raises(ValueError):
+        board.set_board([0, 1, 2, 3], 4)
+    with pytest.raises(ValueError):
+        board.set_board([0, 1, 2], 2)
+
+
+@pytest.mark.parametrize("rows, columns", [(2, 5), (5, 2), (4, 4)])
+def test_moves_stop_at_the_edges(rows, columns):
+    board = make_board(rows, columns)
+    # the blank tile starts in the bottom right corner
+    assert not board.move_blank(1)
+    assert not board.move_blank(3)
+    for _ in range(columns - 1):
+        assert board.move_blank(2)
+    assert not board.move_blank(2)
+    for _ in range(rows - 1):
+        assert board.move_blank(0)
+    assert not board.move_blank(0)
+    assert board.find_blank() == (0, 0)
+    assert board.get_moves() == rows + columns - 2
+
+
+def test_counts_and_places_follow_the_moves():
+    board = make_board(3, 4)
+    rng = random.Random(1)
+    for _ in range(200):
+        board.move_blank(rng.randrange(4))
+        assert board.misplaced == board.count_misplaced()
+        for tile in range(12):
+            x, y = board.find_location(tile)
+            assert board.cells[x * 4 + y] == tile
+    assert board.cells[board.blank] == 11
+
+
+def test_moves_back_solve_the_board():
+    board = make_board(3, 3)
+    codes = [0, 2, 0, 3, 1, 2]
+    for code in codes:
+        assert board.move_blank(code)
+    assert not board.is_solved()
+    assert board.blank_code(board.blank + 1) == 3
+    for code in reversed(codes):
+        assert board.move_blank(code ^ 1)
+    assert board.is_solved()
+
+
+def test_boards_of_tile_numbers_compare_equal():
+    tiles = [3, 1, 2, 0]
+    board = make_board(2, 2, tiles, 0)
+    other = make_board(2, 2, array.array("H", tiles), 0)
+    assert board == other
+    assert board != make_board(2, 2)
+    assert board != make_board(1, 4, tiles, 0)
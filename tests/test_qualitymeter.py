@@ -0,0 +1,75 @@
+import pytest
+
+from Qualitymeter import Qualitymeter
+
+MS = 1000000
+
+
+def draw(meter, milliseconds, frames):
+    """
+    Function -- draw
+        Records frames of the same length
+    Returns a list of the frames, counted from 1, that switched the tier
+    """
+    return [frame for frame in range(1, frames + 1)
+            if meter.record(int(milliseconds * MS))]
+
+
+def test_slow_frames_switch_to_the_cheap_tier():
+    meter = Qualitymeter(10, 0.5, 4)
+    # a single slow frame doesn't switch
+    assert draw(meter, 100, 1) == []
+    assert draw(meter, 2, 3) == []
+    assert meter.get_tier() == "full"
+    assert draw(meter, 20, 4) == [2]
+    assert meter.is_cheap()
+
+
+def test_fast_frames_go_back_to_the_full_tier():
+    meter = Qualitymeter(10, 0.5, 4)
+    draw(meter, 20, 4)
+    # frames between the headroom and the budget keep the cheap tier
+    assert draw(meter, 8, 20) == []
+    assert draw(meter, 3, 4) == [3]
+    assert meter.get_tier() == "full"
+
+
+def test_failing_full_tier_is_held_off_longer():
+    meter = Qualitymeter(10, 0.5, 4)
+    draw(meter, 20, 4)
+    holds = []
+    for _ in range(4):
+        # back to full, and too slow again right away
+        draw(meter, 1, meter.hold)
+        assert meter.get_tier() == "full"
+        draw(meter, 20, 4)
+        holds.append(meter.hold)
+    assert holds == [8, 16, 32, 64]
+    # a full tier that lasted resets the hold
+    draw(meter, 1, meter.hold)
+    draw(meter, 5, 20)
+    draw(meter, 20, 4)
+    assert meter.hold == 4
+
+
+def test_set_tier_stops_the_meter():
+    meter = Qualitymeter(10, 0.5, 4)
+    assert meter.set_tier("cheap")
+    assert not meter.set_tier("cheap")
+    assert draw(meter, 1, 40) == []
+    assert meter.is_cheap()
+    assert not meter.set_tier(None)
+    assert draw(meter, 1, 4) == [1]
+    with pytest.raises(ValueError):
+        meter.set_tier("shiny")
+
+
+def test_stats_describe_the_frames():
+    meter = Qualitymeter(10, 0.5, 4)
+    draw(meter, 4, 10)
+    stats = meter.get_stats()
+    assert stats["frames"] == 10
+    assert stats["budget_ms"] == 10
+    assert stats["last_ms"] == 4
+    assert stats["p50_ms"] == pytest.approx(4, rel=0.05)
+    assert stats["max_ms"] == pytest.approx(4, rel=0.05)
@@ -0,0 +1,47 @@
+import logging
+
+from Repeatfilter import Repeatfilter
+
+
+def make_record(message, created, level=logging.ERROR):
+    """
+    Function -- make_record
+        Makes a log record made at a given time
+    Returns the LogRecord instance
+    """
+    record = logging.LogRecord("game", level, "PuzzleGame.py", 1, message,
+                               None, None, "load_meta_data")
+    record.created = created
+    return record
+
+
+def test_repeats_are_dropped_and_counted():
+    repeats = Repeatfilter(window=10, limit=100)
+    assert repeats.filter(make_record("disk full", 0.0))
+    assert not repeats.filter(make_record("disk full", 1.0))
+    assert not repeats.filter(make_record("disk full", 9.0))
+    # other messages and other levels are let through
+    assert repeats.filter(make_record("no thumbnail", 2.0))
+    assert repeats.filter(make_record("disk full", 3.0, logging.WARNING))
+    record = make_record("disk full", 10.5)
+    assert repeats.filter(record)
+    assert record.repeats == 2
+    record = make_record("disk full", 21.0)
+    assert repeats.filter(record)
+    assert record.repeats == 0
+
+
+def test_messages_remembered_are_limited():
+    repeats = Repeatfilter(window=10, limit=3)
+    for number in range(5):
+        assert repeats.filter(make_record(f"error {number}", 0.0))
+    assert len(repeats.seen) == 3
+    # the message forgotten first is let through again
+    assert repeats.filter(make_record("error 0", 1.0))
+    assert not repeats.filter(make_record("error 4", 1.0))
+
+
+def test_no_window_lets_everything_through():
+    repeats = Repeatfilter(window=0, limit=10)
+    assert all(repeats.filter(make_record("disk full", 0.0))
+               for _ in range(3))
@@ -0,0 +1,98 @@
+import multiprocessing
+import os
+import shutil
+
+import pytest
+
+from Gifimage import Gifimage
+from Sharedtiles import Sharedtiles
+from Sharedtiles import _open_segment
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def game_dir(tmp_path):
+    """
+    Function -- game_dir
+        Copies the mario puzzle into a game directory of its own, so it can
+        be changed
+    Returns a string with the path to the directory
+    """
+    shutil.copy(os.path.join(ROOT, "mario.puz"), tmp_path)
+    shutil.copytree(os.path.join(ROOT, "Images", "mario"),
+                    tmp_path / "Images" / "mario")
+    return str(tmp_path)
+
+
+def read_in_child(game_path, base_dir, results):
+    """
+    Function -- read_in_child
+        Attaches to the segment of a puzzle from another process and sends
+        back the pixels of its first tile
+    """
+    with Sharedtiles(game_path, base_dir) as tiles:
+        with tiles.get_pixels(0) as pixels:
+            results.put(bytes(pixels))
+
+
+def test_tiles_match_their_files(game_dir):
+    game_path = os.path.join(game_dir, "mario.puz")
+    with Sharedtiles(game_path, game_dir) as tiles:
+        assert tiles.get_count() == 16
+        number = tiles.find("Images/mario/blank.gif")
+        assert number == 15
+        image = Gifimage.read(os.path.join(game_dir, "Images", "mario",
+                                           "16.gif"))
+        assert tiles.get_size(0) == (image.get_width(), image.get_height())
+        with tiles.get_pixels(0) as pixels, \
+                tiles.get_palette(0) as palette:
+            assert bytes(pixels) == bytes(image.pixels)
+            assert bytes(palette) == bytes(image.palette)
+            assert pixels.readonly
+        copy = tiles.get_image(0)
+        assert bytes(copy.pixels) == bytes(image.pixels)
+        with pytest.raises(KeyError):
+            tiles.find("Images/luigi/1.gif")
+
+
+def test_last_process_removes_the_segment(game_dir):
+    game_path = os.path.join(game_dir, "mario.puz")
+    first = Sharedtiles(game_path, game_dir)
+    other = Sharedtiles(game_path, game_dir)
+    assert first.name == other.name
+    results = multiprocessing.Queue()
+    child = multiprocessing.Process(target=read_in_child,
+                                    args=(game_path, game_dir, results))
+    child.start()
+    pixels = results.get(timeout=30)
+    child.join()
+    with first.get_pixels(0) as own:
+        assert pixels == bytes(own)
+    first.close()
+    first.close()
+    # the segment outlives the processes that closed it
+    _open_segment(other.name).close()
+    other.close()
+    with pytest.raises(FileNotFoundError):
+        _open_segment(other.name)
+
+
+def test_changed_puzzle_gets_a_new_segment(game_dir):
+    game_path = os.path.join(game_dir, "mario.puz")
+    with Sharedtiles(game_path, game_dir) as tiles:
+        name = tiles.name
+    shutil.copy(os.path.join(ROOT, "Images", "luigi", "1.gif"),
+                os.path.join(game_dir, "Images", "mario", "16.gif"))
+    with Sharedtiles(game_path, game_dir) as tiles:
+        assert tiles.name != name
+        image = Gifimage.read(os.path.join(ROOT, "Images", "luigi",
+                                           "1.gif"))
+        with tiles.get_pixels(0) as pixels:
+            assert bytes(pixels) == bytes(image.pixels)
+
+
+def test_missing_image_is_refused(game_dir):
+    os.remove(os.path.join(game_dir, "Images", "mario", "3.gif"))
+    with pytest.raises((OSError, ValueError)):
+        Sharedtiles(os.path.join(game_dir, "mario.puz"), game_dir)
@@ -0,0 +1,105 @@
+import collections
+
+import pytest
+
+from boards import is_solution
+from boards import scrambled
+import solver
+
+
+def shortest_length(tiles, rows, columns, blank_tile):
+    """
+    Function -- shortest_length
+        Finds the length of a shortest solution by trying every board
+        breadth first, for boards small enough to try them all
+    Returns an integer with the number of moves
+    """
+    solved = tuple(range(rows * columns))
+    seen = {tuple(tiles)}
+    frontier = collections.deque([(tuple(tiles), 0)])
+    while frontier:
+        board, moves = frontier.popleft()
+        if board == solved:
+            return moves
+        for code in range(4):
+            try:
+                after = tuple(solver.apply_moves(board, rows, columns,
+                                                 blank_tile, [code]))
+            except ValueError:
+                continue
+            if after not in seen:
+                seen.add(after)
+                frontier.append((after, moves + 1))
+
+
+BOARDS = [(2, 3, 30, seed, None) for seed in range(4)] + \
+    [(3, 2, 30, 1, 0), (2, 4, 40, 2, None), (2, 4, 40, 3, 5),
+     (4, 2, 40, 4, 3)]
+
+
+@pytest.mark.parametrize("rows, columns, moves, seed, blank", BOARDS)
+def test_solutions_are_shortest(rows, columns, moves, seed, blank):
+    tiles, blank_tile = scrambled(rows, columns, moves, seed, blank)
+    codes = solver.solve(tiles, rows, columns, blank_tile)
+    assert is_solution(tiles, rows, columns, blank_tile, codes)
+    assert len(codes) == shortest_length(tiles, rows, columns, blank_tile)
+    assert solver.estimate(tiles, rows, columns, blank_tile) <= len(codes)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_square_boards_are_solved(seed):
+    tiles, blank_tile = scrambled(4, 4, 40, seed)
+    codes = solver.solve(tiles, 4, 4, blank_tile)
+    assert is_solution(tiles, 4, 4, blank_tile, codes)
+    assert solver.estimate(tiles, 4, 4, blank_tile) <= len(codes)
+
+
+def test_solved_board_needs_no_moves():
+    assert solver.solve(list(range(9)), 3, 3) == []
+
+
+def test_unsolvable_board_is_refused():
+    tiles = list(range(9))
+    tiles[0], tiles[1] = tiles[1], tiles[0]
+    with pytest.raises(ValueError):
+        solver.solve(tiles, 3, 3)
+    with pytest.raises(ValueError):
+        solver.check_board(tiles, 3, 3, 8)
+
+
+def test_invalid_board_is_refused():
+    with pytest.raises(ValueError):
+        solver.check_board([0, 1, 2, 2], 2, 2, 3)
+
+
+def test_limits_give_up():
+    tiles, blank_tile = scrambled(4, 4, 200, 11)
+    assert solver.solve(tiles, 4, 4, blank_tile, node_limit=10) is None
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_mirror_solution_solves_board(seed):
+    tiles, blank_tile = scrambled(3, 3, 30, seed)
+    key, mirrored = solver.canonical_key(tiles, 3, 3, blank_tile)
+    # the board across the diagonal, numbered by its mirrored cells
+    mirror = [tiles[column * 3 + row] for row in range(3)
+              for column in range(3)]
+    mirror = [tile % 3 * 3 + tile // 3 for tile in mirror]
+    mirror_key, mirror_mirrored = solver.canonical_key(mirror, 3, 3,
+                                                      blank_tile)
+    # a board and its mirror image share a key, and only one of them is
+    # the mirror image of the key unless they are the same board
+    assert key == mirror_key
+    if mirror != tiles:
+        assert mirrored != mirror_mirrored
+
+    codes = solver.solve(mirror, 3, 3, blank_tile)
+    assert is_solution(mirror, 3, 3, blank_tile, codes)
+    assert is_solution(tiles, 3, 3, blank_tile, solver.mirror_codes(codes))
+
+
+def test_rectangular_board_has_no_mirror():
+    tiles, blank_tile = scrambled(2, 3, 20, 0)
+    key, mirrored = solver.canonical_key(tiles, 2, 3, blank_tile)
+    assert not mirrored
+    assert key.startswith("2x3:")
@@ -0,0 +1,100 @@
+import os
+import shutil
+
+import pytest
+
+from Gifimage import Gifimage
+import config
+import puzzle_file
+import thumbnails
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def game_dir(tmp_path):
+    """
+    Function -- game_dir
+        Makes a game directory with the mario puzzle, without its
+        thumbnail, next to the luigi puzzle with its own
+    Returns a string with the path to the directory
+    """
+    for name in ("mario", "luigi"):
+        shutil.copytree(os.path.join(ROOT, "Images", name),
+                        tmp_path / "Images" / name)
+    with open(os.path.join(ROOT, "mario.puz")) as infile:
+        lines = [line for line in infile if not line.startswith("thumbnail")]
+    (tmp_path / "mario.puz").write_text("".join(lines))
+    shutil.copy(os.path.join(ROOT, "luigi.puz"), tmp_path)
+    return str(tmp_path)
+
+
+def test_thumbnail_is_made_once(game_dir):
+    game_path = os.path.join(game_dir, "mario.puz")
+    thumbnail = thumbnails.find_thumbnail(game_path, game_dir)
+    assert thumbnail.startswith(config.THUMBNAIL_CACHE_PATH)
+    path = os.path.join(game_dir, thumbnail)
+    image = Gifimage.read(path)
+    assert max(image.get_width(), image.get_height()) == \
+        config.THUMBNAIL_SIZE
+    made = os.stat(path).st_mtime_ns
+    assert thumbnails.find_thumbnail(game_path, game_dir) == thumbnail
+    assert os.stat(path).st_mtime_ns == made
+    # a changed tile makes a new thumbnail
+    shutil.copy(os.path.join(game_dir, "Images", "luigi", "1.gif"),
+                os.path.join(game_dir, "Images", "mario", "16.gif"))
+    assert thumbnails.find_thumbnail(game_path, game_dir) != thumbnail
+
+
+def test_thumbnail_keeps_the_tile_colors(game_dir):
+    puzzle = puzzle_file.read_puzzle(os.path.join(game_dir, "mario.puz"),
+                                     game_dir)
+    thumbnail = thumbnails.compose(puzzle, game_dir)
+    tile = Gifimage.read(os.path.join(game_dir, puzzle["images"][0]))
+    # the middle of the first tile is in the top left of the thumbnail
+    share = config.THUMBNAIL_SIZE // 4
+    middle = share // 2 * thumbnail.get_width() + share // 2
+    source = (tile.height // 2) * tile.width + tile.width // 2
+    color = thumbnail.pixels[middle]
+    source_color = tile.pixels[source]
+    # the merged palette may round the color a little
+    assert all(abs(one - other) < 16 for one, other in zip(
+        thumbnail.palette[3 * color:3 * color + 3],
+        tile.palette[3 * source_color:3 * source_color + 3]))
+
+
+def test_many_colors_are_merged_into_one_palette():
+    images = []
+    for shade in range(2):
+        palette = bytes(value for index in range(200)
+                        for value in (index, shade * 50, 255 - index))
+        images.append(Gifimage(200, 1, palette, bytes(range(200))))
+    palette, tables = thumbnails.merge_palettes(images)
+    assert len(palette) // 3 <= 256
+    for image, table in zip(images, tables):
+        for index in range(200):
+            merged = palette[3 * table[index]:3 * table[index] + 3]
+            original = image.palette[3 * index:3 * index + 3]
+            assert all(abs(one - other) < 8
+                       for one, other in zip(merged, original))
+
+
+def test_scaled_tiles_fit_their_size(game_dir):
+    puzzle = puzzle_file.read_puzzle(os.path.join(game_dir, "mario.puz"),
+                                     game_dir)
+    tiles = thumbnails.scale_tiles(puzzle, 40, game_dir)
+    assert len(tiles) == 16
+    assert tiles[-1].endswith("blank.gif")
+    for tile in tiles:
+        image = Gifimage.read(os.path.join(game_dir, tile))
+        assert (image.get_width(), image.get_height()) == (40, 40)
+    assert thumbnails.scale_tiles(puzzle, 40, game_dir) == tiles
+
+
+def test_catalog_makes_the_missing_thumbnails(game_dir):
+    with open(os.path.join(game_dir, "broken.puz"), "w") as outfile:
+        outfile.write("name: broken\n")
+    results = thumbnails.generate_catalog(game_dir, workers=1)
+    assert results["luigi.puz"] == "own"
+    assert results["broken.puz"].startswith("error:")
+    assert os.path.isfile(os.path.join(game_dir, results["mario.puz"]))
@@ -0,0 +1,66 @@
+import os
+
+import pytest
+
+from Gifimage import Gifimage
+import config
+import puzzle_file
+import tile_slicer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE = os.path.join(ROOT, "Images", "mario", "mario_thumbnail.gif")
+
+
+@pytest.mark.parametrize("rows, columns, tile_size", [(3, 3, 20),
+                                                      (2, 5, 16),
+                                                      (4, 2, 12)])
+def test_sliced_puzzle_can_be_played(tmp_path, rows, columns, tile_size):
+    game_path = tile_slicer.slice_image(SOURCE, rows, str(tmp_path),
+                                        tile_size, columns)
+    puzzle = puzzle_file.read_puzzle(game_path, str(tmp_path))
+    assert (puzzle["rows"], puzzle["columns"]) == (rows, columns)
+    assert puzzle["size"] == tile_size
+    assert len(puzzle["images"]) == rows * columns
+    assert puzzle_file.find_blank(puzzle["images"]) == rows * columns - 1
+    for image in puzzle["images"]:
+        tile = Gifimage.read(os.path.join(str(tmp_path), image))
+        assert (tile.width, tile.height) == (tile_size, tile_size)
+    thumbnail = Gifimage.read(os.path.join(str(tmp_path),
+                                           puzzle["thumbnail"]))
+    assert max(thumbnail.width, thumbnail.height) == config.THUMBNAIL_SIZE
+
+
+def test_same_source_is_sliced_once(tmp_path):
+    game_path = tile_slicer.slice_image(SOURCE, 3, str(tmp_path), 20)
+    made = os.stat(game_path).st_mtime_ns
+    assert tile_slicer.slice_image(SOURCE, 3, str(tmp_path), 20) == \
+        game_path
+    assert os.stat(game_path).st_mtime_ns == made
+    # other settings make the puzzle again
+    tile_slicer.slice_image(SOURCE, 4, str(tmp_path), 20)
+    assert puzzle_file.read_puzzle(game_path, str(tmp_path))["rows"] == 4
+
+
+def test_blank_tile_is_white_with_an_outline():
+    image = Gifimage(1, 1, bytes([0, 0, 0, 255, 255, 255, 130, 130, 130]))
+    blank = tile_slicer.make_blank(image, 5)
+    assert blank.pixels[:5] == bytes([2] * 5)
+    assert blank.pixels[6:9] == bytes([1] * 3)
+
+
+def test_unsupported_grids_are_refused(tmp_path):
+    with pytest.raises(ValueError):
+        tile_slicer.slice_image(SOURCE, config.PUZZLE_MIN_GRID - 1,
+                                str(tmp_path))
+    with pytest.raises(ValueError):
+        tile_slicer.slice_image(SOURCE, 3, str(tmp_path),
+                                columns=config.PUZZLE_MAX_GRID + 1)
+
+
+def test_directory_reports_each_image(tmp_path):
+    broken = tmp_path / "broken.gif"
+    broken.write_bytes(b"GIF89a")
+    results = tile_slicer.slice_directory([SOURCE, str(broken)], 3,
+                                          str(tmp_path / "games"), 1)
+    assert results[SOURCE].endswith("mario_thumbnail.puz")
+    assert results[str(broken)].startswith("error:")
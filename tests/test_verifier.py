@@ -0,0 +1,113 @@
+import pytest
+
+from GameSession import GameSession
+from Movelog import Movelog
+from Puzzleboard import Puzzleboard
+import solver
+import verifier
+
+
+def won_game(seed, moves_first=0):
+    """
+    Function -- won_game
+        Plays a game to the end, solving the board from where it is
+    Parameters:
+        seed(int) -- the seed of the scramble
+        moves_first(int) -- the number of moves to make before putting
+            the tiles back in order, which are then moved away and back
+    Returns the Movelog instance of the game
+    """
+    session = GameSession(3, 3, 60)
+    session.set_puzzle("mario")
+    session.scramble(60, seed)
+    if moves_first:
+        for code in (0, 2, 1, 3, 0)[:moves_first]:
+            session.move_blank(code)
+        session.reset()
+        codes = [0, 1]
+    else:
+        codes = solver.solve(session.get_state(), 3, 3,
+                             session.get_blank_tile())
+    for code in codes:
+        session.move_blank(code)
+    assert session.get_status() == "win"
+    return session.get_log()
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_won_game_holds_up(seed):
+    log = won_game(seed)
+    verifier.check_log(log, log.count, {"mario": (3, 3, 8)})
+    assert verifier.verify_record(log.encode()) is None
+
+
+def test_game_with_reset_holds_up():
+    log = won_game(4, 3)
+    assert log.resets == [3]
+    assert verifier.verify_record(log.encode()) is None
+
+
+def test_wrong_score_is_refused():
+    log = won_game(5)
+    with pytest.raises(ValueError):
+        verifier.check_log(log, log.count - 1)
+
+
+def test_other_board_is_refused():
+    log = won_game(6)
+    with pytest.raises(ValueError):
+        verifier.check_log(log, shapes={"mario": (4, 4, 15)})
+    with pytest.raises(ValueError):
+        verifier.check_log(log, shapes={})
+
+
+def test_unsolved_game_is_refused():
+    log = won_game(7)
+    log.count -= 1
+    assert verifier.verify_record(log.encode()) == "The puzzle isn't solved."
+
+
+def test_impossible_move_is_refused():
+    log = Movelog(3, 3, 8, 60, 1, "mario")
+    # the blank tile can't go right from the last column
+    for code in (3, 3, 3, 3):
+        log.append(code)
+    reason = verifier.verify_record(log.encode())
+    assert reason is not None and "impossible" in reason
+
+
+@pytest.mark.parametrize("resets", [[101], [3, 1], [2, 5]])
+def test_forged_resets_are_refused(resets):
+    log = won_game(8)
+    log.count = 4
+    log.packed = log.packed[:1]
+    log.resets = resets
+    assert verifier.verify_record(log.encode()) == \
+        "The resets are out of order."
+
+
+def test_reset_before_the_game_is_refused():
+    log = won_game(8)
+    log.resets = [-1]
+    with pytest.raises(ValueError):
+        verifier.check_log(log)
+
+
+def test_more_moves_than_bytes_are_refused():
+    board = Puzzleboard()
+    board.set_dimensions(3, 3)
+    board.set_tiles(list(range(9)))
+    board.set_board(list(range(9)), 8)
+    with pytest.raises(ValueError):
+        board.play_packed(b"\x00", 5)
+    with pytest.raises(ValueError):
+        board.play_packed(b"\x00", -1)
+
+
+def test_pool_checks_every_game():
+    logs = [won_game(seed) for seed in range(3)] + [won_game(9)]
+    logs[-1].count -= 1
+    results = list(verifier.verify_logs(logs, workers=1))
+    assert [log for log, _ in results] == logs
+    assert [reason for _, reason in results] == \
+        [None, None, None, "The puzzle isn't solved."]
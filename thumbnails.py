@@ -0,0 +1,274 @@
+"""
+Generates the leaderboard thumbnails of puzzles that have none.
+
+A thumbnail is made by scaling every tile of a puzzle down to its share of
+the thumbnail and laying the tiles out in solved order. Tiles cut by hand
+each have their own palette, so the colors the scaled tiles use are merged
+into one palette, with the colors rounded to fewer bits until at most 256
+are left. Thumbnails are kept in THUMBNAIL_CACHE_PATH under the hash of the
+tile images and the settings, so a puzzle's thumbnail is only made once
+for each version of its tiles, and a puzzle whose .puz file names no
+thumbnail, or one that doesn't exist, gets the cached one when it is
+loaded.
+
+Tiles too large for the player board are scaled down the same way, as
+turtle draws images at their own size, and kept in SCALED_TILE_PATH under
+the hash of the tiles and the new size.
+
+Run on its own, the tool makes the thumbnails of every puzzle of the game
+directory that needs one on a process pool.
+
+Usage: python thumbnails.py [DIRECTORY] [--workers N]
+"""
+import argparse
+import concurrent.futures
+import hashlib
+import os
+
+from Gifimage import Gifimage
+import config
+import puzzle_file
+
+
+def puzzle_digest(puzzle, base_dir="."):
+    """
+    Function -- puzzle_digest
+        Computes the key of the images made from a version of a puzzle
+    Parameters:
+        puzzle(dict) -- the meta data read_puzzle gives
+        base_dir(str) -- the game directory the image paths are relative to
+    Returns a string with the hex digest of the tile images and the
+        settings the images are made with
+    """
+    digest = hashlib.sha1(f"{puzzle['rows']}x{puzzle['columns']}:"
+                          f"{puzzle['size']}:{config.THUMBNAIL_SIZE}:"
+                          .encode("utf-8"))
+    for image in puzzle["images"]:
+        with open(os.path.join(base_dir, image), "rb") as infile:
+            digest.update(infile.read())
+    return digest.hexdigest()
+
+
+def merge_palettes(images):
+    """
+    Function -- merge_palettes
+        Makes one palette for the colors some images use, rounding the
+        colors to fewer bits until they fit in 256 entries
+    Parameters:
+        images(list) -- the Gifimage instances
+    Returns a tuple of the merged palette and, for each image, the table
+        turning its palette indexes into indexes of the merged palette
+    """
+    used = []
+    for image in images:
+        indexes = set(image.pixels)
+        used.append({index: tuple(image.palette[3 * index:3 * index + 3])
+                     for index in indexes if 3 * index + 3 <=
+                     len(image.palette)})
+    colors = {color for image_colors in used
+              for color in image_colors.values()}
+
+    # drop the low bits of each channel until few enough colors are left,
+    # each rounded color standing for the mean of the colors it holds
+    shift = 0
+    while len({tuple(channel >> shift for channel in color)
+               for color in colors}) > 256:
+        shift += 1
+    groups = {}
+    for color in colors:
+        groups.setdefault(tuple(channel >> shift for channel in color),
+                          []).append(color)
+    palette = bytearray()
+    slots = {}
+    for slot, (key, members) in enumerate(sorted(groups.items())):
+        slots[key] = slot
+        palette += bytes(sum(member[channel] for member in members) //
+                         len(members) for channel in range(3))
+
+    tables = []
+    for image_colors in used:
+        table = bytearray(256)
+        for index, color in image_colors.items():
+            table[index] = slots[tuple(channel >> shift
+                                       for channel in color)]
+        tables.append(bytes(table))
+    return bytes(palette), tables
+
+
+def compose(puzzle, base_dir="."):
+    """
+    Function -- compose
+        Makes the thumbnail of a puzzle from its tiles in solved order,
+        scaled down to fit THUMBNAIL_SIZE
+    Parameters:
+        puzzle(dict) -- the meta data read_puzzle gives
+        base_dir(str) -- the game directory the image paths are relative to
+    Returns a Gifimage instance with the thumbnail
+    Raises ValueError if a tile image can't be decoded
+    """
+    rows, columns, size = puzzle["rows"], puzzle["columns"], puzzle["size"]
+    scale = config.THUMBNAIL_SIZE / (max(rows, columns) * size)
+    # the edges of the tiles in the thumbnail, so the tiles fill it without
+    # gaps however the sizes round
+    xs = [round(column * size * scale) for column in range(columns + 1)]
+    ys = [round(row * size * scale) for row in range(rows + 1)]
+
+    # each tile is scaled before the palettes are merged, so only the
+    # colors left in the thumbnail count
+    tiles = []
+    for number, image in enumerate(puzzle["images"]):
+        row, column = divmod(number, columns)
+        tile = Gifimage.read(os.path.join(base_dir, image))
+        tiles.append(tile.scale(max(1, xs[column + 1] - xs[column]),
+                                max(1, ys[row + 1] - ys[row])))
+    palette, tables = merge_palettes(tiles)
+
+    thumbnail = Gifimage(max(1, xs[-1]), max(1, ys[-1]), palette)
+    for number, (tile, table) in enumerate(zip(tiles, tables)):
+        row, column = divmod(number, columns)
+        tile.pixels = bytearray(tile.pixels.translate(table))
+        thumbnail.paste(tile, xs[column], ys[row])
+    return thumbnail
+
+
+def find_thumbnail(game_path, base_dir=".", puzzle=None):
+    """
+    Function -- find_thumbnail
+        Finds the cached thumbnail of a puzzle, making it if this version
+        of the puzzle has none yet
+    Parameters:
+        game_path(str) -- the path to the .puz file
+        base_dir(str) -- the game directory the image paths are relative to
+        puzzle(dict) -- the meta data of the puzzle, read from the .puz
+            file when not given
+    Returns a string with the path to the thumbnail, relative to the game
+        directory like the paths in .puz files
+    Raises ValueError if the puzzle or a tile image can't be read, and
+        OSError if a file can't be read or written
+    """
+    if puzzle is None:
+        puzzle = puzzle_file.read_puzzle(game_path, base_dir)
+    thumbnail = os.path.join(config.THUMBNAIL_CACHE_PATH,
+                             puzzle_digest(puzzle, base_dir) + ".gif")
+    path = os.path.join(base_dir, thumbnail)
+    if not os.path.isfile(path):
+        save_image(compose(puzzle, base_dir), path)
+    return thumbnail
+
+
+def scale_tiles(puzzle, tile_size, base_dir="."):
+    """
+    Function -- scale_tiles
+        Finds the cached copies of the tiles of a puzzle scaled down to a
+        smaller tile size, making them if this version of the puzzle has
+        none yet
+    Parameters:
+        puzzle(dict) -- the meta data read_puzzle gives
+        tile_size(int) -- the size of the scaled tiles
+        base_dir(str) -- the game directory the image paths are relative to
+    Returns a list of the paths to the scaled tiles in solved order,
+        relative to the game directory like the paths in .puz files
+    Raises ValueError if a tile image can't be decoded, and OSError if a
+        file can't be read or written
+    """
+    directory = os.path.join(config.SCALED_TILE_PATH,
+                             f"{puzzle_digest(puzzle, base_dir)}_"
+                             f"{tile_size}")
+    scale = tile_size / puzzle["size"]
+    tiles = []
+    for number, image in enumerate(puzzle["images"]):
+        # the tiles keep their names, which tell the blank tile apart
+        tile = os.path.join(directory,
+                            f"{number}_{os.path.basename(image)}")
+        path = os.path.join(base_dir, tile)
+        if not os.path.isfile(path):
+            source = Gifimage.read(os.path.join(base_dir, image))
+            save_image(source.scale(max(1, round(source.width * scale)),
+                                    max(1, round(source.height * scale))),
+                       path)
+        tiles.append(tile)
+    return tiles
+
+
+def save_image(image, path):
+    """
+    Function -- save_image
+        Writes an image to the cache, making its directory if needed
+    Parameters:
+        image(Gifimage) -- the image
+        path(str) -- the path to the image file
+    Raises OSError if the file can't be written
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # write to a file of this process first, so processes making the same
+    # image at once never read a half written one
+    partial = f"{path}.{os.getpid()}.tmp"
+    try:
+        image.save(partial)
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+
+
+def generate_catalog(directory=".", workers=None):
+    """
+    Function -- generate_catalog
+        Makes the thumbnails of all the puzzles of a game directory that
+        have none on a process pool
+    Parameters:
+        directory(str) -- the game directory with the .puz files
+        workers(int) -- the number of processes, one per CPU when not given
+    Returns a dictionary mapping each .puz file to the path of its cached
+        thumbnail, to "own" if it has a thumbnail of its own, or to the
+        error message if its thumbnail couldn't be made
+    """
+    results = {}
+    needed = []
+    for file in sorted(os.listdir(directory)):
+        if not file.endswith(".puz"):
+            continue
+        try:
+            puzzle = puzzle_file.read_puzzle(os.path.join(directory, file),
+                                             directory)
+        except (OSError, ValueError) as err:
+            results[file] = f"error: {err}"
+            continue
+        if puzzle["thumbnail"]:
+            results[file] = "own"
+        else:
+            needed.append((file, puzzle))
+
+    if needed:
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            futures = {pool.submit(find_thumbnail,
+                                   os.path.join(directory, file),
+                                   directory, puzzle): file
+                       for file, puzzle in needed}
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except (OSError, ValueError) as err:
+                    results[futures[future]] = f"error: {err}"
+    return results
+
+
+def main():
+    """
+    Program entry point
+    """
+    parser = argparse.ArgumentParser(description="Make the thumbnails of "
+                                                 "the puzzles that have none.")
+    parser.add_argument("directory", nargs="?", default=".",
+                        help="game directory with the .puz files")
+    parser.add_argument("--workers", type=int, default=config.SLICER_WORKERS,
+                        help="number of worker processes")
+    args = parser.parse_args()
+
+    results = generate_catalog(args.directory, args.workers)
+    for game, result in sorted(results.items()):
+        print(f"{game}: {result}")
+
+
+if __name__ == "__main__":
+    main()
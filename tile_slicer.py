@@ -0,0 +1,216 @@
+"""
+Generates sliding puzzles from source images.
+
+Each source GIF is cut to the shape of the board, scaled so the board fits
+the player board, and sliced into rows x columns tiles in memory. The bottom
+right tile is replaced by a synthesised blank tile, a thumbnail is made from
+the whole image, and the tiles are written to Images/<name>/ with a matching
+<name>.puz file. A puzzle whose .puz file already records the same source
+and settings is left as it is, so the batch job can be rerun on a whole
+directory and only new or changed images are sliced.
+
+Usage: python tile_slicer.py SOURCE [SOURCE ...] [--grid N] [--columns N]
+                              [--output DIR]
+"""
+import argparse
+import concurrent.futures
+import hashlib
+import os
+
+from Gifimage import Gifimage
+import config
+import puzzle_file
+import utils
+
+
+def source_digest(source_path, rows, columns, tile_size):
+    """
+    Function -- source_digest
+        Computes the key identifying a puzzle generated from a source image
+    Parameters:
+        source_path(str) -- the path to the source image
+        rows(int) -- the number of rows of tiles
+        columns(int) -- the number of columns of tiles
+        tile_size(int) -- the size of the tiles in pixels
+    Returns a string with the hex digest of the image and the settings
+    """
+    digest = hashlib.sha1(f"{rows}x{columns}:{tile_size}:".encode())
+    with open(source_path, "rb") as infile:
+        digest.update(infile.read())
+    return digest.hexdigest()
+
+
+def make_blank(image, tile_size):
+    """
+    Function -- make_blank
+        Synthesises the blank tile, a white tile with a grey outline drawn
+        with the colors of the source palette
+    Parameters:
+        image(Gifimage) -- the source image whose palette is used
+        tile_size(int) -- the size of the tile in pixels
+    Returns a Gifimage instance with the blank tile
+    """
+    white = image.nearest_color((255, 255, 255))
+    grey = image.nearest_color((130, 131, 131))
+    blank = Gifimage(tile_size, tile_size, image.palette,
+                     bytearray([white]) * (tile_size * tile_size))
+    edge = bytearray([grey]) * tile_size
+    blank.pixels[:tile_size] = edge
+    blank.pixels[-tile_size:] = edge
+    for row in range(tile_size):
+        blank.pixels[row * tile_size] = grey
+        blank.pixels[row * tile_size + tile_size - 1] = grey
+    return blank
+
+
+def make_thumbnail(image):
+    """
+    Function -- make_thumbnail
+        Scales an image down to fit the thumbnail area of the leaderboard
+    Parameters:
+        image(Gifimage) -- the image to make a thumbnail of
+    Returns a Gifimage instance with the thumbnail
+    """
+    scale = config.THUMBNAIL_SIZE / max(image.width, image.height)
+    return image.scale(max(1, round(image.width * scale)),
+                       max(1, round(image.height * scale)))
+
+
+def slice_image(source_path, grid, output_dir=".", tile_size=None,
+                columns=None):
+    """
+    Function -- slice_image
+        Creates a puzzle from a source image, unless an identical puzzle
+        has already been generated
+    Parameters:
+        source_path(str) -- the path to the source GIF image
+        grid(int) -- the number of rows of tiles
+        output_dir(str) -- the game directory to write the puzzle to
+        tile_size(int) -- the size of the tiles, fitted to the player board
+            when not given
+        columns(int) -- the number of columns of tiles, the same as the
+            number of rows when not given
+    Returns a string representing the path to the .puz file
+    """
+    rows, columns = grid, columns or grid
+    if not config.PUZZLE_MIN_GRID <= rows <= config.PUZZLE_MAX_GRID or \
+            not config.PUZZLE_MIN_GRID <= columns <= config.PUZZLE_MAX_GRID:
+        raise ValueError(f"Grid size {rows}x{columns} is not supported.")
+    if tile_size is None:
+        tile_size = utils.fit_tile_size(rows, columns,
+                                        config.PLAYER_BOARD_WIDTH,
+                                        config.PLAYER_BOARD_LENGTH)
+
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    game_path = os.path.join(output_dir, name + ".puz")
+    digest = source_digest(source_path, rows, columns, tile_size)
+
+    # reuse the puzzle if it was generated from the same image and settings
+    if os.path.isfile(game_path):
+        try:
+            if puzzle_file.read_puzzle(game_path, output_dir).get("source") \
+                    == digest:
+                return game_path
+        except ValueError:
+            pass
+
+    # cut the largest centered rectangle with the shape of the board out
+    # of the image and scale it
+    image = Gifimage.read(source_path)
+    width = min(image.width, image.height * columns // rows)
+    height = min(image.height, image.width * rows // columns)
+    image = image.crop((image.width - width) // 2,
+                       (image.height - height) // 2, width, height)
+    board = image.scale(columns * tile_size, rows * tile_size)
+
+    # paths in the .puz file are relative to the game directory
+    image_dir = os.path.join(config.IMAGES_PATH, name)
+    os.makedirs(os.path.join(output_dir, image_dir), exist_ok=True)
+
+    # slice the tiles in solved order, the last one becomes the blank
+    puzzle_images = []
+    for index in range(rows * columns - 1):
+        row, column = divmod(index, columns)
+        tile = board.crop(column * tile_size, row * tile_size,
+                          tile_size, tile_size)
+        tile_path = os.path.join(image_dir, f"{index + 1}.gif")
+        tile.save(os.path.join(output_dir, tile_path))
+        puzzle_images.append(tile_path)
+
+    blank_path = os.path.join(image_dir, "blank.gif")
+    make_blank(board, tile_size).save(os.path.join(output_dir, blank_path))
+    puzzle_images.append(blank_path)
+
+    thumbnail = os.path.join(image_dir, f"{name}_thumbnail.gif")
+    make_thumbnail(image).save(os.path.join(output_dir, thumbnail))
+
+    puzzle_file.write_puzzle(game_path, name, tile_size, thumbnail,
+                             puzzle_images, rows, columns,
+                             {"source": digest})
+    return game_path
+
+
+def slice_directory(sources, grid, output_dir=".", workers=None,
+                    columns=None):
+    """
+    Function -- slice_directory
+        Creates puzzles from many source images with a process pool
+    Parameters:
+        sources(list) -- paths to GIF images or directories of GIF images
+        grid(int) -- the number of rows of tiles
+        output_dir(str) -- the game directory to write the puzzles to
+        workers(int) -- the number of processes, one per CPU when not given
+        columns(int) -- the number of columns of tiles, the same as the
+            number of rows when not given
+    Returns a dictionary mapping each source image to its .puz file path,
+        or to the error message if the image couldn't be sliced
+    """
+    # expand the directories into the GIF images they contain
+    images = []
+    for source in sources:
+        if os.path.isdir(source):
+            images += sorted(os.path.join(source, file)
+                             for file in os.listdir(source)
+                             if file.lower().endswith(".gif"))
+        else:
+            images.append(source)
+
+    results = {}
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        futures = {pool.submit(slice_image, image, grid, output_dir,
+                               None, columns): image
+                   for image in images}
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except (OSError, ValueError) as err:
+                results[futures[future]] = f"error: {err}"
+    return results
+
+
+def main():
+    """
+    Program entry point
+    """
+    parser = argparse.ArgumentParser(description="Slice GIF images into "
+                                                 "sliding puzzles.")
+    parser.add_argument("sources", nargs="+",
+                        help="GIF images or directories of GIF images")
+    parser.add_argument("--grid", type=int, default=4,
+                        help="number of rows of tiles")
+    parser.add_argument("--columns", type=int,
+                        help="number of columns of tiles, defaults to --grid")
+    parser.add_argument("--output", default=".",
+                        help="game directory to write the puzzles to")
+    parser.add_argument("--workers", type=int, default=config.SLICER_WORKERS,
+                        help="number of worker processes")
+    args = parser.parse_args()
+
+    results = slice_directory(args.sources, args.grid, args.output,
+                              args.workers, args.columns)
+    for image, result in sorted(results.items()):
+        print(f"{image}: {result}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import time
-import turtle
+
+import config
 
 
 def draw_board(painter, width, length, start_x, start_y, pen_color, pen_size):
@@ -43,6 +44,22 @@ def display_msg(msg_path):
     Parameters:
         msg_path(str) -- the file path to the image to be displayed
     """
+    # only the game window needs turtle, the game rules don't
+    import turtle
     msg = turtle.Turtle(msg_path)
     time.sleep(3)
-    msg.hideturtle()
\ No newline at end of file
+    msg.hideturtle()
+
+def fit_tile_size(rows, columns, width, length):
+    """
+    Function -- fit_tile_size
+        Finds the largest tile size that fits the given number of rows and
+        columns of tiles, with the gap between them, into an area
+    Parameters:
+        rows(int) -- the number of rows of tiles
+        columns(int) -- the number of columns of tiles
+        width(int) -- the width of the area to fill
+        length(int) -- the length of the area to fill
+    Returns an integer representing the size of a tile in pixels
+    """
+    return max(1, min(width // columns, length // rows) - config.TILE_GAP)
@@ -0,0 +1,179 @@
+"""
+Verifies recorded games, so leaderboard scores can be trusted.
+
+A game is checked by regenerating its scramble from the recorded seed and
+replaying its moves with the Puzzleboard rules: every move must be
+possible, the puzzle must end solved within the move limit, and the score
+must be the number of moves. Whole replay files are checked in batches on
+a process pool, and the scores of a leaderboard file can be audited
+against the games that pass.
+
+Usage: python verifier.py [REPLAY_FILE] [--workers N] [--leaderboard FILE]
+                          [--puzzles DIR]
+"""
+import argparse
+import collections
+import concurrent.futures
+import functools
+import itertools
+
+from GameSession import replay
+from Leaderlog import Leaderlog
+from Leaderlog import clean_name
+from Movelog import Movelog
+from Movelog import decode_varint
+from Movelog import read_logs
+import config
+import puzzle_file
+
+
+def check_log(log, moves=None, shapes=None):
+    """
+    Function -- check_log
+        Checks that a recorded game is a win with the given score
+    Parameters:
+        log(Movelog) -- the record of the game
+        moves(int) -- the score claimed for the game, not checked when
+            not given
+        shapes(dict) -- the board shape and blank tile of each puzzle, as
+            read by puzzle_file.read_shapes, not checked when not given
+    Raises ValueError with the reason if the game doesn't hold up
+    """
+    rows, columns = log.rows, log.columns
+    if not config.PUZZLE_MIN_GRID <= rows <= config.PUZZLE_MAX_GRID or \
+            not config.PUZZLE_MIN_GRID <= columns <= config.PUZZLE_MAX_GRID:
+        raise ValueError(f"Grid size {rows}x{columns} is not supported.")
+    if log.blank_tile >= rows * columns:
+        raise ValueError("The blank tile is not on the board.")
+    if shapes is not None:
+        if log.puzzle not in shapes:
+            raise ValueError(f"{log.puzzle} is not a valid game.")
+        if shapes[log.puzzle] != (rows, columns, log.blank_tile):
+            raise ValueError(f"The board doesn't match {log.puzzle}.")
+    if not 1 <= log.move_limit <= config.MOVE_LIMIT_MAX:
+        raise ValueError("The move limit is out of range.")
+    if moves is not None and int(moves) != log.count:
+        raise ValueError(f"The score {moves} doesn't match the "
+                         f"{log.count} moves played.")
+    if log.count > log.move_limit:
+        raise ValueError("The moves go over the move limit.")
+    # a reset is made between two moves, in the order they were made
+    if any(not 0 <= reset <= log.count for reset in log.resets) or \
+            log.resets != sorted(log.resets):
+        raise ValueError("The resets are out of order.")
+
+    # play the game again from its scramble
+    session = replay(log)
+    if session.get_moves() < log.count:
+        raise ValueError(f"Move {session.get_moves() + 1} is impossible.")
+    if session.get_status() != "win":
+        raise ValueError("The puzzle isn't solved.")
+
+
+def verify_record(data, shapes=None):
+    """
+    Function -- verify_record
+        Checks an encoded game, in a worker process
+    Parameters:
+        data(bytes) -- the game as encoded by Movelog.encode
+        shapes(dict) -- the board shape and blank tile of each puzzle
+    Returns None if the game is a win, or a string with the reason it isn't
+    """
+    try:
+        _, start = decode_varint(data, 0)
+        check_log(Movelog.decode(memoryview(data)[start:]), shapes=shapes)
+    except ValueError as err:
+        return str(err)
+    return None
+
+
+def verify_logs(logs, workers=None, shapes=None):
+    """
+    Function -- verify_logs
+        Checks many games on a process pool. The games are taken from the
+        iterable a batch at a time, so a generator over a large replay file
+        is never held in memory whole
+    Parameters:
+        logs(iterable) -- the Movelog instances to check
+        workers(int) -- the number of processes, one per CPU when not given
+        shapes(dict) -- the board shape and blank tile of each puzzle
+    Returns a generator of tuples of each game and None if it is a win or
+        the reason it isn't
+    """
+    check = functools.partial(verify_record, shapes=shapes)
+    logs = iter(logs)
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        while True:
+            batch = list(itertools.islice(logs, config.VERIFY_BATCH))
+            if not batch:
+                return
+            yield from zip(batch, pool.map(check,
+                                           [log.encode() for log in batch],
+                                           chunksize=256))
+
+
+def audit(path, workers=None, shapes=None, leaderboard=None):
+    """
+    Function -- audit
+        Checks all the games of a replay file and prints the results. With
+        a leaderboard file, also prints the scores that no winning game
+        backs up
+    Parameters:
+        path(str) -- the path to the replay file
+        workers(int) -- the number of processes
+        shapes(dict) -- the board shape and blank tile of each puzzle
+        leaderboard(str) -- the path to the leaderboard file, if any
+    Returns an integer with the number of games and scores that failed
+    """
+    results = collections.Counter()
+    # the player, puzzle and score of every winning game
+    wins = collections.Counter()
+    failed = 0
+    for index, (log, reason) in enumerate(
+            verify_logs(read_logs(path), workers, shapes)):
+        results[reason or "win"] += 1
+        if reason is None:
+            wins[(clean_name(log.player), clean_name(log.puzzle, ""),
+                  log.count)] += 1
+        else:
+            failed += 1
+            print(f"game {index} ({log.player or 'anonymous'}, "
+                  f"{log.puzzle}): {reason}")
+    for reason, count in sorted(results.items()):
+        print(f"{count} games: {reason}")
+
+    if leaderboard:
+        unbacked = 0
+        for moves, _, name, puzzle, *_ in Leaderlog(leaderboard).get_records():
+            if wins[(name, puzzle, moves)]:
+                wins[(name, puzzle, moves)] -= 1
+            else:
+                unbacked += 1
+                print(f"score without a game: {moves} : {name} : {puzzle}")
+        print(f"{unbacked} leaderboard scores without a winning game")
+        failed += unbacked
+    return failed
+
+
+def main():
+    """
+    Program entry point
+    """
+    parser = argparse.ArgumentParser(description="Verify recorded games.")
+    parser.add_argument("path", nargs="?", default=config.REPLAY_PATH,
+                        help="replay file")
+    parser.add_argument("--workers", type=int, default=config.VERIFY_WORKERS,
+                        help="number of worker processes")
+    parser.add_argument("--leaderboard",
+                        help="leaderboard file to audit against the games")
+    parser.add_argument("--puzzles",
+                        help="game directory to check the boards against")
+    args = parser.parse_args()
+
+    shapes = puzzle_file.read_shapes(args.puzzles) if args.puzzles else None
+    if audit(args.path, args.workers, shapes, args.leaderboard):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()